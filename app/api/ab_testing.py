@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends
 
 from app.dependencies import get_current_user
-from app.models.user import User
+from app.services.principal import Principal
 from app.utils.api_errors import handle_api_errors, log_api_call
 from shared.schemas.common import APIResponse
 
@@ -14,7 +14,7 @@ router = APIRouter(tags=["ab-testing"])
 @handle_api_errors("Failed to get A/B test performance")
 async def get_test_performance(
     test_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> APIResponse[dict]:
     """Get performance metrics for an A/B test."""
     log_api_call("get_test_performance", user_id=str(current_user.id), test_id=test_id)
@@ -6,9 +6,9 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import ValidationError
-from app.database import get_db
+from app.database import get_read_db
 from app.dependencies import get_current_superuser, get_current_user
-from app.models.user import User
+from app.services.principal import Principal
 from app.utils.api_errors import handle_api_errors, log_api_call
 from app.utils.timestamp import utcnow
 from shared.schemas.analytics import (
@@ -40,8 +40,8 @@ router = APIRouter(tags=["analytics"])
 @router.get("/overview", response_model=APIResponse[AnalyticsOverviewPayload])
 @handle_api_errors("Failed to get system overview")
 async def get_system_overview(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[AnalyticsOverviewPayload]:
     """Get comprehensive system overview and key performance indicators."""
     log_api_call("get_system_overview", user_id=str(current_user.id))
@@ -110,8 +110,8 @@ async def get_system_overview(
 async def get_usage_statistics(
     period: str = Query("7d", description="Time period: 1d, 7d, 30d, 90d"),
     detailed: bool = Query(False, description="Include detailed breakdown"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[AnalyticsUsagePayload]:
     """Get comprehensive usage statistics with configurable time periods and detail levels."""
     log_api_call("get_usage_statistics", user_id=str(current_user.id), period=period)
@@ -189,8 +189,8 @@ async def get_usage_statistics(
 @router.get("/performance", response_model=APIResponse[AnalyticsPerformancePayload])
 @handle_api_errors("Failed to get performance metrics")
 async def get_performance_metrics(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[AnalyticsPerformancePayload]:
     """Get comprehensive system performance metrics with bottleneck analysis and optimization insights."""
     log_api_call("get_performance_metrics", user_id=str(current_user.id))
@@ -276,8 +276,8 @@ async def get_user_analytics(
     ),
     top: int = Query(10, ge=1, le=100, description="Number of top users to return"),
     period: str = Query("30d", description="Time period: 7d, 30d, 90d"),
-    current_user: User = Depends(get_current_superuser),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[AnalyticsUserAnalyticsPayload]:
     """Get comprehensive user activity analytics with engagement metrics and behavioral insights."""
     log_api_call("get_user_analytics", user_id=str(current_user.id), metric=metric)
@@ -367,8 +367,8 @@ async def get_user_analytics(
 @handle_api_errors("Failed to get usage trends")
 async def get_usage_trends(
     days: int = Query(14, ge=1, le=90, description="Number of days to analyze"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[AnalyticsTrendsPayload]:
     """Get comprehensive usage trends and growth patterns with predictive insights."""
     log_api_call("get_usage_trends", user_id=str(current_user.id), days=days)
@@ -459,8 +459,8 @@ async def get_usage_trends(
 @handle_api_errors("Failed to get user analytics")
 async def get_user_analytics_by_id(
     user_id: str,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[dict]:
     """Get detailed analytics for a specific user."""
     log_api_call("get_user_analytics_by_id", user_id=str(current_user.id), target_user_id=user_id)
@@ -520,8 +520,8 @@ async def get_user_analytics_by_id(
 async def export_analytics_report(
     include_details: bool = Query(True, description="Include detailed breakdowns"),
     format: str = Query("json", description="Export format: json"),
-    current_user: User = Depends(get_current_superuser),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[AnalyticsExportPayload]:
     """Export comprehensive analytics report for executive analysis and external integration."""
     log_api_call("export_analytics_report", user_id=str(current_user.id))
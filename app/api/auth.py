@@ -5,8 +5,8 @@ from typing import Annotated, List
 from fastapi import APIRouter, Depends, Query
 
 from app.dependencies import get_auth_service, get_current_user
-from app.models.user import User
 from app.services.auth import AuthService
+from app.services.principal import Principal
 from app.utils.api_errors import handle_api_errors, log_api_call
 from shared.schemas.auth import (
     APIKeyResponse,
@@ -67,7 +67,7 @@ async def login(
 async def get_api_keys(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Items per page"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> APIResponse[PaginatedResponse[APIKeyResponse]]:
     """Get user's API keys with pagination."""
     log_api_call("get_api_keys", user_id=str(current_user.id))
@@ -123,7 +123,7 @@ async def logout() -> APIResponse:
 @router.post("/refresh", response_model=APIResponse[Token])
 @handle_api_errors("Token refresh failed")
 async def refresh_token(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     auth_service: Annotated[AuthService, Depends(get_auth_service)],
 ) -> APIResponse[Token]:
     """Refresh JWT access token for session continuation."""
@@ -1,26 +1,42 @@
 """Conversation and chat API endpoints."""
 
+import asyncio
 import json
 import time
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, Query, UploadFile
+from fastapi import APIRouter, Depends, File, Query, Request, UploadFile
 from fastapi.responses import StreamingResponse
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, func, or_, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
+from app.config import settings
 from app.core.exceptions import AuthorizationError, NotFoundError, ValidationError
-from app.database import AsyncSessionLocal, get_db
+from app.database import (
+    AsyncSessionLocal,
+    expect_writes,
+    get_db,
+    get_read_db,
+    read_session_factory,
+)
 from app.dependencies import (
     get_conversation_service,
     get_current_superuser,
     get_current_user,
+    get_read_conversation_service,
 )
-from app.models.conversation import Conversation, Message
+from app.models.conversation import MESSAGE_SEARCH_VECTOR, Conversation, Message
 from app.models.user import User
 from app.services.conversation import ConversationService
+from app.services.conversation_export import ConversationExporter
+from app.services.llm_quota import get_llm_quota_manager
+from app.services.principal import Principal
 from app.utils.api_errors import handle_api_errors, log_api_call
+from app.utils.json_stream import JSONStreamReader
+from app.utils.sse import coalesce_content_chunks, sse_frame
+from app.utils.text_search import ts_headline, ts_match, ts_query, ts_rank
 from app.utils.timestamp import utcnow
 from shared.schemas.admin import RegistryStatsResponse
 from shared.schemas.common import APIResponse, PaginatedResponse, PaginationParams
@@ -52,6 +68,7 @@ from shared.schemas.conversation import (
     ExportedMessage,
     ExportInfo,
     ImportConversationResult,
+    ImportConversationsResult,
     MessageResponse,
     StreamCompleteResponse,
     StreamContentResponse,
@@ -59,6 +76,8 @@ from shared.schemas.conversation import (
     StreamErrorResponse,
     StreamStartResponse,
     StreamToolCallResponse,
+    StreamToolProgressResponse,
+    StreamToolStartResponse,
 )
 
 router = APIRouter(tags=["conversations"])
@@ -68,7 +87,7 @@ router = APIRouter(tags=["conversations"])
 @handle_api_errors("Failed to create conversation")
 async def create_conversation(
     request: ConversationCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     conversation_service: ConversationService = Depends(get_conversation_service),
 ) -> APIResponse[ConversationResponse]:
     """Create a new conversation."""
@@ -93,8 +112,12 @@ async def list_conversations(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     active_only: bool = Query(True),
-    current_user: User = Depends(get_current_user),
-    conversation_service: ConversationService = Depends(get_conversation_service),
+    cursor: Optional[str] = Query(None, description="Cursor returned with the previous page"),
+    count: str = Query(
+        "exact", pattern="^(exact|estimate|none)$", description="Total count mode"
+    ),
+    current_user: Principal = Depends(get_current_user),
+    conversation_service: ConversationService = Depends(get_read_conversation_service),
 ) -> APIResponse[PaginatedResponse[ConversationResponse]]:
     """List user's conversations with pagination and filtering."""
     log_api_call(
@@ -105,8 +128,13 @@ async def list_conversations(
         active_only=active_only,
     )
 
-    conversations, total = await conversation_service.list_conversations(
-        user_id=current_user.id, page=page, size=size, active_only=active_only
+    conversations, total, next_cursor, has_more = await conversation_service.list_conversations(
+        user_id=current_user.id,
+        page=page,
+        size=size,
+        active_only=active_only,
+        cursor=cursor,
+        count=count,
     )
 
     conversation_responses = [
@@ -119,6 +147,8 @@ async def list_conversations(
             total=total,
             page=page,
             per_page=size,
+            next_cursor=next_cursor,
+            has_more=has_more,
         ),
     )
 
@@ -133,7 +163,7 @@ async def list_conversations(
 @handle_api_errors("Failed to retrieve conversation")
 async def get_conversation(
     conversation_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     conversation_service: ConversationService = Depends(get_conversation_service),
 ) -> APIResponse[ConversationResponse]:
     """Get conversation by ID."""
@@ -159,7 +189,7 @@ async def get_conversation(
 async def update_conversation(
     conversation_id: int,
     request: ConversationUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     conversation_service: ConversationService = Depends(get_conversation_service),
 ) -> APIResponse[ConversationResponse]:
     """Update conversation metadata and settings."""
@@ -184,7 +214,7 @@ async def update_conversation(
 @handle_api_errors("Failed to delete conversation")
 async def delete_conversation(
     conversation_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     conversation_service: ConversationService = Depends(get_conversation_service),
 ) -> APIResponse:
     """Delete conversation and all associated messages."""
@@ -219,8 +249,12 @@ async def get_conversation_messages(
     conversation_id: int,
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    conversation_service: ConversationService = Depends(get_conversation_service),
+    cursor: Optional[str] = Query(None, description="Cursor returned with the previous page"),
+    count: str = Query(
+        "exact", pattern="^(exact|estimate|none)$", description="Total count mode"
+    ),
+    current_user: Principal = Depends(get_current_user),
+    conversation_service: ConversationService = Depends(get_read_conversation_service),
 ) -> APIResponse[PaginatedResponse[MessageResponse]]:
     """Get paginated messages from a conversation (alternative endpoint pattern)."""
     log_api_call(
@@ -231,8 +265,13 @@ async def get_conversation_messages(
         size=size,
     )
 
-    messages, total = await conversation_service.get_messages(
-        conversation_id, current_user.id, page=page, size=size
+    messages, total, next_cursor, has_more = await conversation_service.get_messages(
+        conversation_id,
+        current_user.id,
+        page=page,
+        size=size,
+        cursor=cursor,
+        count=count,
     )
 
     message_responses = [MessageResponse.model_validate(msg) for msg in messages]
@@ -243,6 +282,8 @@ async def get_conversation_messages(
             total=total,
             page=page,
             per_page=size,
+            next_cursor=next_cursor,
+            has_more=has_more,
         ),
     )
 
@@ -262,8 +303,12 @@ async def get_messages(
     conversation_id: int,
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    conversation_service: ConversationService = Depends(get_conversation_service),
+    cursor: Optional[str] = Query(None, description="Cursor returned with the previous page"),
+    count: str = Query(
+        "exact", pattern="^(exact|estimate|none)$", description="Total count mode"
+    ),
+    current_user: Principal = Depends(get_current_user),
+    conversation_service: ConversationService = Depends(get_read_conversation_service),
 ) -> APIResponse[List[MessageResponse]]:
     """Get paginated messages from a conversation."""
     log_api_call(
@@ -274,8 +319,13 @@ async def get_messages(
         size=size,
     )
 
-    messages, total = await conversation_service.get_messages(
-        conversation_id, current_user.id, page=page, size=size
+    messages, total, next_cursor, has_more = await conversation_service.get_messages(
+        conversation_id,
+        current_user.id,
+        page=page,
+        size=size,
+        cursor=cursor,
+        count=count,
     )
 
     message_responses = [MessageResponse.model_validate(msg) for msg in messages]
@@ -286,6 +336,8 @@ async def get_messages(
             total=total,
             page=page,
             per_page=size,
+            next_cursor=next_cursor,
+            has_more=has_more,
         ),
     )
 
@@ -299,7 +351,7 @@ async def get_messages(
 @handle_api_errors("Chat processing failed")
 async def chat(
     request: ChatRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     conversation_service: ConversationService = Depends(get_conversation_service),
 ) -> APIResponse[ChatResponse]:
     """Send a message and get AI response."""
@@ -310,10 +362,14 @@ async def chat(
         message_length=len(request.user_message),
     )
 
+    quota = get_llm_quota_manager()
+    await quota.check_tokens(current_user.id)
+
     start_time = time.time()
 
     # Process chat request with enhanced registry integration
     result = await conversation_service.process_chat(request, current_user.id)
+    await quota.record_usage(current_user.id, result.get("usage"))
 
     response_time_ms = (time.time() - start_time) * 1000
 
@@ -347,10 +403,14 @@ async def chat(
 @handle_api_errors("Failed to process streaming chat request")
 async def chat_stream(
     request: ChatRequest,
-    current_user: User = Depends(get_current_user),
-    conversation_service: ConversationService = Depends(get_conversation_service),
+    current_user: Principal = Depends(get_current_user),
 ) -> StreamingResponse:
-    """Send a message and get a streaming AI response."""
+    """Send a message and get a streaming AI response.
+
+    The stream uses its own session whose connection is only checked out for
+    the short transactions before and after generation, never while the LLM
+    is producing tokens.
+    """
     log_api_call(
         "chat_stream",
         user_id=str(current_user.id),
@@ -358,76 +418,124 @@ async def chat_stream(
         message_length=len(request.user_message),
     )
 
-    async def generate_response():
-        async with AsyncSessionLocal() as db:
-            conversation_service = ConversationService(db)
-
-            # Send initial event
-            start_event = StreamStartResponse(message="Generating response...")
-            yield f"data: {json.dumps(start_event.model_dump())}\n\n"
+    # Rejected with 429 before the stream starts
+    quota = get_llm_quota_manager()
+    await quota.check_tokens(current_user.id)
+    stream_slot = await quota.acquire_stream(current_user.id)
+    # Messages are committed while streaming, after the headers are sent
+    expect_writes()
 
-            try:
-                # Process chat request with streaming
-                async for chunk in conversation_service.process_chat_stream(
-                    request, current_user.id
-                ):
-                    if chunk.get("type") == "content":
-                        content_event = StreamContentResponse(
-                            content=chunk.get("content", "")
-                        )
-                        yield f"data: {json.dumps(content_event.model_dump())}\n\n"
-                    elif chunk.get("type") == "tool_call":
-                        tool_event = StreamToolCallResponse(
-                            tool=chunk.get("tool"), result=chunk.get("result")
-                        )
-                        yield f"data: {json.dumps(tool_event.model_dump())}\n\n"
-                    elif chunk.get("type") == "complete":
-                        response_data = chunk.get("response", {})
-
-                        # Properly validate ai_message and conversation fields
-                        for k, v in response_data.items():
-                            if k == "ai_message":
-                                response_data[k] = MessageResponse.model_validate(
-                                    v
-                                ).model_dump(mode="json")
-                            elif k == "conversation":
-                                response_data[k] = ConversationResponse.model_validate(
-                                    v
-                                ).model_dump(mode="json")
-                            elif k == "rag_context":
-                                if v:
-                                    ctx = []
-                                    for item in v:
-                                        item["chunk_id"] = str(item["chunk_id"])
-                                        ctx.append(item)
-                                    response_data[k] = json.dumps(ctx)
-                                else:
-                                    response_data[k] = {}
-                            elif k == "tool_call_summary":
-                                if v:
-                                    response_data[k] = json.dumps(v)
+    async def generate_response():
+        conversation_service = None
+        billed = False
+        produced: List[str] = []
+        try:
+            async with AsyncSessionLocal() as db:
+                conversation_service = ConversationService(db)
+
+                # Send initial event
+                start_event = StreamStartResponse(message="Generating response...")
+                yield sse_frame(start_event)
+
+                try:
+                    # Process chat request with streaming
+                    async for chunk in coalesce_content_chunks(
+                        conversation_service.process_chat_stream(
+                            request, current_user.id
+                        ),
+                        settings.stream_flush_interval_ms / 1000,
+                    ):
+                        if chunk.get("type") == "usage":
+                            billed = True
+                            await quota.record_usage(current_user.id, chunk["usage"])
+                        elif chunk.get("type") == "content":
+                            produced.append(chunk.get("content", ""))
+                            content_event = StreamContentResponse(
+                                content=chunk.get("content", "")
+                            )
+                            yield sse_frame(content_event)
+                        elif chunk.get("type") == "tool_start":
+                            start_tool_event = StreamToolStartResponse(
+                                tool=chunk.get("tool", {})
+                            )
+                            yield sse_frame(start_tool_event)
+                        elif chunk.get("type") == "tool_progress":
+                            progress_event = StreamToolProgressResponse(
+                                tool=chunk.get("tool", {}),
+                                progress=chunk.get("progress", 0),
+                                total=chunk.get("total"),
+                                message=chunk.get("message"),
+                            )
+                            yield sse_frame(progress_event)
+                        elif chunk.get("type") == "tool_call":
+                            tool_event = StreamToolCallResponse(
+                                tool=chunk.get("tool"), result=chunk.get("result")
+                            )
+                            yield sse_frame(tool_event)
+                        elif chunk.get("type") == "complete":
+                            response_data = chunk.get("response", {})
+
+                            # Properly validate ai_message and conversation fields
+                            for k, v in response_data.items():
+                                if k == "ai_message":
+                                    response_data[k] = MessageResponse.model_validate(
+                                        v
+                                    ).model_dump(mode="json")
+                                elif k == "conversation":
+                                    response_data[k] = (
+                                        ConversationResponse.model_validate(v)
+                                    ).model_dump(mode="json")
+                                elif k == "rag_context":
+                                    if v:
+                                        ctx = []
+                                        for item in v:
+                                            item["chunk_id"] = str(item["chunk_id"])
+                                            ctx.append(item)
+                                        response_data[k] = json.dumps(ctx)
+                                    else:
+                                        response_data[k] = {}
+                                elif k == "tool_call_summary":
+                                    if v:
+                                        response_data[k] = v.model_dump(mode="json")
+                                    else:
+                                        response_data[k] = {}
                                 else:
-                                    response_data[k] = {}
-                            else:
-                                error_event = StreamErrorResponse(
-                                    error=f"Unexpected key value: {k}"
-                                )
-                                yield f"data: {json.dumps(error_event.model_dump())}\n\n"
-                        complete_event = StreamCompleteResponse(response=response_data)
-                        yield f"data: {json.dumps(complete_event.model_dump())}\n\n"
-                        break
-                    elif chunk.get("type") == "error":
-                        error_event = StreamErrorResponse(
-                            error=chunk.get("error", "Unknown error")
+                                    error_event = StreamErrorResponse(
+                                        error=f"Unexpected key value: {k}"
+                                    )
+                                    yield sse_frame(error_event)
+                            complete_event = StreamCompleteResponse(
+                                response=response_data
+                            )
+                            yield sse_frame(complete_event)
+                            break
+                        elif chunk.get("type") == "error":
+                            error_event = StreamErrorResponse(
+                                error=chunk.get("error", "Unknown error")
+                            )
+                            yield sse_frame(error_event)
+                            break
+                except Exception as e:
+                    error_event = StreamErrorResponse(error=str(e))
+                    yield sse_frame(error_event)
+
+                end_event = StreamEndResponse()
+                yield sse_frame(end_event)
+        finally:
+            try:
+                # Streams cut short, e.g. by a client disconnect, report no
+                # usage; bill an estimate of what was generated so far
+                if not billed and conversation_service is not None:
+                    usage = conversation_service.estimate_stream_usage(
+                        "".join(produced)
+                    )
+                    if usage:
+                        # Shielded so billing completes even if cancelled
+                        await asyncio.shield(
+                            quota.record_usage(current_user.id, usage)
                         )
-                        yield f"data: {json.dumps(error_event.model_dump())}\n\n"
-                        break
-            except Exception as e:
-                error_event = StreamErrorResponse(error=str(e))
-                yield f"data: {json.dumps(error_event.model_dump())}\n\n"
-
-            end_event = StreamEndResponse()
-            yield f"data: {json.dumps(end_event.model_dump())}\n\n"
+            finally:
+                await stream_slot.release()
 
     return StreamingResponse(
         generate_response(),
@@ -437,13 +545,15 @@ async def chat_stream(
             "Connection": "keep-alive",
             "Access-Control-Allow-Origin": "*",
         },
+        # Also frees the slot if the client leaves before the stream starts
+        background=BackgroundTask(stream_slot.release),
     )
 
 
 @router.get("/stats", response_model=APIResponse[ConversationStats])
 @handle_api_errors("Failed to retrieve conversation stats")
 async def get_conversation_stats(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     conversation_service: ConversationService = Depends(get_conversation_service),
 ) -> APIResponse[ConversationStats]:
     """Get conversation statistics for the current user with registry insights.
@@ -465,7 +575,7 @@ async def get_conversation_stats(
 @router.get("/registry-stats", response_model=APIResponse[RegistryStatsResponse])
 @handle_api_errors("Failed to retrieve registry statistics")
 async def get_registry_stats(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     conversation_service: ConversationService = Depends(get_conversation_service),
 ) -> APIResponse[RegistryStatsResponse]:
     """Get registry statistics showing prompt, profile, and tool usage.
@@ -499,9 +609,9 @@ async def export_conversation(
     conversation_id: int,
     format: str = Query("json", description="Export format: json, txt, csv"),
     include_metadata: bool = Query(True, description="Include conversation metadata"),
-    current_user: User = Depends(get_current_user),
-    conversation_service: ConversationService = Depends(get_conversation_service),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    conversation_service: ConversationService = Depends(get_read_conversation_service),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[ConversationExportData]:
     """Export a conversation to various formats."""
     log_api_call(
@@ -600,82 +710,119 @@ async def export_conversation(
             data=response_payload,
         )
 
-    elif format == "txt":
-        lines = []
-
-        if include_metadata:
-            lines.append(f"Conversation: {conversation.title}")
-            lines.append(
-                f"Created: {conversation.created_at.strftime('%Y-%m-%d %H:%M:%S')}"
-            )
-            lines.append(f"Messages: {len(messages)}")
-            lines.append("-" * 50)
-            lines.append("")
-
-        for msg in messages:
-            timestamp = msg.created_at.strftime("%Y-%m-%d %H:%M:%S")
-            lines.append(f"[{timestamp}] {msg.role.upper()}: {msg.content}")
-            lines.append("")
-
-        text_content = "\n".join(lines)
-
-        export_data_text = ConversationExportDataText(
-            content=text_content,
-            format="text",
+    elif format in ("txt", "csv"):
+        content = ConversationExporter(format, include_metadata).render(
+            conversation, messages
         )
+        if format == "txt":
+            export_data = ConversationExportDataText(content=content, format="text")
+        else:
+            export_data = ConversationExportDataCSV(content=content, format="csv")
 
         response_payload = ConversationExportData(
-            data=export_data_text,
+            data=export_data,
             export_info=export_info,
         )
 
+        label = "text" if format == "txt" else "CSV"
         return APIResponse[ConversationExportData](
             success=True,
-            message="Conversation exported successfully in text format",
+            message=f"Conversation exported successfully in {label} format",
             data=response_payload,
         )
 
-    elif format == "csv":
-        csv_lines = []
+    else:
+        raise ValidationError("Invalid export format. Use: json, txt, or csv")
 
-        if include_metadata:
-            csv_lines.append("# Conversation Export")
-            csv_lines.append(f"# Title: {conversation.title}")
-            csv_lines.append(f"# Created: {conversation.created_at.isoformat()}")
-            csv_lines.append(f"# Messages: {len(messages)}")
-            csv_lines.append("")
 
-        csv_lines.append("timestamp,role,content,tool_calls,tool_call_id,name")
+def _export_response(
+    exporter: ConversationExporter,
+    request: Request,
+    user_id: int,
+    filename_stem: str,
+    conversation_id: Optional[int] = None,
+) -> StreamingResponse:
+    """Build a streaming download for an export.
 
-        for msg in messages:
-            content = msg.content.replace('"', '""') if msg.content else ""
-            tool_calls = json.dumps(msg.tool_calls) if msg.tool_calls else ""
+    The export reads through its own session because request-scoped
+    dependencies are closed before the response body is streamed.
+    """
+    session_factory = read_session_factory(request)
+
+    async def body():
+        async with session_factory() as session:
+            # Read sessions autocommit, but the server-side cursor needs a
+            # transaction; this one also gives the export a single snapshot
+            await session.connection(
+                execution_options={"isolation_level": "REPEATABLE READ"}
+            )
+            async for chunk in exporter.stream(session, user_id, conversation_id):
+                yield chunk
 
-            csv_lines.append(
-                f'"{msg.created_at.isoformat()}","{msg.role}","{content}",'
-                f'"{tool_calls}","{msg.tool_call_id or ""}","{msg.name or ""}"'
+    return StreamingResponse(
+        body(),
+        media_type=exporter.media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{exporter.filename(filename_stem)}"'
             )
+        },
+    )
 
-        csv_content = "\n".join(csv_lines)
 
-        export_data_csv = ConversationExportDataCSV(
-            content=csv_content,
-            format="csv",
-        )
+@router.get("/byid/{conversation_id}/export/stream")
+@handle_api_errors("Failed to export conversation")
+async def stream_conversation_export(
+    conversation_id: int,
+    request: Request,
+    format: str = Query("json", description="Export format: json, ndjson, csv, txt"),
+    include_metadata: bool = Query(True, description="Include conversation metadata"),
+    gzip: bool = Query(False, description="Gzip-compress the download"),
+    current_user: Principal = Depends(get_current_user),
+    conversation_service: ConversationService = Depends(get_read_conversation_service),
+) -> StreamingResponse:
+    """Stream a conversation export as a file download."""
+    log_api_call(
+        "stream_conversation_export",
+        user_id=str(current_user.id),
+        conversation_id=str(conversation_id),
+        format=format,
+    )
 
-        response_payload = ConversationExportData(
-            data=export_data_csv,
-            export_info=export_info,
-        )
+    exporter = ConversationExporter(format, include_metadata, compress=gzip)
+    # Raises NotFoundError before streaming starts
+    await conversation_service.get_conversation(conversation_id, current_user.id)
 
-        return APIResponse[ConversationExportData](
-            success=True,
-            message="Conversation exported successfully in CSV format",
-            data=response_payload,
-        )
+    return _export_response(
+        exporter,
+        request,
+        current_user.id,
+        f"conversation-{conversation_id}",
+        conversation_id=conversation_id,
+    )
 
-    else:
-        raise ValidationError("Invalid export format. Use: json, txt, or csv")
+
+@router.get("/export/stream")
+@handle_api_errors("Failed to export conversations")
+async def stream_conversations_export(
+    request: Request,
+    format: str = Query("json", description="Export format: json, ndjson, csv, txt"),
+    include_metadata: bool = Query(True, description="Include conversation metadata"),
+    gzip: bool = Query(False, description="Gzip-compress the download"),
+    current_user: Principal = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream all of the current user's conversations as one download.
+
+    The JSON format produces an archive accepted by /conversations/import/batch.
+    """
+    log_api_call(
+        "stream_conversations_export", user_id=str(current_user.id), format=format
+    )
+
+    exporter = ConversationExporter(format, include_metadata, compress=gzip)
+    return _export_response(
+        exporter, request, current_user.id, f"conversations-{current_user.id}"
+    )
 
 
 @router.post(
@@ -685,95 +832,75 @@ async def export_conversation(
 async def import_conversation(
     file: UploadFile = File(...),
     title: Optional[str] = Query(None, description="Override conversation title"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     conversation_service: ConversationService = Depends(get_conversation_service),
 ) -> APIResponse[ImportConversationResult]:
-    """Import a conversation from a JSON file."""
-    log_api_call("import_conversation", user_id=str(current_user.id))
-
-    try:
-        # Validate file type
-        if not file.filename.endswith(".json"):
-            raise ValidationError("Only JSON files are supported for import")
-
-        # Read and parse file
-        content = await file.read()
-        try:
-            data = json.loads(content.decode("utf-8"))
-        except json.JSONDecodeError as e:
-            raise ValidationError(f"Invalid JSON format: {str(e)}")
-
-        # Validate data structure
-        if "messages" not in data:
-            raise ValidationError("Invalid conversation format: missing 'messages' field")
+    """Import a conversation from a JSON file.
 
-        # Extract conversation info
-        conversation_data = data.get("conversation", {})
-        messages_data = data["messages"]
-
-        if not messages_data:
-            raise ValidationError("No messages found in import file")
-
-        # Create new conversation
-        conv_title = title or conversation_data.get(
-            "title",
-            f"Imported conversation {utcnow().strftime('%Y-%m-%d %H:%M')}",
-        )
-
-        conversation_create = ConversationCreate(title=conv_title)
-
-        new_conversation = await conversation_service.create_conversation(
-            conversation_create, current_user
-        )
+    Files holding several conversations are rejected; use /import/batch.
+    """
+    log_api_call("import_conversation", user_id=str(current_user.id))
 
-        # Import messages
-        imported_count = 0
-        errors = []
+    # Validate file type
+    if not file.filename.endswith(".json"):
+        raise ValidationError("Only JSON files are supported for import")
 
-        for msg_data in messages_data:
-            try:
-                required_fields = ["role", "content"]
-                missing_field = next(
-                    (field for field in required_fields if field not in msg_data), None
-                )
-                if missing_field:
-                    errors.append(f"Message missing required field: {missing_field}")
-                    continue
-
-                message = Message(
-                    conversation_id=new_conversation.id,
-                    role=msg_data["role"],
-                    content=msg_data["content"],
-                    tool_calls=msg_data.get("tool_calls"),
-                    tool_call_id=msg_data.get("tool_call_id"),
-                    name=msg_data.get("name"),
-                )
+    results = await conversation_service.import_conversations(
+        JSONStreamReader(file.read), current_user.id, title=title, single=True
+    )
+    result = results[0]
+    # A parse error after the conversation was committed is reported with it
+    for trailing in results[1:]:
+        result.errors.extend(trailing.errors)
+    if not result.conversation_id:
+        raise ValidationError(result.errors[0] if result.errors else "Import failed")
+
+    return APIResponse[ImportConversationResult](
+        success=True,
+        message=f"Conversation imported successfully with {result.imported_messages} messages",
+        data=result,
+    )
 
-                conversation_service.db.add(message)
-                imported_count += 1
 
-            except Exception as e:
-                errors.append(f"Failed to import message: {str(e)}")
+@router.post(
+    "/import/batch", response_model=APIResponse[ImportConversationsResult]
+)
+@handle_api_errors("Failed to import conversations")
+async def import_conversations(
+    file: UploadFile = File(...),
+    current_user: Principal = Depends(get_current_user),
+    conversation_service: ConversationService = Depends(get_conversation_service),
+) -> APIResponse[ImportConversationsResult]:
+    """Import a multi-conversation archive (JSON or JSON Lines).
 
-        await conversation_service.db.commit()
+    The file is parsed incrementally and messages are inserted in batches,
+    so large histories are imported without loading the file into memory.
+    """
+    log_api_call("import_conversations", user_id=str(current_user.id))
 
-        result = ImportConversationResult(
-            conversation_id=str(new_conversation.id),
-            conversation_title=conv_title,
-            imported_messages=imported_count,
-            total_messages=len(messages_data),
-            errors=errors[:5],
-        )
+    if not file.filename.endswith((".json", ".jsonl")):
+        raise ValidationError("Only JSON and JSON Lines files are supported for import")
 
-        return APIResponse[ImportConversationResult](
-            success=True,
-            message=f"Conversation imported successfully with {imported_count} messages",
-            data=result,
-        )
+    results = await conversation_service.import_conversations(
+        JSONStreamReader(file.read),
+        current_user.id,
+        json_lines=file.filename.endswith(".jsonl"),
+    )
+    imported = [result for result in results if result.conversation_id]
+    payload = ImportConversationsResult(
+        conversations=results,
+        imported_conversations=len(imported),
+        imported_messages=sum(result.imported_messages for result in imported),
+    )
 
-    except Exception:
-        await conversation_service.db.rollback()
-        raise
+    return APIResponse[ImportConversationsResult](
+        success=True,
+        message=(
+            f"Imported {payload.imported_conversations} conversations with "
+            f"{payload.imported_messages} messages"
+        ),
+        data=payload,
+    )
 
 
 @router.post(
@@ -791,7 +918,7 @@ async def archive_conversations(
     dry_run: bool = Query(
         True, description="Perform dry run without actually archiving"
     ),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[ArchivePreviewResponse | ArchiveConversationsResult]:
     """Archive old conversations by marking them as inactive."""
@@ -884,27 +1011,38 @@ async def search_conversations_and_messages(
     date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     active_only: bool = Query(True, description="Search only active conversations"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[ConversationSearchData]:
     """Search conversations and messages with advanced filtering options."""
     log_api_call("search_conversations", user_id=str(current_user.id), query=query)
 
     try:
-        base_query = select(Conversation).join(User, Conversation.user_id == User.id)
+        base_query = select(
+            Conversation.id,
+            Conversation.title,
+            Conversation.created_at,
+            Conversation.updated_at,
+            Conversation.is_active,
+            Conversation.message_count,
+            User.username,
+            User.email,
+        ).join(User, Conversation.user_id == User.id)
 
         if not current_user.is_superuser:
             base_query = base_query.where(Conversation.user_id == current_user.id)
 
         filters = []
+        # Substring match on titles (trigram index), word match on message
+        # content (tsvector index)
         title_filter = Conversation.title.ilike(f"%{query}%")
         search_filters = [title_filter]
+        tsquery = ts_query(query)
+        message_match = ts_match(MESSAGE_SEARCH_VECTOR, tsquery)
 
         if search_messages:
             message_subquery = (
-                select(Message.conversation_id)
-                .where(Message.content.ilike(f"%{query}%"))
-                .distinct()
+                select(Message.conversation_id).where(message_match).distinct()
             )
             message_filter = Conversation.id.in_(message_subquery)
             search_filters.append(message_filter)
@@ -930,73 +1068,77 @@ async def search_conversations_and_messages(
 
         if filters:
             base_query = base_query.where(and_(*filters))
-        base_query = base_query.order_by(Conversation.updated_at.desc()).limit(limit)
-
-        result = await db.execute(base_query)
-        conversations = result.scalars().all()
+        matched = (
+            base_query.order_by(Conversation.updated_at.desc(), Conversation.id)
+            .limit(limit)
+            .subquery("matched")
+        )
 
-        search_results: List[ConversationSearchResult] = []
-        for conv in conversations:
-            user_result = await db.execute(select(User).where(User.id == conv.user_id))
-            user = user_result.scalar_one_or_none()
-            msg_count = await db.scalar(
-                select(func.count(Message.id)).where(Message.conversation_id == conv.id)
+        # One round trip: the limited conversations, each LATERAL-joined to
+        # its best-ranked matching messages with ts_headline excerpts
+        if search_messages:
+            rank_expr = ts_rank(MESSAGE_SEARCH_VECTOR, tsquery)
+            top_messages = (
+                select(
+                    Message.id.label("message_id"),
+                    Message.role.label("message_role"),
+                    Message.created_at.label("message_created_at"),
+                    ts_headline(Message.content, tsquery).label("excerpt"),
+                    func.row_number()
+                    .over(order_by=(rank_expr.desc(), Message.created_at))
+                    .label("match_position"),
+                )
+                .where(and_(Message.conversation_id == matched.c.id, message_match))
+                .order_by(rank_expr.desc(), Message.created_at)
+                .limit(3)
+                .lateral("top_messages")
             )
-
-            matching_messages: List[ConversationSearchMatchingMessage] = []
-            if search_messages:
-                message_query = (
-                    select(Message)
-                    .where(
-                        and_(
-                            Message.conversation_id == conv.id,
-                            Message.content.ilike(f"%{query}%"),
-                        )
-                    )
-                    .order_by(Message.created_at)
-                    .limit(3)
+            search_query = (
+                select(matched, top_messages)
+                .select_from(matched.outerjoin(top_messages, true()))
+                .order_by(
+                    matched.c.updated_at.desc(),
+                    matched.c.id,
+                    top_messages.c.match_position,
                 )
-                msg_result = await db.execute(message_query)
-                messages = msg_result.scalars().all()
-                for msg in messages:
-                    content = msg.content
-                    excerpt = ""
-                    if query.lower() in content.lower():
-                        pos = content.lower().find(query.lower())
-                        start = max(0, pos - 50)
-                        end = min(len(content), pos + len(query) + 50)
-                        excerpt = content[start:end]
-                        if start > 0:
-                            excerpt = "..." + excerpt
-                        if end < len(content):
-                            excerpt = excerpt + "..."
-                    else:
-                        excerpt = content[:100] + ("..." if len(content) > 100 else "")
-
-                    matching_messages.append(
-                        ConversationSearchMatchingMessage(
-                            id=str(msg.id),
-                            role=msg.role,
-                            excerpt=excerpt,
-                            created_at=msg.created_at.isoformat(),
-                        )
-                    )
+            )
+        else:
+            search_query = select(matched).order_by(
+                matched.c.updated_at.desc(), matched.c.id
+            )
+
+        result = await db.execute(search_query)
 
-            search_results.append(
-                ConversationSearchResult(
-                    id=str(conv.id),
-                    title=conv.title,
-                    created_at=conv.created_at.isoformat(),
-                    updated_at=conv.updated_at.isoformat() if conv.updated_at else None,
-                    is_active=conv.is_active,
-                    message_count=msg_count or 0,
+        # Rows arrive grouped by conversation; fold them into results
+        search_results: List[ConversationSearchResult] = []
+        results_by_id = {}
+        for row in result:
+            conv = results_by_id.get(row.id)
+            if conv is None:
+                conv = ConversationSearchResult(
+                    id=str(row.id),
+                    title=row.title,
+                    created_at=row.created_at.isoformat(),
+                    updated_at=row.updated_at.isoformat() if row.updated_at else None,
+                    is_active=row.is_active,
+                    message_count=row.message_count or 0,
                     user=ConversationSearchUserInfo(
-                        username=user.username if user else "Unknown",
-                        email=user.email if user else "Unknown",
+                        username=row.username or "Unknown",
+                        email=row.email or "Unknown",
                     ),
-                    matching_messages=matching_messages,
+                    matching_messages=[],
+                )
+                results_by_id[row.id] = conv
+                search_results.append(conv)
+            if search_messages and row.message_id is not None:
+                conv.matching_messages.append(
+                    ConversationSearchMatchingMessage(
+                        id=str(row.message_id),
+                        role=row.message_role,
+                        excerpt=row.excerpt,
+                        created_at=row.message_created_at.isoformat(),
+                    )
                 )
-            )
 
         criteria = ConversationSearchCriteria(
             query=query,
@@ -1028,7 +1170,7 @@ async def search_conversations_and_messages(
 @router.get("/stats", response_model=APIResponse[ConversationStatsData])
 @handle_api_errors("Failed to get conversation statistics")
 async def get_conversation_statistics(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[ConversationStatsData]:
     """Get comprehensive conversation statistics and analytics."""
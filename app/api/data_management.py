@@ -3,90 +3,84 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.core.exceptions import NotFoundError
+from app.database import expect_writes
 from app.dependencies import get_current_superuser
-from app.models.user import User
+from app.services.bulk_delete import get_bulk_delete_manager
+from app.services.principal import Principal
 from app.utils.api_errors import handle_api_errors, log_api_call
 from shared.schemas.common import APIResponse
 
 router = APIRouter(tags=["data-management"])
 
 
+async def _start_bulk_delete(target: str, ids: List[str]) -> APIResponse[dict]:
+    """Queue a bulk delete and return its operation status."""
+    operation = await get_bulk_delete_manager().start(target, ids)
+    expect_writes()
+    return APIResponse[dict](
+        success=True,
+        message=(
+            f"Bulk delete of {operation.requested_count} {target} started; "
+            f"track progress with operation {operation.operation_id}"
+        ),
+        data=operation.to_dict(),
+    )
+
+
 @router.post("/bulk/delete-documents")
 @handle_api_errors("Failed to bulk delete documents")
 async def bulk_delete_documents(
     document_ids: List[str] = Query(..., description="List of document IDs to delete"),
-    current_user: User = Depends(get_current_superuser),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_superuser),
 ) -> APIResponse[dict]:
-    """Bulk delete multiple documents."""
+    """Bulk delete multiple documents in the background."""
     log_api_call("bulk_delete_documents", user_id=str(current_user.id), count=len(document_ids))
-    
-    # Mock deletion - in real implementation this would use a service
-    result = {
-        "deleted_count": len(document_ids),
-        "failed_count": 0,
-        "deleted_ids": document_ids,
-        "failed_ids": [],
-        "operation_id": f"bulk-delete-docs-{len(document_ids)}"
-    }
-    
-    return APIResponse[dict](
-        success=True,
-        message=f"Successfully deleted {len(document_ids)} documents",
-        data=result,
-    )
+    return await _start_bulk_delete("documents", document_ids)
 
 
 @router.post("/bulk/delete-conversations")
 @handle_api_errors("Failed to bulk delete conversations")
 async def bulk_delete_conversations(
     conversation_ids: List[str] = Query(..., description="List of conversation IDs to delete"),
-    current_user: User = Depends(get_current_superuser),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_superuser),
 ) -> APIResponse[dict]:
-    """Bulk delete multiple conversations."""
+    """Bulk delete multiple conversations in the background."""
     log_api_call("bulk_delete_conversations", user_id=str(current_user.id), count=len(conversation_ids))
-    
-    # Mock deletion - in real implementation this would use a service
-    result = {
-        "deleted_count": len(conversation_ids),
-        "failed_count": 0,
-        "deleted_ids": conversation_ids,
-        "failed_ids": [],
-        "operation_id": f"bulk-delete-convs-{len(conversation_ids)}"
-    }
-    
-    return APIResponse[dict](
-        success=True,
-        message=f"Successfully deleted {len(conversation_ids)} conversations",
-        data=result,
-    )
+    return await _start_bulk_delete("conversations", conversation_ids)
 
 
 @router.post("/bulk/delete-prompts")
 @handle_api_errors("Failed to bulk delete prompts")
 async def bulk_delete_prompts(
     prompt_ids: List[str] = Query(..., description="List of prompt IDs to delete"),
-    current_user: User = Depends(get_current_superuser),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_superuser),
 ) -> APIResponse[dict]:
-    """Bulk delete multiple prompts."""
+    """Bulk delete multiple prompts in the background."""
     log_api_call("bulk_delete_prompts", user_id=str(current_user.id), count=len(prompt_ids))
-    
-    # Mock deletion - in real implementation this would use a service
-    result = {
-        "deleted_count": len(prompt_ids),
-        "failed_count": 0,
-        "deleted_ids": prompt_ids,
-        "failed_ids": [],
-        "operation_id": f"bulk-delete-prompts-{len(prompt_ids)}"
-    }
-    
+    return await _start_bulk_delete("prompts", prompt_ids)
+
+
+@router.get("/bulk/operations/{operation_id}")
+@handle_api_errors("Failed to get bulk operation status")
+async def get_bulk_operation(
+    operation_id: str,
+    current_user: Principal = Depends(get_current_superuser),
+) -> APIResponse[dict]:
+    """Get the progress of a bulk delete operation.
+
+    Progress is stored after every batch, so any worker can answer. Finished
+    operations are kept for seven days.
+    """
+    log_api_call("get_bulk_operation", user_id=str(current_user.id), operation_id=operation_id)
+
+    operation = await get_bulk_delete_manager().get_operation(operation_id)
+    if operation is None:
+        raise NotFoundError(f"Bulk operation not found: {operation_id}")
+
     return APIResponse[dict](
         success=True,
-        message=f"Successfully deleted {len(prompt_ids)} prompts",
-        data=result,
-    )
\ No newline at end of file
+        message=f"Bulk operation {operation.status.value}",
+        data=operation.to_dict(),
+    )
@@ -12,7 +12,7 @@ from app.config import settings
 from app.core.exceptions import ExternalServiceError, NotFoundError, ValidationError
 from app.database import get_db, get_session
 from app.dependencies import get_current_superuser
-from app.models.user import User
+from app.services.principal import Principal
 from app.utils.api_errors import handle_api_errors, log_api_call
 from app.utils.timestamp import utcnow
 from shared.schemas.base import BaseModelSchema
@@ -36,7 +36,7 @@ router = APIRouter(tags=["database"])
 @router.post("/init", response_model=APIResponse[BaseModelSchema])
 @handle_api_errors("Failed to initialize database")
 async def initialize_database(
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[BaseModelSchema]:
     """Initialize the database and create all tables with required extensions."""
@@ -65,7 +65,7 @@ async def initialize_database(
 @router.get("/status", response_model=APIResponse[DatabaseStatusResponse])
 @handle_api_errors("Failed to get database status")
 async def get_database_status(
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[DatabaseStatusResponse]:
     """Get comprehensive database connection status and configuration information."""
@@ -141,7 +141,7 @@ async def get_database_status(
 @router.get("/tables", response_model=APIResponse[DatabaseTablesResponse])
 @handle_api_errors("Failed to list database tables")
 async def list_database_tables(
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[DatabaseTablesResponse]:
     """List all database tables with comprehensive metadata and statistics."""
@@ -189,7 +189,7 @@ async def list_database_tables(
 @router.get("/migrations", response_model=APIResponse[DatabaseMigrationsResponse])
 @handle_api_errors("Failed to get migration status")
 async def get_migration_status(
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
 ) -> APIResponse[DatabaseMigrationsResponse]:
     """Get comprehensive database migration status and history."""
     log_api_call("get_migration_status", user_id=str(current_user.id))
@@ -251,7 +251,7 @@ async def get_migration_status(
 @handle_api_errors("Failed to upgrade database")
 async def upgrade_database(
     revision: str = Query("head", description="Target revision (default: head)"),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
 ) -> APIResponse[DatabaseUpgradeResult]:
     """Execute database schema migrations to upgrade to target revision."""
     log_api_call("upgrade_database", user_id=str(current_user.id), revision=revision)
@@ -287,7 +287,7 @@ async def upgrade_database(
 @handle_api_errors("Failed to downgrade database")
 async def downgrade_database(
     revision: str = Query(..., description="Target revision to downgrade to"),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
 ) -> APIResponse[DatabaseDowngradeResult]:
     """Downgrade database schema to a previous migration revision."""
     log_api_call("downgrade_database", user_id=str(current_user.id), revision=revision)
@@ -326,7 +326,7 @@ async def create_database_backup(
         None, description="Output file path (auto-generated if not provided)"
     ),
     schema_only: bool = Query(False, description="Backup schema only (no data)"),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
 ) -> APIResponse[DatabaseBackupResult]:
     """Create a comprehensive database backup using PostgreSQL dump utilities."""
     log_api_call("create_database_backup", user_id=str(current_user.id))
@@ -392,7 +392,7 @@ async def create_database_backup(
 @handle_api_errors("Failed to restore database")
 async def restore_database(
     backup_file: str = Query(..., description="Backup file path to restore from"),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
 ) -> APIResponse[DatabaseRestoreResult]:
     """Restore database from a backup file with comprehensive data replacement."""
     log_api_call(
@@ -452,7 +452,7 @@ async def restore_database(
 @handle_api_errors("Failed to vacuum database")
 async def vacuum_database(
     analyze: bool = Query(True, description="Run ANALYZE after VACUUM"),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_session),
 ) -> APIResponse[VacuumResult]:
     """Execute database maintenance with VACUUM operations for optimal performance."""
@@ -488,7 +488,7 @@ async def vacuum_database(
 @router.get("/analyze", response_model=APIResponse[DatabaseAnalysisResponse])
 @handle_api_errors("Failed to analyze database")
 async def analyze_database(
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[DatabaseAnalysisResponse]:
     """Perform comprehensive database analysis with performance insights and recommendations."""
@@ -624,7 +624,7 @@ async def execute_custom_query(
     limit: int = Query(
         100, ge=1, le=1000, description="Result limit for SELECT queries"
     ),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[DatabaseQueryResponse]:
     """Execute custom SQL queries with comprehensive safety controls and monitoring."""
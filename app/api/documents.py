@@ -9,16 +9,18 @@ from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import (
     get_current_superuser,
     get_current_user,
     get_document_service,
 )
-from app.models.document import Document, FileStatus
+from app.models.document import Document, FileStatus, document_text_match
 from app.models.user import User
 from app.services.background_processor import get_background_processor
+from app.services.bulk_delete import delete_documents_where, get_file_reaper
 from app.services.document import DocumentService
+from app.services.principal import Principal
 from app.utils.api_errors import handle_api_errors, log_api_call
 from app.utils.timestamp import utcnow
 from shared.schemas.common import APIResponse, PaginatedResponse, PaginationParams
@@ -56,7 +58,7 @@ async def upload_document(
     title: str = Form(...),
     auto_process: bool = Form(default=True),
     processing_priority: int = Form(default=5, ge=1, le=10),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     service: DocumentService = Depends(get_document_service),
 ) -> APIResponse[DocumentUploadResponse]:
     """Upload a document for processing."""
@@ -107,19 +109,25 @@ async def list_documents(
     search: Optional[str] = Query(None, description="Search in documents"),
     file_type: Optional[str] = Query(None),
     status_filter: Optional[str] = Query(None, alias="status"),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="Cursor returned with the previous page"),
+    count: str = Query(
+        "exact", pattern="^(exact|estimate|none)$", description="Total count mode"
+    ),
+    current_user: Principal = Depends(get_current_user),
     document_service: DocumentService = Depends(get_document_service),
 ) -> APIResponse[PaginatedResponse[DocumentResponse]]:
     """List user's documents with pagination and filtering."""
     log_api_call("list_documents", user_id=current_user.id)
 
-    documents, total = await document_service.list_documents(
+    documents, total, next_cursor, has_more = await document_service.list_documents(
         user_id=current_user.id,
         file_type=file_type,
         status_filter=status_filter,
         search=search,
         page=page,
         size=size,
+        cursor=cursor,
+        count=count,
     )
 
     document_responses = [DocumentResponse.model_validate(document) for document in documents]
@@ -130,6 +138,8 @@ async def list_documents(
             total=total,
             page=page,
             per_page=size,
+            next_cursor=next_cursor,
+            has_more=has_more,
         ),
     )
 
@@ -144,7 +154,7 @@ async def list_documents(
 @handle_api_errors("Failed to retrieve document")
 async def get_document(
     document_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     document_service: DocumentService = Depends(get_document_service),
 ) -> APIResponse[DocumentResponse]:
     """Get document by ID."""
@@ -178,7 +188,7 @@ async def get_document(
 async def update_document(
     document_id: int,
     request: DocumentUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     document_service: DocumentService = Depends(get_document_service),
 ) -> APIResponse[DocumentResponse]:
     """Update document metadata."""
@@ -200,7 +210,7 @@ async def update_document(
 @handle_api_errors("Document deletion failed")
 async def delete_document(
     document_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     document_service: DocumentService = Depends(get_document_service),
 ) -> APIResponse:
     """Delete document and all associated data."""
@@ -230,7 +240,7 @@ async def get_status(
     task_id: Optional[str] = Query(
         None, description="Optional task ID for background processing details"
     ),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     service: DocumentService = Depends(get_document_service),
 ) -> APIResponse[ProcessingStatusResponse]:
     """Get document processing status with optional background task information."""
@@ -273,7 +283,7 @@ async def get_status(
 @handle_api_errors("Reprocessing failed for document", log_errors=True)
 async def reprocess_document(
     document_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     document_service: DocumentService = Depends(get_document_service),
 ) -> APIResponse:
     """Reprocess document."""
@@ -294,7 +304,7 @@ async def reprocess_document(
 @handle_api_errors("Download of document failed", log_errors=True)
 async def download_document(
     document_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     document_service: DocumentService = Depends(get_document_service),
 ) -> FileResponse:
     """Download original document file."""
@@ -317,7 +327,7 @@ async def start_document_processing(
     priority: int = Query(
         default=5, ge=1, le=10, description="Processing priority (1=highest, 10=lowest)"
     ),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     service: DocumentService = Depends(get_document_service),
 ) -> APIResponse[BackgroundTaskResponse]:
     """Start background processing for a document."""
@@ -377,7 +387,7 @@ async def get_processing_config() -> APIResponse[ProcessingConfigResponse]:
 @router.get("/queue-status", response_model=APIResponse[QueueStatusResponse])
 @handle_api_errors("Failed to get queue status", log_errors=True)
 async def get_queue_status(
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[QueueStatusResponse]:
     """Get background processing queue status."""
@@ -414,8 +424,7 @@ async def cleanup_documents(
     dry_run: bool = Query(
         True, description="Perform dry run without actually deleting"
     ),
-    current_user: User = Depends(get_current_superuser),
-    document_service: DocumentService = Depends(get_document_service),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse:
     """Clean up old or failed documents."""
@@ -427,9 +436,9 @@ async def cleanup_documents(
         dry_run=dry_run,
     )
 
-    # Build query
+    # Build filters
     cutoff_date = utcnow() - timedelta(days=older_than_days)
-    query = select(Document).where(Document.created_at < cutoff_date)
+    filters = [Document.created_at < cutoff_date]
 
     # Apply status filter
     if status_filter:
@@ -446,66 +455,67 @@ async def cleanup_documents(
                 message=f"Invalid status filter. Use one of: {list(status_map.keys())}",
             )
 
-        query = query.where(Document.status == status_map[status_filter])
+        filters.append(Document.status == status_map[status_filter])
 
-    # Get documents to be deleted
-    result = await db.execute(query)
-    documents = result.scalars().all()
+    criteria = {
+        "status_filter": status_filter,
+        "older_than_days": older_than_days,
+        "cutoff_date": cutoff_date.isoformat(),
+    }
 
     if dry_run:
-        preview = []
-        for doc in documents[:10]:  # Limit preview to 10 items
-            preview.append(
-                CleanupPreviewItem(
-                    id=str(doc.id),
-                    title=doc.title,
-                    status=doc.status.value,
-                    created_at=doc.created_at.isoformat(),
-                    file_size=doc.file_size,
-                )
+        totals = await db.execute(
+            select(func.count(), func.coalesce(func.sum(Document.file_size), 0)).where(
+                *filters
             )
+        )
+        total_count, total_size = totals.one()
 
-        criteria = {
-            "status_filter": status_filter,
-            "older_than_days": older_than_days,
-            "cutoff_date": cutoff_date.isoformat(),
-        }
+        preview_rows = await db.execute(
+            select(
+                Document.id,
+                Document.title,
+                Document.status,
+                Document.created_at,
+                Document.file_size,
+            )
+            .where(*filters)
+            .order_by(Document.created_at)
+            .limit(10)  # Limit preview to 10 items
+        )
+        preview = [
+            CleanupPreviewItem(
+                id=str(row.id),
+                title=row.title,
+                status=row.status.value,
+                created_at=row.created_at.isoformat(),
+                file_size=row.file_size,
+            )
+            for row in preview_rows
+        ]
 
         payload = CleanupDryRunResponse(
-            total_count=len(documents),
+            total_count=total_count,
             preview=preview,
-            total_size_bytes=sum(doc.file_size or 0 for doc in documents),
+            total_size_bytes=total_size,
             criteria=criteria,
         )
 
         return APIResponse[CleanupDryRunResponse](
             success=True,
-            message=f"Dry run: {len(documents)} documents would be deleted",
+            message=f"Dry run: {total_count} documents would be deleted",
             data=payload,
         )
     else:
-        deleted_count = 0
-        deleted_size = 0
-        errors = []
-
-        for doc in documents:
-            try:
-                await document_service.delete_document(doc.id)
-                deleted_count += 1
-                deleted_size += doc.file_size or 0
-            except Exception as e:
-                errors.append(f"Failed to delete document {doc.id}: {str(e)}")
-
-        criteria = {
-            "status_filter": status_filter,
-            "older_than_days": older_than_days,
-            "cutoff_date": cutoff_date.isoformat(),
-        }
+        # Set-based deletes in batches; files are removed in the background
+        deleted_count, deleted_size = await delete_documents_where(
+            db, filters, get_file_reaper()
+        )
 
         payload = CleanupDeletedResponse(
             deleted_count=deleted_count,
             deleted_size_bytes=deleted_size,
-            errors=errors[:5],  # Limit error reporting
+            errors=[],
             criteria=criteria,
         )
 
@@ -519,8 +529,8 @@ async def cleanup_documents(
 @router.get("/stats", response_model=APIResponse[DocumentStatisticsData])
 @handle_api_errors("Failed to get document statistics")
 async def get_document_statistics(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ) -> APIResponse[DocumentStatisticsData]:
     """Get comprehensive document statistics."""
     log_api_call("get_document_statistics", user_id=str(current_user.id))
@@ -675,7 +685,7 @@ async def bulk_reprocess_documents(
     limit: int = Query(
         10, ge=1, le=100, description="Maximum number of documents to reprocess"
     ),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     document_service: DocumentService = Depends(get_document_service),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[BulkReprocessResponse]:
@@ -772,7 +782,7 @@ async def advanced_document_search(
         None, ge=0, description="Maximum file size in bytes"
     ),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[AdvancedSearchData]:
     """Perform advanced document search with multiple filters."""
@@ -782,15 +792,12 @@ async def advanced_document_search(
 
     filters = []
 
-    # Text search in title and content
+    # Text search in title (trigram index) and title/summary/chunk content
+    # (tsvector indexes)
     if query:
         text_filter = or_(
             Document.title.ilike(f"%{query}%"),
-            (
-                Document.content.ilike(f"%{query}%")
-                if hasattr(Document, "content")
-                else False
-            ),
+            document_text_match(query),
         )
         filters.append(text_filter)
 
@@ -7,7 +7,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_db, get_pool_stats
 from app.dependencies import get_mcp_service
 from app.middleware.performance import get_performance_stats
 from app.services.mcp_service import MCPService
@@ -374,6 +374,7 @@ async def get_system_metrics() -> APIResponse[SystemMetricsPayload]:
         payload = SystemMetricsPayload(
             system=system_metrics,
             application=application_metrics,
+            database_pools=get_pool_stats(),
         )
         return APIResponse[SystemMetricsPayload](
             success=True,
@@ -387,6 +388,7 @@ async def get_system_metrics() -> APIResponse[SystemMetricsPayload]:
                 "version": settings.app_version,
                 "debug_mode": settings.debug,
             },
+            database_pools=get_pool_stats(),
         )
         return APIResponse[SystemMetricsPayload](
             success=False,
@@ -11,8 +11,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.dependencies import get_current_superuser, get_current_user
-from app.models.user import User
 from app.services.job_service import JobService
+from app.services.principal import Principal
 from app.utils.api_errors import handle_api_errors, log_api_call
 from app.utils.timestamp import utcnow
 from shared.schemas.common import APIResponse
@@ -40,7 +40,7 @@ router = APIRouter(tags=["jobs"])
 @handle_api_errors("Failed to create job")
 async def create_job(
     job_data: JobCreate,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[JobResponse]:
     """Create a new scheduled job with validation and next run calculation."""
@@ -68,7 +68,11 @@ async def list_jobs(
     size: int = Query(20, ge=1, le=100, description="Page size"),
     sort_by: str = Query("created_at", description="Sort field"),
     sort_order: str = Query("desc", description="Sort order (asc/desc)"),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="Cursor returned with the previous page"),
+    count: str = Query(
+        "exact", pattern="^(exact|estimate|none)$", description="Total count mode"
+    ),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[JobListResponse]:
     """List jobs with filtering, searching and pagination."""
@@ -84,10 +88,12 @@ async def list_jobs(
         page=page,
         size=size,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        count=count,
     )
     
-    jobs, total = await job_service.list_jobs(search_params)
+    jobs, total, next_cursor, has_more = await job_service.list_jobs(search_params)
     job_responses = [JobResponse.model_validate(job) for job in jobs]
     
     return APIResponse[JobListResponse](
@@ -98,7 +104,8 @@ async def list_jobs(
             total=total,
             page=page,
             size=size,
-            has_next=(page * size) < total
+            has_next=has_more,
+            next_cursor=next_cursor,
         )
     )
 
@@ -107,7 +114,7 @@ async def list_jobs(
 @handle_api_errors("Failed to get job")
 async def get_job(
     job_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[JobResponse]:
     """Get job by ID with detailed information."""
@@ -128,7 +135,7 @@ async def get_job(
 async def update_job(
     job_id: int,
     job_data: JobUpdate,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[JobResponse]:
     """Update job configuration with validation and schedule recalculation."""
@@ -148,7 +155,7 @@ async def update_job(
 @handle_api_errors("Failed to delete job")
 async def delete_job(
     job_id: int,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[dict]:
     """Delete job permanently."""
@@ -174,7 +181,7 @@ async def delete_job(
 async def execute_job(
     job_id: int,
     execution_request: Optional[JobExecutionRequest] = None,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[JobExecutionResponse]:
     """Manually trigger job execution with optional parameter overrides."""
@@ -253,7 +260,7 @@ async def execute_job(
 @handle_api_errors("Failed to pause job")
 async def pause_job(
     job_id: int,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[JobResponse]:
     """Pause job execution (disable scheduling but keep configuration)."""
@@ -274,7 +281,7 @@ async def pause_job(
 @handle_api_errors("Failed to resume job")
 async def resume_job(
     job_id: int,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[JobResponse]:
     """Resume paused job execution."""
@@ -294,7 +301,7 @@ async def resume_job(
 @router.get("/overdue/list", response_model=APIResponse[JobListResponse])
 @handle_api_errors("Failed to get overdue jobs")
 async def get_overdue_jobs(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[JobListResponse]:
     """Get all jobs that are overdue for execution."""
@@ -320,7 +327,7 @@ async def get_overdue_jobs(
 @router.get("/stats/overview", response_model=APIResponse[JobStatsResponse])
 @handle_api_errors("Failed to get job statistics")
 async def get_job_stats(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[JobStatsResponse]:
     """Get comprehensive job statistics and metrics."""
@@ -344,7 +351,7 @@ async def get_job_stats(
 @handle_api_errors("Failed to validate schedule")
 async def validate_schedule(
     request: JobScheduleValidationRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[JobScheduleValidationResponse]:
     """Validate job schedule configuration and preview next execution times."""
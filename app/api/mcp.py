@@ -8,8 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.exceptions import NotFoundError
 from app.database import get_db
 from app.dependencies import get_current_superuser, get_mcp_service
-from app.models.user import User
 from app.services.mcp_service import MCPService
+from app.services.principal import Principal
 from app.utils.api_errors import handle_api_errors, log_api_call
 from shared.schemas.common import APIResponse
 from shared.schemas.mcp import (
@@ -21,6 +21,7 @@ from shared.schemas.mcp import (
     MCPToolExecutionResultSchema,
     MCPToolResponse,
     MCPToolsResponse,
+    MCPToolUpdateSchema,
     MCPToolUsageStatsSchema,
 )
 
@@ -33,7 +34,7 @@ async def list_servers(
     enabled_only: bool = Query(False, description="Show only enabled servers"),
     connected_only: bool = Query(False, description="Show only connected servers"),
     detailed: bool = Query(False, description="Include detailed information"),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
     mcp_service: MCPService = Depends(get_mcp_service),
 ) -> APIResponse[List[MCPServerSchema]]:
@@ -61,7 +62,7 @@ async def list_servers(
 @handle_api_errors("Failed to create MCP server")
 async def create_server(
     server_data: MCPServerCreateSchema,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
     mcp_service: MCPService = Depends(get_mcp_service),
 ) -> APIResponse[MCPServerSchema]:
@@ -85,7 +86,7 @@ async def create_server(
 @handle_api_errors("Failed to get MCP server")
 async def get_server(
     server_name: str,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
     mcp_service: MCPService = Depends(get_mcp_service),
 ) -> APIResponse[MCPServerSchema]:
@@ -112,7 +113,7 @@ async def get_server(
 async def update_server(
     server_name: str,
     server_update: MCPServerUpdateSchema,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
     mcp_service: MCPService = Depends(get_mcp_service),
 ) -> APIResponse[MCPServerSchema]:
@@ -135,7 +136,7 @@ async def update_server(
 @handle_api_errors("Failed to delete MCP server")
 async def delete_server(
     server_name: str,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
     mcp_service: MCPService = Depends(get_mcp_service),
 ):
@@ -157,7 +158,7 @@ async def list_tools(
     server: Optional[str] = Query(None, description="Filter by server name"),
     enabled_only: bool = Query(False, description="Show only enabled tools"),
     detailed: bool = Query(False, description="Include detailed information"),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[List[MCPToolResponse]]:
     """List all available MCP tools with filtering and detailed information."""
@@ -180,11 +181,34 @@ async def list_tools(
     )
 
 
+@router.patch("/tools/byname/{tool_name}", response_model=APIResponse[MCPToolResponse])
+@handle_api_errors("Failed to update MCP tool")
+async def update_tool(
+    tool_name: str,
+    tool_update: MCPToolUpdateSchema,
+    current_user: Principal = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_db),
+    mcp_service: MCPService = Depends(get_mcp_service),
+) -> APIResponse[MCPToolResponse]:
+    """Update configuration of an MCP tool, including its result caching policy."""
+    log_api_call("update_mcp_tool", user_id=current_user.id, tool_name=tool_name)
+
+    tool = await mcp_service.update_tool(tool_name, tool_update)
+    if not tool:
+        raise NotFoundError(f"MCP tool '{tool_name}' not found")
+
+    return APIResponse[MCPToolResponse](
+        success=True,
+        message=f"MCP tool '{tool_name}' updated successfully",
+        data=tool,
+    )
+
+
 @router.patch("/tools/byname/{tool_name}/enable", response_model=APIResponse)
 @handle_api_errors("Failed to enable MCP tool")
 async def enable_tool(
     tool_name: str,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
     mcp_service: MCPService = Depends(get_mcp_service),
 ) -> APIResponse:
@@ -205,7 +229,7 @@ async def enable_tool(
 @handle_api_errors("Failed to disable MCP tool")
 async def disable_tool(
     tool_name: str,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
     mcp_service: MCPService = Depends(get_mcp_service),
 ):
@@ -225,7 +249,7 @@ async def disable_tool(
 @router.get("/stats", response_model=APIResponse[List[MCPToolUsageStatsSchema]])
 @handle_api_errors("Failed to get MCP statistics")
 async def get_mcp_stats(
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
     mcp_service: MCPService = Depends(get_mcp_service),
 ) -> APIResponse[List[MCPToolUsageStatsSchema]]:
@@ -245,7 +269,7 @@ async def get_mcp_stats(
 @handle_api_errors("Failed to get MCP tool details")
 async def get_tool_details(
     tool_name: str,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[MCPToolsResponse]:
     """Get detailed information about a specific MCP tool by name.
@@ -274,7 +298,7 @@ async def get_tool_details(
 async def test_tool(
     tool_name: str,
     test_params: Optional[Dict[str, Any]] = None,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[MCPToolExecutionResultSchema]:
     """Test execution of a specific MCP tool with optional parameters.
@@ -301,7 +325,7 @@ async def test_tool(
 @router.post("/refresh", response_model=APIResponse)
 @handle_api_errors("Failed to refresh MCP")
 async def refresh_mcp(
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
     mcp_service: MCPService = Depends(get_mcp_service),
 ):
@@ -10,7 +10,7 @@ from app.dependencies import (
     get_current_user,
     get_profile_service,
 )
-from app.models.user import User
+from app.services.principal import Principal
 from app.services.profile_service import LLMProfileService
 from app.utils.api_errors import handle_api_errors, log_api_call
 from shared.schemas.common import (
@@ -33,7 +33,7 @@ router = APIRouter(tags=["profiles"])
 @handle_api_errors("Failed to create profile")
 async def create_profile(
     request: LLMProfileCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     profile_service: LLMProfileService = Depends(get_profile_service),
 ) -> APIResponse[LLMProfileResponse]:
     """Create a new LLM parameter profile with validation."""
@@ -63,7 +63,7 @@ async def list_profiles(
     search: Optional[str] = Query(None, description="Search in profiles"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Items per page"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     profile_service: LLMProfileService = Depends(get_profile_service),
 ) -> APIResponse[PaginatedResponse[LLMProfileResponse]]:
     """List all LLM parameter profiles with filtering and pagination."""
@@ -100,7 +100,7 @@ async def list_profiles(
 @handle_api_errors("Failed to get profile details")
 async def get_profile_details(
     profile_name: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     profile_service: LLMProfileService = Depends(get_profile_service),
 ) -> APIResponse[LLMProfileResponse]:
     """Get detailed information about a specific LLM profile by name."""
@@ -123,7 +123,7 @@ async def get_profile_details(
 async def update_profile(
     profile_name: str,
     profile_data: LLMProfileUpdate,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     profile_service: LLMProfileService = Depends(get_profile_service),
 ) -> APIResponse[LLMProfileResponse]:
     """Update an existing LLM profile with new parameters or metadata."""
@@ -149,7 +149,7 @@ async def update_profile(
 @handle_api_errors("Failed to delete profile")
 async def delete_profile(
     profile_name: str,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     profile_service: LLMProfileService = Depends(get_profile_service),
 ) -> APIResponse:
     """Delete an LLM profile from the system."""
@@ -174,7 +174,7 @@ async def delete_profile(
 @handle_api_errors("Failed to set default profile")
 async def set_default_profile(
     profile_name: str,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     profile_service: LLMProfileService = Depends(get_profile_service),
 ) -> APIResponse[BaseResponse]:
     """Set a profile as the default LLM parameter profile for the system."""
@@ -192,7 +192,7 @@ async def set_default_profile(
 @router.get("/default", response_model=APIResponse[LLMProfileResponse])
 @handle_api_errors("Failed to get default profile")
 async def get_default_profile(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     profile_service: LLMProfileService = Depends(get_profile_service),
 ) -> APIResponse[LLMProfileResponse]:
     """Get detailed information about the defualt LLM profile."""
@@ -212,7 +212,7 @@ async def get_default_profile(
 @handle_api_errors("Failed to activate profile")
 async def activate_profile(
     profile_name: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     profile_service: LLMProfileService = Depends(get_profile_service),
 ) -> APIResponse:
     """Activate a profile."""
@@ -243,7 +243,7 @@ async def activate_profile(
 @handle_api_errors("Failed to deactivate profile")
 async def deactivate_profile(
     profile_name: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     profile_service: LLMProfileService = Depends(get_profile_service),
 ) -> APIResponse:
     """Deactivate a profile."""
@@ -273,7 +273,7 @@ async def deactivate_profile(
 @router.get("/stats", response_model=APIResponse[LLMProfileStatisticsData])
 @handle_api_errors("Failed to get profile statistics")
 async def get_profile_stats(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     profile_service: LLMProfileService = Depends(get_profile_service),
 ) -> APIResponse[LLMProfileStatisticsData]:
     """Get comprehensive LLM profile usage statistics and analytics."""
@@ -291,7 +291,7 @@ async def get_profile_stats(
 @handle_api_errors("Failed to validate parameters")
 async def validate_parameters(
     parameters: Dict[str, Any],
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     profile_service: LLMProfileService = Depends(get_profile_service),
 ) -> APIResponse[dict]:
     """Validate LLM parameters before profile creation or update."""
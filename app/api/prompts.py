@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, Query
 
 from app.core.exceptions import NotFoundError, ValidationError
 from app.dependencies import get_current_superuser, get_current_user, get_prompt_service
-from app.models.user import User
+from app.services.principal import Principal
 from app.services.prompt_service import PromptService
 from app.utils.api_errors import handle_api_errors, log_api_call
 from shared.schemas.common import APIResponse, PaginatedResponse, PaginationParams
@@ -29,7 +29,7 @@ async def list_prompts(
     search: Optional[str] = Query(None, description="Search in prompts"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Items per page"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     prompt_service: PromptService = Depends(get_prompt_service),
 ) -> APIResponse[PaginatedResponse[PromptResponse]]:
     """List all prompts with filtering, categorization, and pagination."""
@@ -67,7 +67,7 @@ async def list_prompts(
 @handle_api_errors("Failed to get prompt details")
 async def get_prompt_details(
     prompt_name: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     prompt_service: PromptService = Depends(get_prompt_service),
 ) -> APIResponse[PromptResponse]:
     """Get detailed information about a specific prompt by name."""
@@ -90,7 +90,7 @@ async def get_prompt_details(
 @handle_api_errors("Failed to create prompt")
 async def create_prompt(
     request: PromptCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     prompt_service: PromptService = Depends(get_prompt_service),
 ) -> APIResponse[PromptResponse]:
     """Create a new prompt template in the registry."""
@@ -118,7 +118,7 @@ async def create_prompt(
 async def update_prompt(
     prompt_name: str,
     data: PromptUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     prompt_service: PromptService = Depends(get_prompt_service),
 ) -> APIResponse[PromptResponse]:
     """Update an existing prompt template."""
@@ -139,7 +139,7 @@ async def update_prompt(
 @handle_api_errors("Failed to delete prompt")
 async def delete_prompt(
     prompt_name: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     prompt_service: PromptService = Depends(get_prompt_service),
 ) -> APIResponse:
     """Delete a prompt template from the registry."""
@@ -157,7 +157,7 @@ async def delete_prompt(
 @handle_api_errors("Failed to activate prompt")
 async def activate_prompt(
     prompt_name: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     prompt_service: PromptService = Depends(get_prompt_service),
 ) -> APIResponse:
     """Activate a prompt."""
@@ -188,7 +188,7 @@ async def activate_prompt(
 @handle_api_errors("Failed to deactivate prompt")
 async def deactivate_prompt(
     prompt_name: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     prompt_service: PromptService = Depends(get_prompt_service),
 ) -> APIResponse:
     """Deactivate a prompt."""
@@ -218,7 +218,7 @@ async def deactivate_prompt(
 @router.get("/categories/", response_model=APIResponse[PromptCategoriesData])
 @handle_api_errors("Failed to get categories")
 async def get_categories(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     prompt_service: PromptService = Depends(get_prompt_service),
 ) -> APIResponse[PromptCategoriesData]:
     """Get all available prompt categories and tags for organization."""
@@ -243,7 +243,7 @@ async def get_categories(
 @handle_api_errors("Failed to set default prompt")
 async def set_default_prompt(
     prompt_name: str,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     prompt_service: PromptService = Depends(get_prompt_service),
 ) -> APIResponse:
     """Set a prompt as the default system prompt for conversations."""
@@ -263,7 +263,7 @@ async def set_default_prompt(
 @router.get("/stats", response_model=APIResponse[PromptStatisticsData])
 @handle_api_errors("Failed to get prompt statistics")
 async def get_prompt_stats(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     prompt_service: PromptService = Depends(get_prompt_service),
 ) -> APIResponse[PromptStatisticsData]:
     """Get comprehensive prompt usage statistics and analytics."""
@@ -5,7 +5,7 @@ import time
 from fastapi import APIRouter, Depends, Query
 
 from app.dependencies import get_current_user, get_search_service
-from app.models.user import User
+from app.services.principal import Principal
 from app.services.search import SearchService
 from app.utils.api_errors import handle_api_errors, log_api_call
 from shared.schemas.common import APIResponse
@@ -19,7 +19,7 @@ router = APIRouter(tags=["search"])
 @handle_api_errors("Search operation failed")
 async def search_documents(
     request: DocumentSearchRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     search_service: SearchService = Depends(get_search_service),
 ) -> APIResponse[DocumentSearchResponse]:
     """Search through documents using multiple algorithms."""
@@ -58,7 +58,7 @@ async def search_documents(
 async def find_similar_chunks(
     chunk_id: int,
     limit: int = Query(5, ge=1, le=20),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     search_service: SearchService = Depends(get_search_service),
 ) -> APIResponse[DocumentSearchResponse]:
     """Find document chunks similar to a specified reference chunk."""
@@ -97,7 +97,7 @@ async def find_similar_chunks(
 async def get_search_suggestions(
     query: str = Query(..., min_length=1),
     limit: int = Query(5, ge=1, le=10),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     search_service: SearchService = Depends(get_search_service),
 ) -> APIResponse[SearchSuggestionData]:
     """Generate intelligent search query suggestions."""
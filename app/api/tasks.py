@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.exceptions import ExternalServiceError, ValidationError
 from app.database import get_db
 from app.dependencies import get_current_superuser, get_current_user
-from app.models.user import User
+from app.services.principal import Principal
 from app.utils.api_errors import handle_api_errors, log_api_call
 from app.utils.timestamp import utcnow
 from shared.schemas.common import APIResponse
@@ -46,7 +46,7 @@ def get_celery_app():
 @router.get("/status", response_model=APIResponse[TaskSystemStatusData])
 @handle_api_errors("Failed to get task system status")
 async def get_task_system_status(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> APIResponse[TaskSystemStatusData]:
     """Get comprehensive background task system status and health metrics."""
     log_api_call("get_task_system_status", user_id=str(current_user.id))
@@ -106,7 +106,7 @@ async def get_task_system_status(
 @router.get("/workers", response_model=APIResponse[WorkerStatusData])
 @handle_api_errors("Failed to get worker information")
 async def get_workers_info(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> APIResponse[WorkerStatusData]:
     """Get comprehensive information about Celery workers with detailed status and metrics."""
     log_api_call("get_workers_info", user_id=str(current_user.id))
@@ -159,7 +159,7 @@ async def get_workers_info(
 @handle_api_errors("Failed to get queue information")
 async def get_queue_info(
     queue_name: Optional[str] = Query(None, description="Specific queue to check"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> APIResponse[QueueStatusData]:
     """Get comprehensive task queue information with detailed metrics and task tracking."""
     log_api_call("get_queue_info", user_id=str(current_user.id), queue_name=queue_name)
@@ -254,7 +254,7 @@ async def get_queue_info(
 @router.get("/active", response_model=APIResponse[ActiveTasksData])
 @handle_api_errors("Failed to get active tasks")
 async def get_active_tasks(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> APIResponse[ActiveTasksData]:
     """Get comprehensive information about currently executing tasks with detailed metadata."""
     log_api_call("get_active_tasks", user_id=str(current_user.id))
@@ -302,7 +302,7 @@ async def schedule_task(
         None, ge=0, description="Delay in seconds before execution"
     ),
     queue: str = Query("default", description="Queue to send the task to"),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
 ) -> APIResponse[dict]:
     """Schedule background tasks for execution with comprehensive parameter control."""
     log_api_call("schedule_task", user_id=str(current_user.id), task_name=task_name)
@@ -347,7 +347,7 @@ async def retry_failed_tasks(
     max_retries: int = Query(
         10, ge=1, le=100, description="Maximum number of tasks to retry"
     ),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[dict]:
     """Retry failed document processing tasks with intelligent error recovery."""
@@ -414,7 +414,7 @@ async def retry_failed_tasks(
 @handle_api_errors("Failed to purge queue")
 async def purge_queue(
     queue_name: str = Query("default", description="Queue name to purge"),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
 ) -> APIResponse[dict]:
     """Purge all pending tasks from specified queue with comprehensive safety warnings."""
     log_api_call("purge_queue", user_id=str(current_user.id), queue_name=queue_name)
@@ -443,7 +443,7 @@ async def get_task_statistics(
     period_hours: int = Query(
         24, ge=1, le=168, description="Period in hours for statistics"
     ),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[TaskStatisticsData]:
     """Get comprehensive task execution statistics and performance analytics."""
@@ -549,7 +549,7 @@ async def get_task_statistics(
 @router.get("/monitor", response_model=APIResponse[TaskMonitoringData])
 @handle_api_errors("Failed to get monitoring data")
 async def get_monitoring_data(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> APIResponse[TaskMonitoringData]:
     """Get real-time monitoring data for comprehensive task system observability."""
     log_api_call("get_monitoring_data", user_id=str(current_user.id))
@@ -564,14 +564,10 @@ async def get_monitoring_data(
     worker_response = await get_workers_info(current_user)
 
     # Get recent statistics (pass database session)
-    from app.database import get_db
+    from app.database import AsyncSessionLocal
 
-    db_gen = get_db()
-    db = await db_gen.__anext__()
-    try:
+    async with AsyncSessionLocal() as db:
         stats_response = await get_task_statistics(1, current_user, db)  # Last hour
-    finally:
-        await db_gen.aclose()
 
     active_tasks_summary = TasksSummary(
         count=active_response.data.total_active,
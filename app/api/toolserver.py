@@ -7,8 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.dependencies import get_current_user, get_mcp_service
-from app.models.user import User
 from app.services.mcp_service import MCPService
+from app.services.principal import Principal
 from app.utils.api_errors import handle_api_errors, log_api_call
 from shared.schemas.common import APIResponse, PaginatedResponse, PaginationParams
 from shared.schemas.mcp import MCPConnectionTestSchema, MCPServerSchema
@@ -25,7 +25,7 @@ class ToolServerResponse(MCPServerSchema):
 @router.get("/servers")
 @handle_api_errors("Failed to retrieve tool servers")
 async def get_servers(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     mcp_service: MCPService = Depends(get_mcp_service),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[PaginatedResponse[ToolServerResponse]]:
@@ -58,7 +58,7 @@ async def get_servers(
 @router.get("/tools/all")
 @handle_api_errors("Failed to retrieve all tools")
 async def get_all_tools(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     mcp_service: MCPService = Depends(get_mcp_service),
 ) -> APIResponse[PaginatedResponse[Dict]]:
     """Get list of all available tools from all servers with pagination."""
@@ -103,7 +103,7 @@ async def get_all_tools(
 @handle_api_errors("Failed to test server connectivity")
 async def test_server_connectivity(
     server_id: str = Path(..., description="Server ID to test"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     mcp_service: MCPService = Depends(get_mcp_service),
 ) -> APIResponse[Dict]:
     """Test connectivity to a specific tool server."""
@@ -13,8 +13,8 @@ from app.core.exceptions import (
 )
 from app.database import get_db
 from app.dependencies import get_current_superuser, get_current_user, get_user_service
-from app.models.user import User
 from app.models.user import User as UserModel
+from app.services.principal import Principal
 from app.services.user import UserService
 from app.utils.api_errors import handle_api_errors, log_api_call
 from shared.schemas.auth import PasswordResetConfirm, PasswordResetRequest
@@ -36,7 +36,7 @@ router = APIRouter(tags=["users"])
 @router.get("/me", response_model=APIResponse[UserResponse])
 @handle_api_errors("Failed to retrieve user profile")
 async def get_my_profile(
-    current_user=Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse[UserResponse]:
     """Get current user profile with statistics."""
@@ -55,7 +55,7 @@ async def get_my_profile(
 @handle_api_errors("Profile update failed")
 async def update_my_profile(
     request: UserUpdate,
-    current_user=Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse[UserResponse]:
     """Update current user profile information."""
@@ -74,7 +74,7 @@ async def update_my_profile(
 @handle_api_errors("Password change failed")
 async def change_password(
     request: UserPasswordUpdate,
-    current_user=Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse:
     """Change current user password with security verification."""
@@ -138,7 +138,7 @@ async def list_users(
     search: Optional[str] = Query(None, description="Search in users"),
     active_only: bool = Query(False),
     superuser_only: bool = Query(False),
-    current_user=Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse[PaginatedResponse[UserResponse]]:
     """List all users with filtering and pagination."""
@@ -174,7 +174,7 @@ async def list_users(
 @handle_api_errors("Failed to retrieve user")
 async def get_user_byid(
     user_id: int,
-    current_user=Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse[UserResponse]:
     """Get user by ID (admin only)."""
@@ -192,7 +192,7 @@ async def get_user_byid(
 @handle_api_errors("Failed to retrieve user")
 async def get_user_byname(
     user_name: str,
-    current_user=Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse[UserResponse]:
     """Get user by name (admin only)."""
@@ -212,7 +212,7 @@ async def get_user_byname(
 async def update_user(
     user_id: int,
     request: UserUpdate,
-    current_user=Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse[UserResponse]:
     """Update user by ID (admin only)."""
@@ -233,7 +233,7 @@ async def update_user(
 @handle_api_errors("User deletion failed")
 async def delete_user(
     user_id: int,
-    current_user=Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse:
     """Delete user by ID (admin only)."""
@@ -259,7 +259,7 @@ async def delete_user(
 @handle_api_errors("Failed to promote user")
 async def promote_user_to_superuser(
     user_id: int,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse:
     """Promote a user to superuser status."""
@@ -267,32 +267,19 @@ async def promote_user_to_superuser(
         "promote_user", user_id=str(current_user.id), target_user_id=str(user_id)
     )
 
-    try:
-        user = await user_service.get_user_by_id(user_id)
-        if not user:
-            raise NotFoundError("User not found")
+    user = await user_service.set_user_superuser(user_id, True)
 
-        if user.is_superuser:
-            raise ValidationError("User is already a superuser")
-
-        # Promote user
-        user.is_superuser = True
-        await user_service.db.commit()
-
-        return APIResponse(
-            success=True,
-            message=f"User {user.username} promoted to superuser successfully",
-        )
-    except Exception:
-        await user_service.db.rollback()
-        raise
+    return APIResponse(
+        success=True,
+        message=f"User {user.username} promoted to superuser successfully",
+    )
 
 
 @router.post("/byid/{user_id}/demote", response_model=APIResponse)
 @handle_api_errors("Failed to demote user")
 async def demote_user_from_superuser(
     user_id: int,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse:
     """Demote a superuser to regular user status."""
@@ -304,32 +291,19 @@ async def demote_user_from_superuser(
     if current_user.id == user_id:
         raise ValidationError("Cannot demote yourself")
 
-    try:
-        user = await user_service.get_user_by_id(user_id)
-        if not user:
-            raise NotFoundError("User not found")
+    user = await user_service.set_user_superuser(user_id, False)
 
-        if not user.is_superuser:
-            raise ValidationError("User is not a superuser")
-
-        # Demote user
-        user.is_superuser = False
-        await user_service.db.commit()
-
-        return APIResponse(
-            success=True,
-            message=f"User {user.username} demoted from superuser successfully",
-        )
-    except Exception:
-        await user_service.db.rollback()
-        raise
+    return APIResponse(
+        success=True,
+        message=f"User {user.username} demoted from superuser successfully",
+    )
 
 
 @router.post("/byid/{user_id}/activate", response_model=APIResponse)
 @handle_api_errors("Failed to activate user")
 async def activate_user_account(
     user_id: int,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse:
     """Activate a user account."""
@@ -337,32 +311,19 @@ async def activate_user_account(
         "activate_user", user_id=str(current_user.id), target_user_id=str(user_id)
     )
 
-    try:
-        user = await user_service.get_user_by_id(user_id)
-        if not user:
-            raise NotFoundError("User not found")
+    user = await user_service.set_user_active(user_id, True)
 
-        if user.is_active:
-            raise ValidationError("User is already active")
-
-        # Activate user
-        user.is_active = True
-        await user_service.db.commit()
-
-        return APIResponse(
-            success=True,
-            message=f"User {user.username} activated successfully",
-        )
-    except Exception:
-        await user_service.db.rollback()
-        raise
+    return APIResponse(
+        success=True,
+        message=f"User {user.username} activated successfully",
+    )
 
 
 @router.post("/byid/{user_id}/deactivate", response_model=APIResponse)
 @handle_api_errors("Failed to deactivate user")
 async def deactivate_user_account(
     user_id: int,
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse:
     """Deactivate a user account."""
@@ -374,25 +335,12 @@ async def deactivate_user_account(
     if current_user.id == user_id:
         raise ValidationError("Cannot deactivate yourself")
 
-    try:
-        user = await user_service.get_user_by_id(user_id)
-        if not user:
-            raise NotFoundError("User not found")
+    user = await user_service.set_user_active(user_id, False)
 
-        if not user.is_active:
-            raise ValidationError("User is already inactive")
-
-        # Deactivate user
-        user.is_active = False
-        await user_service.db.commit()
-
-        return APIResponse(
-            success=True,
-            message=f"User {user.username} deactivated successfully",
-        )
-    except Exception:
-        await user_service.db.rollback()
-        raise
+    return APIResponse(
+        success=True,
+        message=f"User {user.username} deactivated successfully",
+    )
 
 
 @router.post("/byid/{user_id}/reset-password", response_model=APIResponse)
@@ -400,7 +348,7 @@ async def deactivate_user_account(
 async def admin_reset_user_password(
     user_id: int,
     new_password: str = Query(..., min_length=8, description="New password"),
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     user_service: UserService = Depends(get_user_service),
 ) -> APIResponse:
     """Reset a user's password (admin operation)."""
@@ -433,7 +381,7 @@ async def admin_reset_user_password(
 @router.get("/stats", response_model=APIResponse[UserStatsResponse])
 @handle_api_errors("Failed to get user statistics")
 async def get_user_statistics(
-    current_user: User = Depends(get_current_superuser),
+    current_user: Principal = Depends(get_current_superuser),
     db: AsyncSession = Depends(get_db),
 ) -> APIResponse[UserStatsResponse]:
     """Get comprehensive user statistics for administrative reporting."""
@@ -5,19 +5,47 @@ logging functionality into a single service with advanced features for productio
 monitoring, debugging, and performance analysis with structured logging support.
 """
 
+import atexit
+import copy
 import json
 import logging
 import logging.handlers
+import queue
 import sys
 import time
 import traceback
 import uuid
+from contextvars import ContextVar
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from app.config import settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Request context for log records. Context variables follow each request's
+# task, so concurrent requests never see each other's values.
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+_user_id: ContextVar[Optional[str]] = ContextVar("user_id", default=None)
+_operation: ContextVar[Optional[str]] = ContextVar("operation", default=None)
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a log entry to JSON, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj, default=str, option=orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib encoder handles them
+            pass
+    return json.dumps(obj, default=str)
+
 
 class StructuredFormatter(logging.Formatter):
     """Structured JSON formatter for production logging.
@@ -74,7 +102,7 @@ class StructuredFormatter(logging.Formatter):
                 "traceback": traceback.format_exception(*record.exc_info),
             }
 
-        return json.dumps(log_entry, default=str)
+        return _dumps(log_entry)
 
 
 class DevelopmentFormatter(logging.Formatter):
@@ -135,35 +163,89 @@ class ContextFilter(logging.Filter):
     """Filter to add contextual information to log records.
 
     Adds correlation IDs, user context, and operation context to all log records.
+    Context is read from context variables, so it must run where the record is
+    created, not on the log writer thread.
     """
 
     def filter(self, record: logging.LogRecord) -> bool:
         """Add context to log record."""
         # Add correlation ID if not present
         if not hasattr(record, "correlation_id"):
-            record.correlation_id = getattr(self, "_correlation_id", None)
+            record.correlation_id = _correlation_id.get()
 
         # Add user ID if not present
         if not hasattr(record, "user_id"):
-            record.user_id = getattr(self, "_user_id", None)
+            record.user_id = _user_id.get()
 
         # Add operation if not present
         if not hasattr(record, "operation"):
-            record.operation = getattr(self, "_operation", None)
+            record.operation = _operation.get()
 
         return True
 
     def set_correlation_id(self, correlation_id: str):
-        """Set correlation ID for this filter."""
-        self._correlation_id = correlation_id
+        """Set correlation ID for the current context."""
+        _correlation_id.set(correlation_id)
+
+    def set_user_id(self, user_id: Optional[str]):
+        """Set user ID for the current context."""
+        _user_id.set(user_id)
+
+    def set_operation(self, operation: Optional[str]):
+        """Set operation context for the current context."""
+        _operation.set(operation)
+
 
-    def set_user_id(self, user_id: str):
-        """Set user ID for this filter."""
-        self._user_id = user_id
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never blocks the caller.
 
-    def set_operation(self, operation: str):
-        """Set operation context for this filter."""
-        self._operation = operation
+    Records are handed to a QueueListener thread, which formats and writes
+    them, so slow stdout or disk never stalls the event loop. When the queue
+    is full records are dropped and counted, and a warning with the number
+    of dropped records is queued once there is room again.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        """Initialize handler.
+
+        Args:
+            log_queue: Bounded queue read by the listener thread
+
+        """
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the message arguments; formatting is left to the listener."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue a record, dropping it if the queue is full."""
+        if self.dropped:
+            try:
+                self.queue.put_nowait(self._dropped_record())
+                self.dropped = 0
+            except queue.Full:
+                self.dropped += 1
+                return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _dropped_record(self) -> logging.LogRecord:
+        return logging.LogRecord(
+            name=__name__,
+            level=logging.WARNING,
+            pathname=__file__,
+            lineno=0,
+            msg=f"Log queue full; dropped {self.dropped} log records",
+            args=None,
+            exc_info=None,
+        )
 
 
 class PerformanceLogger:
@@ -344,8 +426,10 @@ class LoggingService:
 
     def __init__(self):
         """Initialize LoggingService with default configuration."""
-        self._context_filter = None
+        self._context_filter = ContextFilter()
+        self._listener: Optional[logging.handlers.QueueListener] = None
         self._initialized = False
+        atexit.register(self.shutdown)
 
     def setup_logging(
         self,
@@ -379,6 +463,7 @@ class LoggingService:
         root_logger.setLevel(getattr(logging, log_level.upper()))
 
         # Clear existing handlers
+        self.shutdown()
         root_logger.handlers.clear()
 
         # Choose formatter
@@ -391,12 +476,7 @@ class LoggingService:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(getattr(logging, log_level.upper()))
         console_handler.setFormatter(formatter)
-
-        # Add context filter
-        self._context_filter = ContextFilter()
-        console_handler.addFilter(self._context_filter)
-
-        root_logger.addHandler(console_handler)
+        handlers = [console_handler]
 
         # File handler if specified
         if log_file:
@@ -410,9 +490,21 @@ class LoggingService:
             file_handler.setFormatter(
                 StructuredFormatter()
             )  # Always use structured format for files
-            file_handler.addFilter(self._context_filter)
-
-            root_logger.addHandler(file_handler)
+            handlers.append(file_handler)
+
+        # Callers only enqueue records; a listener thread formats and writes
+        # them. The context filter runs on the caller so it sees the
+        # caller's context variables.
+        log_queue = queue.Queue(maxsize=settings.log_queue_size)
+        queue_handler = NonBlockingQueueHandler(log_queue)
+        queue_handler.setLevel(getattr(logging, log_level.upper()))
+        queue_handler.addFilter(self._context_filter)
+        root_logger.addHandler(queue_handler)
+
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
 
         # Set up third-party library logging levels
         logging.getLogger("uvicorn").setLevel(logging.WARNING)
@@ -422,6 +514,12 @@ class LoggingService:
         self._initialized = True
         return root_logger
 
+    def shutdown(self):
+        """Write out queued log records and stop the listener thread."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
     def get_logger(self, name: str) -> logging.Logger:
         """Get a logger with standardized configuration.
 
@@ -496,30 +594,31 @@ class LoggingService:
         if correlation_id is None:
             correlation_id = str(uuid.uuid4())
 
-        if self._context_filter:
-            self._context_filter.set_correlation_id(correlation_id)
+        _correlation_id.set(correlation_id)
 
         return correlation_id
 
-    def set_user_context(self, user_id: str):
+    def get_correlation_id(self) -> Optional[str]:
+        """Return the correlation ID of the current context, if any."""
+        return _correlation_id.get()
+
+    def set_user_context(self, user_id: Optional[str]):
         """Set user context for logging.
 
         Args:
             user_id: User ID to associate with log entries
 
         """
-        if self._context_filter:
-            self._context_filter.set_user_id(user_id)
+        _user_id.set(user_id)
 
-    def set_operation_context(self, operation: str):
+    def set_operation_context(self, operation: Optional[str]):
         """Set operation context for logging.
 
         Args:
             operation: Operation name to associate with log entries
 
         """
-        if self._context_filter:
-            self._context_filter.set_operation(operation)
+        _operation.set(operation)
 
     def log_structured(
         self, logger: logging.Logger, level: str, message: str, **kwargs
@@ -582,12 +681,22 @@ def set_correlation_id(correlation_id: Optional[str] = None) -> str:
     return logging_service.set_correlation_id(correlation_id)
 
 
-def set_user_context(user_id: str):
+def get_correlation_id() -> Optional[str]:
+    """Get the current correlation ID using the global logging service."""
+    return logging_service.get_correlation_id()
+
+
+def shutdown_logging():
+    """Flush queued log records using the global logging service."""
+    logging_service.shutdown()
+
+
+def set_user_context(user_id: Optional[str]):
     """Set user context using the global logging service."""
     logging_service.set_user_context(user_id)
 
 
-def set_operation_context(operation: str):
+def set_operation_context(operation: Optional[str]):
     """Set operation context using the global logging service."""
     logging_service.set_operation_context(operation)
 
@@ -605,6 +714,8 @@ __all__ = [
     "get_component_logger",
     "get_performance_logger",
     "set_correlation_id",
+    "get_correlation_id",
+    "shutdown_logging",
     "set_user_context",
     "set_operation_context",
 ]
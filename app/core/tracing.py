@@ -0,0 +1,209 @@
+"""Optional OpenTelemetry tracing.
+
+Spans are emitted for the request pipeline, the chat stages, document
+ingestion stages and MCP tool calls when ``tracing_enabled`` is set and the
+OpenTelemetry SDK is installed::
+
+    pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http
+
+Spans are exported in batches to an OTLP/HTTP collector
+(``tracing_exporter=otlp``) or printed (``tracing_exporter=console``). When
+tracing is off, span() returns a shared no-op context manager, so
+instrumented code costs one function call.
+"""
+
+import contextlib
+import logging
+from typing import Any, AsyncIterator, ContextManager, Dict, Mapping, Optional
+
+from app.config import settings
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:  # pragma: no cover - optional dependency
+    propagate = None
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+_NO_SPAN = contextlib.nullcontext()
+
+_tracer = None
+_provider = None
+
+
+def setup_tracing() -> bool:
+    """Configure span export from settings.
+
+    Returns:
+        bool: True if tracing is active
+
+    """
+    global _tracer, _provider
+
+    if not settings.tracing_enabled or _tracer is not None:
+        return _tracer is not None
+    if trace is None:
+        logger.warning("Tracing enabled but OpenTelemetry is not installed")
+        return False
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio
+
+        if settings.tracing_exporter == "console":
+            from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+            exporter = ConsoleSpanExporter()
+        else:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+
+            exporter = OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    except ImportError as e:
+        logger.warning(f"Tracing enabled but OpenTelemetry is incomplete: {e}")
+        return False
+
+    _provider = TracerProvider(
+        resource=Resource.create(
+            {
+                "service.name": settings.tracing_service_name,
+                "service.version": settings.app_version,
+            }
+        ),
+        sampler=ParentBasedTraceIdRatio(settings.tracing_sample_rate),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    _tracer = _provider.get_tracer("app")
+    logger.info(f"Tracing enabled ({settings.tracing_exporter} exporter)")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and stop exporting."""
+    global _tracer, _provider
+
+    if _provider is not None:
+        _provider.shutdown()
+    _tracer = None
+    _provider = None
+
+
+def tracing_enabled() -> bool:
+    """Return whether spans are being recorded."""
+    return _tracer is not None
+
+
+def span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    kind: str = "internal",
+    **kwargs: Any,
+) -> ContextManager[Any]:
+    """Start a span as the current span for the duration of a with block.
+
+    Exceptions raised in the block are recorded on the span. Yields the
+    span, or None when tracing is off.
+
+    Args:
+        name: Span name, e.g. ``chat.llm``
+        attributes: Span attributes; None values are dropped
+        kind: Span kind name (internal, client, server, consumer, ...)
+        **kwargs: Passed to the tracer (e.g. context)
+
+    """
+    if _tracer is None:
+        return _NO_SPAN
+    if attributes:
+        attributes = {k: v for k, v in attributes.items() if v is not None}
+    return _tracer.start_as_current_span(
+        name, attributes=attributes, kind=trace.SpanKind[kind.upper()], **kwargs
+    )
+
+
+async def traced_stream(
+    name: str,
+    stream: AsyncIterator[Any],
+    attributes: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[Any]:
+    """Iterate an async stream inside a span.
+
+    The span is only current while the stream produces its next item, never
+    across this generator's yields, so spans the stream starts become its
+    children while the consumer's code between items does not, and the span
+    context is never detached in a different context than it was attached
+    in. The stream is closed when iteration stops early.
+
+    Args:
+        name: Span name
+        stream: Async iterator to wrap
+        attributes: Span attributes; None values are dropped
+
+    """
+    if _tracer is None:
+        async for item in stream:
+            yield item
+        return
+
+    if attributes:
+        attributes = {k: v for k, v in attributes.items() if v is not None}
+    stream_span = _tracer.start_span(name, attributes=attributes)
+    iterator = stream.__aiter__()
+    try:
+        while True:
+            with trace.use_span(stream_span):
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        stream_span.end()
+
+
+def continue_trace(
+    name: str,
+    carrier: Mapping[str, str],
+    kind: str = "server",
+    attributes: Optional[Dict[str, Any]] = None,
+) -> ContextManager[Any]:
+    """Start a span continuing the trace propagated in carrier.
+
+    Args:
+        name: Span name
+        carrier: Incoming request headers, or headers saved with
+            trace_headers() when work was handed off
+        kind: Span kind name (server, consumer, ...)
+        attributes: Span attributes; None values are dropped
+
+    """
+    if _tracer is None:
+        return _NO_SPAN
+    return span(name, attributes, kind, context=propagate.extract(carrier))
+
+
+def trace_headers() -> Dict[str, str]:
+    """Return headers propagating the current trace to an outgoing request."""
+    headers: Dict[str, str] = {}
+    if _tracer is not None:
+        propagate.inject(headers)
+    return headers
+
+
+def annotate_server_span(
+    request_span: Any, method: str, route: Optional[str], status_code: int
+) -> None:
+    """Name a request span after its route and record the response status."""
+    if route:
+        request_span.update_name(f"{method} {route}")
+        request_span.set_attribute("http.route", route)
+    request_span.set_attribute("http.request.method", method)
+    request_span.set_attribute("http.response.status_code", status_code)
+    if status_code >= 500:
+        request_span.set_status(trace.Status(trace.StatusCode.ERROR))
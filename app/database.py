@@ -9,23 +9,48 @@ with PGVector extension support.
 
 import asyncio
 import logging
+import math
 import sys
+import time
 import traceback
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional, Tuple
 
-from sqlalchemy import text
-from sqlalchemy.exc import DisconnectionError, OperationalError, SQLAlchemyError
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.core.default_data import initialize_default_data
 from app.models.base import BaseModelDB
+from app.utils.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    instrument_pool,
+    pool_metrics,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _pool_sizing() -> Tuple[int, int]:
+    """Return (pool_size, max_overflow) for this worker process.
+
+    When ``db_connection_budget`` is set it is split evenly across
+    ``workers`` processes (40% persistent, 60% overflow); otherwise the
+    explicit per-worker settings are used.
+    """
+    if settings.db_connection_budget:
+        per_worker = max(settings.db_connection_budget // settings.workers, 2)
+        pool_size = max(per_worker * 2 // 5, 1)
+        return pool_size, per_worker - pool_size
+    return settings.db_pool_size, settings.db_max_overflow
+
+
 # Create async engine with flexible database configuration
-def _get_engine_config():
+def _get_engine_config(pool_name: str = "primary"):
     """Get database engine configuration based on database type."""
     base_config = {
         "echo": settings.debug,
@@ -33,15 +58,18 @@ def _get_engine_config():
 
     # Check if we're using PostgreSQL
     if settings.database_url.startswith(("postgresql", "asyncpg")):
+        pool_size, max_overflow = _pool_sizing()
         # PostgreSQL-specific configuration
         base_config.update(
             {
                 "echo": "debug",
+                "poolclass": InstrumentedAsyncQueuePool,
+                "pool_logging_name": pool_name,
                 "pool_pre_ping": True,
-                "pool_size": 20,
-                "max_overflow": 30,
-                "pool_recycle": 1800,  # 30 minutes
-                "pool_timeout": 30,
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_recycle": settings.db_pool_recycle,
+                "pool_timeout": settings.db_pool_timeout,
                 "pool_reset_on_return": "commit",
                 "connect_args": {
                     "server_settings": {
@@ -55,81 +83,276 @@ def _get_engine_config():
     return base_config
 
 
-engine = create_async_engine(settings.database_url, **_get_engine_config())
+engine = create_async_engine(settings.database_url, **_get_engine_config("primary"))
+if isinstance(engine.sync_engine.pool, InstrumentedAsyncQueuePool):
+    instrument_pool(engine.sync_engine.pool, "primary")
+
+# Optional read replica; reads fall back to the primary when not configured
+replica_engine = (
+    create_async_engine(settings.database_replica_url, **_get_engine_config("replica"))
+    if settings.database_replica_url
+    else None
+)
+if replica_engine is not None and isinstance(
+    replica_engine.sync_engine.pool, InstrumentedAsyncQueuePool
+):
+    instrument_pool(replica_engine.sync_engine.pool, "replica")
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Return connection pool metrics for the primary and replica engines."""
+    stats = {}
+    for name, db_engine in (("primary", engine), ("replica", replica_engine)):
+        metrics = pool_metrics.get(name)
+        if db_engine is not None and metrics is not None:
+            stats[name] = metrics.snapshot(db_engine.sync_engine.pool)
+    return stats
+
+
+async def check_connection_budget(conn) -> None:
+    """Warn when all workers' pools together can exceed max_connections."""
+    pool_size, max_overflow = _pool_sizing()
+    required = settings.workers * (pool_size + max_overflow)
+    result = await conn.execute(text("SHOW max_connections"))
+    max_connections = int(result.scalar())
+    if required > max_connections:
+        logger.warning(
+            f"Database pools may exhaust server connections: {settings.workers} "
+            f"workers x (pool_size {pool_size} + max_overflow {max_overflow}) = "
+            f"{required} > max_connections {max_connections}"
+        )
+
+
+# Cookie keeping a client's reads on the primary after it wrote; holds the
+# epoch time until which it applies
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+
+class RequestWrites:
+    """Read-your-writes marker of one request.
+
+    The request pipeline creates one per request. Commits with writes extend
+    it, and it is returned to the client as the READ_PRIMARY_COOKIE cookie,
+    so the client's following requests read from the primary on any worker.
+    """
+
+    def __init__(self):
+        """Initialize marker without writes."""
+        self.read_primary_until: Optional[float] = None
+
+    def hold(self, seconds: float) -> None:
+        """Keep the client's reads on the primary for seconds from now."""
+        until = time.time() + seconds
+        if self.read_primary_until is None or until > self.read_primary_until:
+            self.read_primary_until = until
+
+    def cookie(self) -> Optional[str]:
+        """Return the Set-Cookie header value, or None if nothing to report."""
+        if replica_engine is None or self.read_primary_until is None:
+            return None
+        max_age = math.ceil(self.read_primary_until - time.time())
+        return (
+            f"{READ_PRIMARY_COOKIE}={self.read_primary_until:.3f}; "
+            f"Max-Age={max(max_age, 1)}; Path=/; HttpOnly; SameSite=Lax"
+        )
+
+
+_request_writes: ContextVar[Optional[RequestWrites]] = ContextVar(
+    "db_request_writes", default=None
+)
+
+
+def track_request_writes() -> RequestWrites:
+    """Start read-your-writes tracking for the current request."""
+    writes = RequestWrites()
+    _request_writes.set(writes)
+    return writes
+
+
+def expect_writes(seconds: Optional[float] = None) -> None:
+    """Keep the client's reads on the primary for writes still to come.
+
+    Streaming responses and background work commit after the response
+    headers were sent, when the cookie can no longer be set, so endpoints
+    starting them announce the writes up front.
+
+    Args:
+        seconds: How long to hold reads on the primary
+            (defaults to settings.replica_deferred_write_seconds)
+
+    """
+    writes = _request_writes.get()
+    if writes is not None:
+        writes.hold(
+            settings.replica_deferred_write_seconds if seconds is None else seconds
+        )
+
+
+class TrackedSession(Session):
+    """Session that records whether its current transaction performed writes.
+
+    Used to decide whether a request-scoped session needs a COMMIT at all.
+    """
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _mark_flushed(session: Session, flush_context) -> None:
+    session.info["has_writes"] = True
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _mark_dml(orm_execute_state) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _record_commit(session: Session) -> None:
+    writes = _request_writes.get()
+    if writes is not None and session.info.get("has_writes"):
+        writes.hold(settings.replica_read_your_writes_seconds)
+
+
+@event.listens_for(TrackedSession, "after_transaction_end")
+def _clear_writes(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop("has_writes", None)
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """Return True if the session holds changes that still need a COMMIT."""
+    return bool(
+        session.new
+        or session.dirty
+        or session.deleted
+        or session.sync_session.info.get("has_writes")
+    )
+
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=TrackedSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    close_resets_only=False,
+)
+
+
+# Session factory for read-only work, bound to the replica when configured.
+# Connections run in autocommit mode, so reads send no BEGIN and the session
+# ends without a COMMIT or ROLLBACK round trip.
+ReadSessionLocal = async_sessionmaker(
+    bind=(replica_engine or engine).execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    sync_session_class=TrackedSession,
     autocommit=False,
     autoflush=False,
     expire_on_commit=False,
     close_resets_only=False,
 )
 
+# Autocommit reads on the primary, for clients that must see their own
+# recent writes while a replica is configured
+PrimaryReadSessionLocal = (
+    async_sessionmaker(
+        bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        sync_session_class=TrackedSession,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        close_resets_only=False,
+    )
+    if replica_engine is not None
+    else ReadSessionLocal
+)
+
 
 async def get_session() -> AsyncSession:
     """Returns unprotected DB session"""
     return AsyncSessionLocal()
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get database session with improved error handling."""
-    session = None
-    try:
-        session = await get_session()
-
-        # Test connection health
-        await session.execute(text("SELECT 1"))
-
-        async with session:
-            yield session
-            await session.commit()
 
-    except (DisconnectionError, OperationalError) as e:
-        tb = traceback.extract_tb(sys.exc_info()[2])[-1]
-        logger.error(
-            f"Database connection error: {type(e).__name__}: {e} "
-            f'(File "{tb.filename}", line {tb.lineno})'
-        )
-        if session:
-            await session.rollback()
-        # Attempt to recreate session for connection errors
+def _wrote_recently(request: Request) -> bool:
+    """Return True if the client wrote recently, per this request or its cookie."""
+    now = time.time()
+    writes = _request_writes.get()
+    if writes is not None and writes.read_primary_until is not None:
+        return True
+    try:
+        until = float(request.cookies.get(READ_PRIMARY_COOKIE, 0))
+    except ValueError:
+        return False
+    # Values further ahead than any hold we grant are not ours
+    max_hold = max(
+        settings.replica_read_your_writes_seconds,
+        settings.replica_deferred_write_seconds,
+    )
+    return now < until <= now + max_hold + 1
+
+
+@asynccontextmanager
+async def _session_scope(
+    session_factory: async_sessionmaker,
+) -> AsyncIterator[AsyncSession]:
+    async with session_factory() as session:
         try:
-            if session:
-                await session.close()
-            session = AsyncSessionLocal()
             yield session
-            await session.commit()
-        except Exception as retry_e:
-            rtb = traceback.extract_tb(sys.exc_info()[2])[-1]
+            if has_pending_writes(session):
+                await session.commit()
+        except SQLAlchemyError as e:
+            tb = traceback.extract_tb(sys.exc_info()[2])[-1]
             logger.error(
-                f"Database retry failed: {type(retry_e).__name__}: {retry_e} "
-                f'(File "{rtb.filename}", line {rtb.lineno})'
+                f"SQLAlchemy error: {type(e).__name__}: {e} "
+                f'(File "{tb.filename}", line {tb.lineno})'
             )
-            if session:
-                await session.rollback()
-            raise
-    except SQLAlchemyError as e:
-        tb = traceback.extract_tb(sys.exc_info()[2])[-1]
-        logger.error(
-            f"SQLAlchemy error: {type(e).__name__}: {e} "
-            f'(File "{tb.filename}", line {tb.lineno})'
-        )
-        if session:
             await session.rollback()
-        raise
-    except Exception as e:
-        tb = traceback.extract_tb(sys.exc_info()[2])[-1]
-        logger.error(
-            f"Non-database exception in DB session: {type(e).__name__}: {e} "
-            f'(File "{tb.filename}", line {tb.lineno})'
-        )
-        if session:
+            raise
+        except Exception:
             await session.rollback()
-        raise
-    finally:
-        if session:
-            await session.close()
+            raise
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency providing a request-scoped database session.
+
+    No connection is checked out until the session is first used, and stale
+    pooled connections are detected by ``pool_pre_ping`` at checkout. The
+    session is committed when it holds unflushed changes or uncommitted
+    writes and rolled back otherwise. Read-only endpoints should use
+    get_read_db, whose sessions run in autocommit mode without a
+    transaction.
+    """
+    async with _session_scope(AsyncSessionLocal) as session:
+        yield session
+
+
+def read_session_factory(request: Request) -> async_sessionmaker:
+    """Return the session factory to use for a request's read-only work.
+
+    This is the read replica when one is configured, except for clients that
+    committed a write within ``replica_read_your_writes_seconds``; those stay
+    on the primary so they see their own changes. Recent writes are carried
+    by the READ_PRIMARY_COOKIE cookie, so this holds on every worker. Either
+    way the session runs in autocommit mode, so reads send no BEGIN or
+    ROLLBACK. Streaming responses use it to open a session that outlives the
+    request's dependencies.
+    """
+    if replica_engine is not None and _wrote_recently(request):
+        return PrimaryReadSessionLocal
+    return ReadSessionLocal
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency providing a session for read-only endpoints.
+
+    See read_session_factory for how the replica or primary is chosen.
+    """
+    async with _session_scope(read_session_factory(request)) as session:
+        yield session
 
 
 async def health_check_db() -> bool:
@@ -178,8 +401,14 @@ async def init_db(with_default_data: bool = True) -> None:
                 # Enable pgvector extension only for PostgreSQL
                 if settings.database_url.startswith(("postgresql", "asyncpg")):
                     await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+                    # Trigram indexes back substring (ILIKE) search
+                    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
                     # Verify pgvector is working
                     await conn.execute(text("SELECT '[1,2,3]'::vector"))
+                    try:
+                        await check_connection_budget(conn)
+                    except Exception as e:
+                        logger.warning(f"Could not check connection budget: {e}")
 
                 # Create all tables
                 await conn.run_sync(BaseModelDB.metadata.create_all)
@@ -214,4 +443,6 @@ async def init_db(with_default_data: bool = True) -> None:
 async def close_db() -> None:
     """Close database connections."""
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
     logger.info("Database connections closed")
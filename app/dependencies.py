@@ -7,20 +7,21 @@ with proper security controls, validation, and integration with the application'
 service architecture for scalable and maintainable API development.
 """
 
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import AuthenticationError, AuthorizationError
-from app.database import get_db
-from app.models.user import User
+from app.core.logging import set_user_context
+from app.database import get_db, get_read_db
 from app.services.auth import AuthService
 from app.services.conversation import ConversationService
 from app.services.document import DocumentService
 from app.services.embedding import EmbeddingService
 from app.services.mcp_service import MCPService
+from app.services.principal import Principal, get_principal
 from app.services.profile_service import LLMProfileService
 from app.services.prompt_service import PromptService
 from app.services.search import SearchService
@@ -30,26 +31,28 @@ from app.services.user import UserService
 security = HTTPBearer()
 
 
+def _token_payload(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a bearer token; only the signing settings are needed, not a session."""
+    return AuthService(None).decode_token(token)
+
+
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: AsyncSession = Depends(get_db),
-) -> Optional[User]:
+) -> Optional[Principal]:
     """Get current user if authenticated, None otherwise."""
     if not credentials:
         return None
 
     try:
-        auth_service = AuthService(db)
-        username = auth_service.verify_token(credentials.credentials)
-
-        if not username:
+        payload = _token_payload(credentials.credentials)
+        if not payload:
             return None
 
-        user = await auth_service.get_user_by_username(username)
-        if not user or not user.is_active:
+        principal = await get_principal(payload)
+        if not principal or not principal.is_active:
             return None
 
-        return user
+        return principal
 
     except Exception:
         return None
@@ -57,24 +60,27 @@ async def get_current_user_optional(
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    """Get current authenticated user."""
+) -> Principal:
+    """Get current authenticated user.
+
+    Returns a cached, session-independent Principal carrying the user's id,
+    username, email and permission flags rather than a User ORM instance.
+    """
     try:
-        auth_service = AuthService(db)
-        username = auth_service.verify_token(credentials.credentials)
+        payload = _token_payload(credentials.credentials)
 
-        if not username:
+        if not payload:
             raise AuthenticationError("Invalid or expired token")
 
-        user = await auth_service.get_user_by_username(username)
-        if not user:
+        principal = await get_principal(payload)
+        if not principal:
             raise AuthenticationError("User not found")
 
-        if not user.is_active:
+        if not principal.is_active:
             raise AuthenticationError("User account is inactive")
 
-        return user
+        set_user_context(str(principal.id))
+        return principal
 
     except AuthenticationError:
         raise
@@ -82,7 +88,9 @@ async def get_current_user(
         raise AuthenticationError("Authentication failed")
 
 
-async def get_current_superuser(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_superuser(
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """Get current user and verify superuser privileges."""
     if not current_user.is_superuser:
         raise AuthorizationError("Not enough permissions. Superuser access required.")
@@ -122,8 +130,8 @@ async def get_document_service(db: AsyncSession = Depends(get_db)) -> DocumentSe
     return DocumentService(db)
 
 
-async def get_search_service(db: AsyncSession = Depends(get_db)) -> SearchService:
-    """Get SearchService instance."""
+async def get_search_service(db: AsyncSession = Depends(get_read_db)) -> SearchService:
+    """Get SearchService instance backed by the read replica when configured."""
     return SearchService(db)
 
 
@@ -134,6 +142,13 @@ async def get_conversation_service(
     return ConversationService(db)
 
 
+async def get_read_conversation_service(
+    db: AsyncSession = Depends(get_read_db),
+) -> ConversationService:
+    """Get ConversationService instance for read-only listing endpoints."""
+    return ConversationService(db)
+
+
 async def get_embedding_service(db: AsyncSession = Depends(get_db)) -> EmbeddingService:
     """Get EmbeddingService instance."""
     return EmbeddingService(db)
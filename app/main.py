@@ -12,7 +12,7 @@ from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 # Import API routers
 from app.api import (
@@ -36,17 +36,15 @@ from app.api import (
 from app.config import settings
 from app.core.exceptions import ChatbotPlatformException, RateLimitError
 from app.core.logging import get_component_logger, setup_logging
+from app.core.tracing import setup_tracing, shutdown_tracing
 from app.database import close_db, init_db
-from app.middleware import (
-    debug_content_middleware,
-    logging_middleware,
-    rate_limiting_middleware,
-    timing_middleware,
-    validation_middleware,
-)
+from app.middleware import RequestPipelineMiddleware
 from app.middleware.performance import start_system_monitoring
-from app.middleware.rate_limiting import start_rate_limiter_cleanup
+from app.middleware.rate_limiting import start_rate_limiter_cleanup, stop_rate_limiter
+from app.services.principal import start_principal_listener, stop_principal_listener
 from app.utils.caching import start_cache_cleanup_task
+from app.utils.prometheus import METRICS_CONTENT_TYPE, render_metrics
+from app.utils.security import password_hash_pool
 from app.utils.timestamp import get_current_timestamp
 from shared.schemas.common import ErrorResponse
 
@@ -92,6 +90,8 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting AI Chatbot Platform...")
     try:
+        setup_tracing()
+
         await init_db()
         logger.info("Database initialized successfully")
 
@@ -99,6 +99,9 @@ async def lifespan(app: FastAPI):
         await start_cache_cleanup_task()
         logger.info("Cache system initialized")
 
+        # Evict cached principals when other workers change users
+        await start_principal_listener()
+
         # Start rate limiter cleanup task
         await start_rate_limiter_cleanup()
         logger.info("Rate limiting system initialized")
@@ -137,8 +140,23 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"Background processor shutdown failed: {e}")
 
+        await stop_principal_listener()
+        password_hash_pool.shutdown()
+
+        # Let running bulk deletes finish (cancelled after a timeout), then
+        # finish pending file removals
+        try:
+            from app.services.bulk_delete import shutdown_bulk_delete_manager
+
+            await shutdown_bulk_delete_manager()
+        except Exception as e:
+            logger.warning(f"Bulk delete manager shutdown failed: {e}")
+
+        await stop_rate_limiter()
         await close_db()
         logger.info("Database connections closed")
+
+        shutdown_tracing()
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
 
@@ -212,7 +230,20 @@ def custom_openapi():
 app.openapi = custom_openapi
 
 
-# CORS middleware - Must be added FIRST to be outermost middleware
+# Middleware is listed innermost first: each add_middleware() call wraps
+# everything added before it.
+
+# Request pipeline (innermost): correlation ID, rate limiting, size limits,
+# timing and request logging in a single pure-ASGI layer
+app.add_middleware(RequestPipelineMiddleware)
+
+# Trusted host middleware for production
+if settings.is_production:
+    app.add_middleware(
+        TrustedHostMiddleware, allowed_hosts=["*"]
+    )  # Configure based on deployment
+
+# CORS middleware - Must be added LAST to be outermost middleware
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.allowed_origins,
@@ -221,51 +252,6 @@ app.add_middleware(
     allow_headers=settings.allowed_headers,
 )
 
-# Trusted host middleware for production - Second outermost
-if settings.is_production:
-    app.add_middleware(
-        TrustedHostMiddleware, allowed_hosts=["*"]
-    )  # Configure based on deployment
-
-
-# Apply middleware in the correct order (innermost to outermost)
-# Note: @app.middleware decorators are applied in reverse order (last decorated = outermost)
-
-
-# Debug content middleware (innermost - applied last)
-@app.middleware("http")
-async def debug_content_middleware_wrapper(request: Request, call_next):
-    """Debug content logging middleware wrapper."""
-    return await debug_content_middleware(request, call_next)
-
-
-# Standard request logging middleware
-@app.middleware("http")
-async def logging_middleware_wrapper(request: Request, call_next):
-    """Request logging middleware wrapper."""
-    return await logging_middleware(request, call_next)
-
-
-# Request timing middleware with performance monitoring
-@app.middleware("http")
-async def timing_middleware_wrapper(request: Request, call_next):
-    """Request timing middleware wrapper."""
-    return await timing_middleware(request, call_next)
-
-
-# Input validation middleware
-@app.middleware("http")
-async def validation_middleware_wrapper(request: Request, call_next):
-    """Input validation middleware wrapper."""
-    return await validation_middleware(request, call_next)
-
-
-# Rate limiting middleware (outermost of the @middleware decorators)
-@app.middleware("http")
-async def rate_limiting_middleware_wrapper(request: Request, call_next):
-    """Rate limiting middleware wrapper."""
-    return await rate_limiting_middleware(request, call_next)
-
 
 # Global exception handlers
 @app.exception_handler(ChatbotPlatformException)
@@ -392,6 +378,15 @@ async def ping() -> Dict[str, str]:
     return {"status": "ok", "timestamp": get_current_timestamp()}
 
 
+if settings.metrics_enabled:
+
+    # Prometheus scrape endpoint
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """Expose in-process metrics in the Prometheus text format."""
+        return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -4,17 +4,8 @@ Provides middleware components for request/response processing, security enforce
 performance monitoring, and logging with comprehensive validation and rate limiting.
 """
 
-from app.middleware.core import (
-    rate_limiting_middleware,
-    timing_middleware,
-    validation_middleware,
-)
-from app.middleware.logging import debug_content_middleware, logging_middleware
+from app.middleware.core import RequestPipelineMiddleware
 
 __all__ = [
-    "logging_middleware",
-    "debug_content_middleware",
-    "timing_middleware",
-    "validation_middleware",
-    "rate_limiting_middleware",
+    "RequestPipelineMiddleware",
 ]
@@ -1,112 +1,295 @@
-"""Core middleware components for request processing and security enforcement.
+"""Core request pipeline for request processing and security enforcement.
 
-Provides foundational middleware for request timing, input validation, and
-rate limiting with security controls and performance monitoring.
+Provides a single pure-ASGI middleware that performs correlation tracking,
+rate limiting, request size enforcement, timing, request logging and debug
+content capture in one pass. It works directly on the ASGI scope, receive and
+send callables, so request and response bodies stream through untouched and
+no per-layer task or body buffering is added to the request path.
 """
 
+import math
 import time
+from typing import Optional
+from urllib.parse import parse_qsl
 
-from fastapi import Request, Response
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.logging import get_component_logger
-from app.middleware.performance import record_request_metric
-from app.middleware.rate_limiting import rate_limit_middleware as _rate_limit_middleware
-from app.middleware.validation import (
-    validate_request_middleware as _validate_request_middleware,
+from app.config import settings
+from app.core.logging import get_component_logger, set_correlation_id
+from app.core.tracing import annotate_server_span, continue_trace
+from app.database import track_request_writes
+from app.middleware.logging import (
+    DebugContentCapture,
+    log_request_completed,
+    log_request_started,
+    request_debug_enabled,
 )
+from app.middleware.performance import record_request_metric
+from app.middleware.rate_limiting import rate_limit_key, rate_limiter
+from shared.schemas.common import ErrorResponse
 
 logger = get_component_logger("middleware.core")
 
+# User agents longer than this are logged as suspicious
+_MAX_USER_AGENT_LENGTH = 500
 
-async def timing_middleware(request: Request, call_next) -> Response:
-    """Measure request processing time and record performance metrics.
 
-    Provides microsecond-accurate timing measurement and records metrics
-    for monitoring and analysis. Adds X-Process-Time header to response.
+class RequestPipelineMiddleware:
+    """Request pipeline applied to every HTTP request.
 
-    Args:
-        request: The incoming HTTP request object
-        call_next: The next middleware or endpoint handler in the chain
+    Steps, in order:
+        1. Assign a correlation ID (``request.state.correlation_id``) and,
+           when tracing is enabled, start the request's server span
+        2. Enforce the per-client rate limit (429 with Retry-After)
+        3. Enforce ``max_request_size`` (413), both on the declared
+           Content-Length and on the bytes actually received
+        4. Log the request, time it and record the performance metric
+        5. Add X-Process-Time and X-Correlation-ID response headers, and the
+           read-your-writes cookie when the request wrote to the database
+        6. In debug mode, log bounded request and response content
 
-    Returns:
-        Response: The HTTP response with timing header added
+    Rejections are sent directly from the pipeline with the standard error
+    envelope rather than raised, so they never surface as 500 errors.
+    """
 
-    Raises:
-        Exception: Logs metric recording failures without affecting request processing
+    def __init__(self, app: ASGIApp, max_body_size: Optional[int] = None):
+        """Initialize the pipeline.
 
-    """
-    start_time = time.time()
+        Args:
+            app: The ASGI application to wrap
+            max_body_size: Maximum request body size in bytes
+                (defaults to settings.max_request_size)
 
-    # Process request
-    response = await call_next(request)
+        """
+        self.app = app
+        self.max_body_size = max_body_size or settings.max_request_size
 
-    # Calculate processing time
-    process_time = time.time() - start_time
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process an ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    # Add timing header to response
-    response.headers["X-Process-Time"] = f"{process_time:.4f}"
+        start_time = time.perf_counter()
+        correlation_id = set_correlation_id()
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
 
-    # Record performance metric
-    try:
-        record_request_metric(
-            path=request.url.path,
-            method=request.method,
-            status_code=response.status_code,
-            duration=process_time,
-        )
-    except Exception as e:
-        logger.warning(
-            f"Failed to record performance metric: {e}",
-            extra={
-                "extra_fields": {
-                    "path": request.url.path,
-                    "method": request.method,
-                    "error": str(e),
-                }
-            },
-        )
+        headers = Headers(scope=scope)
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        user_agent = headers.get("user-agent", "")
 
-    return response
+        # Rate limiting
+        client_id = rate_limit_key(client_ip, headers.get("authorization"))
+        retry_after = await rate_limiter.check(path, client_id)
+        if retry_after is not None:
+            logger.warning(f"Rate limit exceeded for client {client_id} on path {path}")
+            await self._reject(
+                scope,
+                receive,
+                send,
+                "RATE_LIMIT_ERROR",
+                "Rate limit exceeded",
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                retry_after=retry_after,
+            )
+            return
 
+        # Request size (declared)
+        content_length = headers.get("content-length")
+        if content_length is not None:
+            try:
+                declared_size = int(content_length)
+            except ValueError:
+                await self._reject(
+                    scope,
+                    receive,
+                    send,
+                    "VALIDATION_ERROR",
+                    "Invalid Content-Length header",
+                    status.HTTP_400_BAD_REQUEST,
+                )
+                return
+            if declared_size > self.max_body_size:
+                await self._reject(
+                    scope,
+                    receive,
+                    send,
+                    "VALIDATION_ERROR",
+                    "Request too large",
+                    status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                )
+                return
 
-async def validation_middleware(request: Request, call_next) -> Response:
-    """Validate and sanitize request input to prevent security vulnerabilities.
+        # Basic bot detection; logged only
+        if not user_agent or len(user_agent) > _MAX_USER_AGENT_LENGTH:
+            logger.warning(f"Suspicious user agent: {user_agent[:100]}...")
 
-    Implements input validation and sanitization to protect against injection attacks,
-    XSS, malformed data, and other common web application vulnerabilities.
+        debug_logging = request_debug_enabled()
+        if debug_logging:
+            url = _request_url(scope, headers)
+            query_params = dict(
+                parse_qsl(scope.get("query_string", b"").decode("latin-1"))
+            )
+            log_request_started(
+                {
+                    "method": method,
+                    "url": url,
+                    "path": path,
+                    "query_params": query_params,
+                    "client_ip": client_ip,
+                    "user_agent": user_agent or "unknown",
+                    "correlation_id": correlation_id,
+                }
+            )
 
-    Args:
-        request: The incoming HTTP request object requiring validation
-        call_next: The next middleware or endpoint handler in the processing chain
+        capture = None
+        if settings.debug and debug_logging:
+            capture = DebugContentCapture(
+                {
+                    "correlation_id": correlation_id,
+                    "method": method,
+                    "url": url,
+                    "path": path,
+                    "query_params": query_params,
+                    "headers": dict(headers),
+                    "client": {
+                        "host": client[0] if client else None,
+                        "port": client[1] if client else None,
+                    },
+                }
+            )
 
-    Returns:
-        Response: The HTTP response from the downstream handler after validation
+        # Request size (received); covers chunked bodies without Content-Length
+        max_body_size = self.max_body_size
+        received_size = 0
 
-    Raises:
-        ValidationError: Raised for validation failures with appropriate status codes
-            (400, 413, 415, 422)
+        async def receive_wrapper() -> Message:
+            nonlocal received_size
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                received_size += len(body)
+                if received_size > max_body_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="Request too large",
+                    )
+                if capture is not None and body:
+                    capture.request_body.add(body)
+            return message
 
-    """
-    return await _validate_request_middleware(request, call_next)
+        status_code = 500
+        process_time = None
+        writes = track_request_writes()
 
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, process_time
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+                status_code = message["status"]
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Process-Time"] = f"{process_time:.4f}"
+                response_headers["X-Correlation-ID"] = correlation_id
+                write_cookie = writes.cookie()
+                if write_cookie is not None:
+                    response_headers.append("set-cookie", write_cookie)
+                if capture is not None:
+                    capture.response_started(status_code, dict(response_headers))
+            elif message["type"] == "http.response.body" and capture is not None:
+                capture.response_body.add(message.get("body", b""))
+            await send(message)
 
-async def rate_limiting_middleware(request: Request, call_next) -> Response:
-    """Apply rate limiting to prevent abuse and ensure fair resource allocation.
+        try:
+            with continue_trace(method, headers) as request_span:
+                try:
+                    await self.app(scope, receive_wrapper, send_wrapper)
+                finally:
+                    if request_span is not None:
+                        request_span.set_attribute("correlation_id", correlation_id)
+                        annotate_server_span(
+                            request_span,
+                            method,
+                            getattr(scope.get("route"), "path", None),
+                            status_code,
+                        )
+        finally:
+            total_time = time.perf_counter() - start_time
+            if process_time is None:
+                process_time = total_time
 
-    Implements rate limiting algorithms including token bucket and sliding window
-    to prevent DoS attacks and ensure fair usage. Provides user-specific quotas
-    and distributed rate limiting support.
+            try:
+                # Set by the router on the shared scope once a route matched
+                route = scope.get("route")
+                record_request_metric(
+                    path=path,
+                    method=method,
+                    status_code=status_code,
+                    duration=process_time,
+                    route=getattr(route, "path", None),
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Failed to record performance metric: {e}",
+                    extra={
+                        "extra_fields": {
+                            "path": path,
+                            "method": method,
+                            "error": str(e),
+                        }
+                    },
+                )
 
-    Args:
-        request: The incoming HTTP request object for rate limit evaluation
-        call_next: The next middleware or endpoint handler in the processing chain
+            log_request_completed(
+                {
+                    "method": method,
+                    "path": path,
+                    "status_code": status_code,
+                    "process_time_ms": round(process_time * 1000, 2),
+                    "total_time_ms": round(total_time * 1000, 2),
+                    "correlation_id": correlation_id,
+                }
+            )
 
-    Returns:
-        Response: The HTTP response with rate limiting headers (X-RateLimit-*)
-            or 429 Too Many Requests when rate limits are exceeded
+            if capture is not None:
+                await capture.log()
 
-    Raises:
-        RateLimitError: Raised when rate limits are exceeded (429 Too Many Requests)
+    @staticmethod
+    async def _reject(
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        error_code: str,
+        message: str,
+        status_code: int,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """Send an error response without calling the application."""
+        response = ErrorResponse.create(
+            error_code=error_code,
+            message=message,
+            status_code=status_code,
+            error_details={"retry_after": retry_after} if retry_after else None,
+        )
+        response.headers["X-Correlation-ID"] = scope["state"]["correlation_id"]
+        if retry_after:
+            response.headers["Retry-After"] = str(math.ceil(retry_after))
+        await response(scope, receive, send)
 
-    """
-    return await _rate_limit_middleware(request, call_next)
+
+def _request_url(scope: Scope, headers: Headers) -> str:
+    """Reconstruct the request URL from the ASGI scope."""
+    scheme = scope.get("scheme", "http")
+    host = headers.get("host")
+    if not host:
+        server = scope.get("server")
+        host = f"{server[0]}:{server[1]}" if server else "unknown"
+    url = f"{scheme}://{host}{scope.get('root_path', '')}{scope['path']}"
+    query_string = scope.get("query_string", b"")
+    if query_string:
+        url += "?" + query_string.decode("latin-1")
+    return url
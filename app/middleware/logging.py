@@ -2,15 +2,15 @@
 
 Provides structured logging capabilities for HTTP request/response tracking,
 performance monitoring, and debugging support with correlation tracking
-and comprehensive observability features.
+and comprehensive observability features. The request pipeline in
+app.middleware.core calls into this module; nothing here wraps requests or
+responses itself.
 """
 
 import json
+import logging
+import random
 import re
-import time
-
-from fastapi import Request, Response
-from fastapi.responses import StreamingResponse
 
 from app.config import settings
 from app.core.logging import get_component_logger
@@ -20,114 +20,136 @@ logger = get_component_logger("middleware.logging")
 
 TRUNC_SIZE = 5000
 
-async def logging_middleware(request: Request, call_next) -> Response:
-    """Log request/response details with correlation ID for tracking."""
-    start_time = time.time()
+# Streamed bodies are only captured up to this size; logs truncate anyway
+CAPTURE_SIZE = TRUNC_SIZE * 4
 
-    # Generate correlation ID for this request
-    from app.core.logging import set_correlation_id
 
-    correlation_id = set_correlation_id()
+class _StreamCapture:
+    """Bounded capture of a streamed response body for debug logging."""
 
-    request.state.correlation_id = correlation_id
+    def __init__(self, limit: int = CAPTURE_SIZE):
+        self.limit = limit
+        self.chunks = []
+        self.captured_bytes = 0
+        self.total_bytes = 0
+        self.total_chunks = 0
 
-    # Log request start
-    logger.info(
-        "Request started",
-        extra={
-            "extra_fields": {
-                "method": request.method,
-                "url": str(request.url),
-                "path": request.url.path,
-                "query_params": dict(request.query_params),
-                "client_ip": request.client.host if request.client else "unknown",
-                "user_agent": request.headers.get("user-agent", "unknown"),
-                "correlation_id": correlation_id,
-            }
-        },
-    )
+    def add(self, chunk) -> None:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        self.total_chunks += 1
+        self.total_bytes += len(chunk)
+        if self.captured_bytes < self.limit:
+            self.chunks.append(chunk)
+            self.captured_bytes += len(chunk)
 
-    # Process request
-    response = await call_next(request)
 
-    # Calculate processing time
-    process_time = time.time() - start_time
+def request_debug_enabled() -> bool:
+    """Whether request debug logging is enabled."""
+    return logger.isEnabledFor(logging.DEBUG)
 
-    # Log request completion
-    logger.info(
-        "Request completed",
-        extra={
-            "extra_fields": {
-                "method": request.method,
-                "url": str(request.url),
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "process_time_ms": round(process_time * 1000, 2),
-                "correlation_id": correlation_id,
-            }
-        },
-    )
 
-    return response
+def log_request_started(request_info: dict) -> None:
+    """Log the start of a request at debug level.
+
+    Args:
+        request_info: Request fields (method, url, path, query_params, client_ip,
+            user_agent, correlation_id)
+
+    """
+    logger.debug("Request started", extra={"extra_fields": request_info})
+
+
+def request_log_sample_rate(path: str) -> float:
+    """Return the fraction of successful requests to a path that are logged.
+
+    The longest matching prefix in settings.log_request_sample_routes wins;
+    other paths use settings.log_request_sample_rate.
+    """
+    rate = settings.log_request_sample_rate
+    matched = -1
+    for prefix, route_rate in settings.log_request_sample_routes.items():
+        if len(prefix) > matched and path.startswith(prefix):
+            rate, matched = route_rate, len(prefix)
+    return rate
+
 
+def log_request_completed(request_info: dict) -> None:
+    """Log the completion of a request.
 
-async def debug_content_middleware(request: Request, call_next) -> Response:
-    """Log detailed request/response content for debugging when debug mode is enabled."""
-    if not settings.debug:
-        # Skip debug logging in production
-        return await call_next(request)
+    Failed requests (status 400 and above) are always logged; successful
+    ones are sampled per route.
 
-    correlation_id = getattr(request.state, "correlation_id", "unknown")
+    Args:
+        request_info: Request fields (method, path, status_code,
+            process_time_ms, total_time_ms, correlation_id)
+
+    """
+    if request_info["status_code"] < 400:
+        rate = request_log_sample_rate(request_info["path"])
+        if rate < 1 and random.random() >= rate:
+            return
+    logger.info("Request completed", extra={"extra_fields": request_info})
 
-    # Log request details
-    await _log_request_content(request, correlation_id)
 
-    # Process request and capture response
-    response = await call_next(request)
+class DebugContentCapture:
+    """Bounded capture of request and response content for debug logging.
 
-    # Log response details with proper streaming/non-streaming handling
-    response = await _log_response_content_improved(response, correlation_id)
+    Body chunks are observed as they pass through the ASGI receive/send
+    channels; only the first CAPTURE_SIZE bytes of each body are kept and
+    nothing is buffered on the request path.
+    """
 
-    return response
+    def __init__(self, request_details: dict):
+        """Initialize capture.
 
+        Args:
+            request_details: Request metadata to include in the debug log
 
-async def _log_request_content(request: Request, correlation_id: str):
+        """
+        self.request_details = request_details
+        self.request_body = _StreamCapture()
+        self.response_body = _StreamCapture()
+        self.response_details = {
+            "correlation_id": request_details.get("correlation_id"),
+            "status_code": None,
+            "headers": {},
+        }
+
+    def response_started(self, status_code: int, headers: dict) -> None:
+        """Record the response status and headers."""
+        self.response_details["status_code"] = status_code
+        self.response_details["headers"] = headers
+
+    async def log(self) -> None:
+        """Log the captured request and response."""
+        _log_request_content(self.request_details, self.request_body)
+        await _log_accumulated_content_async(
+            self.response_body,
+            self.response_details,
+            self.response_details["correlation_id"],
+        )
+
+
+def _log_request_content(request_details: dict, body: "_StreamCapture"):
     """Log detailed request content with intelligent parsing and filtering."""
     try:
-        # Prepare request details
-        request_details = {
-            "correlation_id": correlation_id,
-            "method": request.method,
-            "url": str(request.url),
-            "path": request.url.path,
-            "query_params": dict(request.query_params),
-            "headers": dict(request.headers),
-            "client": {
-                "host": request.client.host if request.client else None,
-                "port": request.client.port if request.client else None,
-            },
-        }
+        request_details = dict(request_details)
 
-        # Try to read and parse request body
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                # Read body (be careful not to consume it)
-                body = await request.body()
-                if body:
-                    # Try to parse as JSON for better formatting
-                    try:
-                        body_json = json.loads(body.decode("utf-8"))
-                        request_details["body"] = body_json
-                    except (json.JSONDecodeError, UnicodeDecodeError):
-                        # If not JSON, log as text (truncate if too long)
-                        body_text = body.decode("utf-8", errors="replace")
-                        if len(body_text) > TRUNC_SIZE:
-                            body_text = body_text[:TRUNC_SIZE] + "... (truncated)"
-                        request_details["body"] = body_text
-                else:
-                    request_details["body"] = None
-            except Exception as e:
-                request_details["body"] = f"<Error reading body: {e}>"
+        if request_details.get("method") in ["POST", "PUT", "PATCH"]:
+            captured = b"".join(body.chunks)
+            if captured:
+                # Try to parse as JSON for better formatting
+                try:
+                    request_details["body"] = json.loads(captured.decode("utf-8"))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # If not JSON, log as text (truncate if too long)
+                    body_text = captured.decode("utf-8", errors="replace")
+                    if len(body_text) > TRUNC_SIZE or body.total_bytes > len(captured):
+                        body_text = body_text[:TRUNC_SIZE] + "... (truncated)"
+                    request_details["body"] = body_text
+            else:
+                request_details["body"] = None
 
         # Format and log request
         logger.debug(
@@ -143,132 +165,10 @@ async def _log_request_content(request: Request, correlation_id: str):
     except Exception as e:
         logger.error(
             f"Error logging request content: {e}",
-            extra={"extra_fields": {"correlation_id": correlation_id}},
+            extra={"extra_fields": {"correlation_id": request_details.get("correlation_id")}},
         )
 
 
-async def _log_response_content_improved(response: Response, correlation_id: str) -> Response:
-    """Log detailed response content with proper streaming and Pydantic model support."""
-    from fastapi.responses import StreamingResponse
-    from pydantic import BaseModel
-
-    response_details = {
-        "correlation_id": correlation_id,
-        "status_code": response.status_code,
-        "headers": dict(response.headers),
-        "response_type": type(response).__name__
-    }
-
-    try:
-        # Handle Pydantic models
-        if hasattr(response, 'body') and isinstance(response.body, BaseModel):
-            pydantic_data = response.body.model_dump()
-            _log_response_with_body(response_details, pydantic_data, "pydantic")
-
-        # Handle StreamingResponse
-        elif isinstance(response, StreamingResponse):
-            response = _handle_streaming_response(response, response_details, correlation_id)
-
-        # Handle responses with body_iterator (streaming)
-        elif hasattr(response, "body_iterator") and response.body_iterator:
-            response = _handle_body_iterator_response(response, response_details, correlation_id)
-
-        # Handle regular responses with body
-        elif hasattr(response, "body") and response.body:
-            await _handle_regular_response_body(response, response_details)
-
-        else:
-            response_details["body"] = None
-            _log_response_simple(response_details)
-
-    except Exception as e:
-        logger.error(
-            f"Error logging response content: {e}",
-            extra={"extra_fields": {"correlation_id": correlation_id}},
-        )
-
-    return response
-
-
-def _handle_streaming_response(response: StreamingResponse, response_details: dict, correlation_id: str) -> StreamingResponse:
-    """Handle StreamingResponse by capturing content while preserving true streaming."""
-    if not hasattr(response, 'body_iterator'):
-        response_details["body"] = "<No body_iterator available>"
-        _log_response_simple(response_details)
-        return response
-
-    original_iterator = response.body_iterator
-    accumulated_content = []
-
-    async def capture_and_stream():
-        """Generator that captures content while streaming without blocking."""
-        try:
-            async for chunk in original_iterator:
-                # Capture chunk for later logging
-                accumulated_content.append(chunk)
-                # Immediately yield the chunk to maintain streaming
-                yield chunk
-        except Exception as e:
-            logger.error(f"Error in streaming capture: {e}")
-            raise
-        finally:
-            # Schedule logging after streaming completes (non-blocking)
-            import asyncio
-            asyncio.create_task(_log_accumulated_content_async(accumulated_content, response_details.copy(), correlation_id))
-
-    # Replace the iterator with our capturing version
-    response.body_iterator = capture_and_stream()
-
-    # Log immediate response info (without body content)
-    response_details["body"] = "<Streaming in progress - content will be logged after completion>"
-    _log_response_simple(response_details, "streaming_started")
-
-    return response
-
-
-def _handle_body_iterator_response(response: Response, response_details: dict, correlation_id: str) -> Response:
-    """Handle responses with body_iterator using non-blocking approach."""
-    original_body_iterator = response.body_iterator
-    accumulated_content = []
-
-    async def capture_and_replay():
-        """Generator that captures and replays content without pre-loading."""
-        try:
-            async for chunk in original_body_iterator:
-                accumulated_content.append(chunk)
-                yield chunk
-        except Exception as e:
-            logger.error(f"Error in body iterator capture: {e}")
-            raise
-        finally:
-            # Schedule logging after iteration completes
-            import asyncio
-            asyncio.create_task(_log_accumulated_content_async(accumulated_content, response_details.copy(), correlation_id))
-
-    # Replace with capturing iterator
-    response.body_iterator = capture_and_replay()
-
-    # Log immediate response info
-    response_details["body"] = "<Body iterator in progress - content will be logged after completion>"
-    _log_response_simple(response_details, "iterator_started")
-
-    return response
-
-
-async def _handle_regular_response_body(response: Response, response_details: dict):
-    """Handle regular response bodies."""
-    try:
-        body = response.body
-        if isinstance(body, bytes):
-            _process_and_log_body_content(body, response_details)
-        else:
-            body_text = str(body)
-            _log_response_with_text(response_details, body_text, "text")
-    except Exception as e:
-        response_details["body"] = f"<Error processing response body: {e}>"
-        _log_response_simple(response_details)
-
-
 def _process_and_log_body_content(body_bytes: bytes, response_details: dict):
     """Process body content and log with proper formatting."""
     try:
@@ -583,15 +483,15 @@ def _smart_truncate_json(json_str: str, max_length: int) -> str:
     return f"{truncated}{closing}\n... (truncated from {total_chars} chars)"
 
 
-async def _log_accumulated_content_async(accumulated_content: list, response_details: dict, correlation_id: str):
+async def _log_accumulated_content_async(capture: "_StreamCapture", response_details: dict, correlation_id: str):
     """Asynchronously log accumulated streaming content after completion."""
     try:
-        if accumulated_content:
-            full_body = b"".join(accumulated_content)
+        if capture.total_chunks:
+            full_body = b"".join(capture.chunks)
 
             # Add streaming stats
-            response_details["total_chunks"] = len(accumulated_content)
-            response_details["total_bytes"] = sum(len(chunk) for chunk in accumulated_content)
+            response_details["total_chunks"] = capture.total_chunks
+            response_details["total_bytes"] = capture.total_bytes
 
             # Process and log the body content
             try:
@@ -621,14 +521,3 @@ async def _log_accumulated_content_async(accumulated_content: list, response_det
             extra={"extra_fields": {"correlation_id": correlation_id}}
         )
 
-
-# Legacy functions (kept for compatibility, but not used by new implementation)
-async def _log_response_content(response: Response, correlation_id: str) -> Response:
-    """Legacy function - replaced by _log_response_content_improved."""
-    return await _log_response_content_improved(response, correlation_id)
-
-
-async def _consume_and_log_body(body_bytes: bytes, response_details: dict):
-    """Legacy function - replaced by _process_and_log_body_content."""
-    _process_and_log_body_content(body_bytes, response_details)
-
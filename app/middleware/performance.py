@@ -3,6 +3,14 @@
 Provides performance monitoring capabilities including real-time request timing,
 system resource monitoring, health assessment, and comprehensive analytics
 with statistical analysis and integration with external monitoring systems.
+
+Memory use is bounded: recent error, slow and system samples are kept in
+fixed-size ring buffers, and request latencies are aggregated into per-minute
+log-bucketed histograms per endpoint covering the last hour, from which
+percentiles over 1, 5 and 60 minute windows are computed without storing
+individual requests. Endpoints are keyed by route template (for example
+``GET /api/v1/documents/byid/{document_id}``), so path parameters do not
+create new keys, and non-standard HTTP methods are grouped under ``OTHER``.
 """
 
 import asyncio
@@ -10,12 +18,33 @@ import logging
 import time
 from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 
 import psutil
 
+from app.utils.metrics import Histogram, WindowedCounter, WindowedHistogram
+
 logger = logging.getLogger(__name__)
 
+# Requests slower than this many seconds are tracked as slow
+SLOW_REQUEST_THRESHOLD = 1.0
+
+# Endpoint key for requests that matched no route (404s, scanners)
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Methods tracked by name; any other client-supplied method token is grouped
+# under OTHER_METHOD so it cannot create new endpoint keys or metric series
+STANDARD_METHODS = frozenset(
+    {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"}
+)
+OTHER_METHOD = "OTHER"
+
+# Rollup windows reported by get_latency_windows(), in minutes
+LATENCY_WINDOWS = (1, 5, 60)
+
+# Minutes of history kept by the windowed histograms
+_WINDOW_MINUTES = max(LATENCY_WINDOWS)
+
 
 @dataclass
 class RequestMetric:
@@ -25,13 +54,14 @@ class RequestMetric:
     resource usage, and metadata for analysis and monitoring.
 
     Attributes:
-        path: Request URL path for endpoint-specific analysis
+        path: Request URL path
         method: HTTP method (GET, POST, PUT, DELETE)
         status_code: HTTP response status code
         duration: Request processing time in seconds
         timestamp: Unix timestamp when request was processed
         memory_usage: Memory consumption during request processing in MB (optional)
         cpu_usage: CPU utilization percentage during request processing (optional)
+        route: Route template the request matched, if any
 
     """
 
@@ -42,6 +72,7 @@ class RequestMetric:
     timestamp: float
     memory_usage: Optional[float] = None
     cpu_usage: Optional[float] = None
+    route: Optional[str] = None
 
 
 @dataclass
@@ -73,6 +104,46 @@ class SystemMetrics:
     timestamp: float
 
 
+class EndpointStats:
+    """Request counts and latency histograms of one endpoint.
+
+    ``duration`` is cumulative over the monitor's lifetime for export;
+    ``latency`` covers the last hour for percentile reporting.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.requests = 0
+        self.errors = 0
+        self.duration = Histogram()
+        self.latency = WindowedHistogram(slots=_WINDOW_MINUTES)
+        self.recent_errors = WindowedCounter(slots=_WINDOW_MINUTES)
+        self.recent_slow = WindowedCounter(slots=_WINDOW_MINUTES)
+
+    def record(self, duration: float, error: bool, now: float) -> None:
+        """Record one request."""
+        self.requests += 1
+        self.duration.observe(duration)
+        self.latency.observe(duration, now)
+        if error:
+            self.errors += 1
+            self.recent_errors.add(1, now)
+        if duration > SLOW_REQUEST_THRESHOLD:
+            self.recent_slow.add(1, now)
+
+    def window(self, minutes: int, now: Optional[float] = None) -> Histogram:
+        """Return the latency histogram of the last N minutes."""
+        return self.latency.window(minutes, now)
+
+
+def _latency_summary(histogram: Histogram) -> Dict[str, float]:
+    return {
+        "p50": histogram.quantile(0.5),
+        "p90": histogram.quantile(0.9),
+        "p99": histogram.quantile(0.99),
+    }
+
+
 class PerformanceMonitor:
     """Performance monitoring system with metrics collection and analysis.
 
@@ -92,12 +163,11 @@ class PerformanceMonitor:
         self.metrics_history: Dict[str, deque] = defaultdict(
             lambda: deque(maxlen=history_size)
         )
-        self.request_metrics: List[RequestMetric] = []
-        self.request_counts: Dict[str, int] = defaultdict(int)
-        self.error_counts: Dict[str, int] = defaultdict(int)
-        self.error_requests: List[RequestMetric] = []
-        self.slow_requests: List[RequestMetric] = []
-        self.system_metrics: List[SystemMetrics] = []
+        self.overall = EndpointStats()
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.error_requests: Deque[RequestMetric] = deque(maxlen=history_size)
+        self.slow_requests: Deque[RequestMetric] = deque(maxlen=history_size)
+        self.system_metrics: Deque[SystemMetrics] = deque(maxlen=history_size)
         self.document_processing_metrics: Dict[str, Any] = defaultdict(
             lambda: {"count": 0, "total_time": 0, "errors": 0}
         )
@@ -110,18 +180,19 @@ class PerformanceMonitor:
 
     def record_request(self, metric: RequestMetric) -> None:
         """Record a request metric."""
-        self.request_metrics.append(metric)
+        method = metric.method if metric.method in STANDARD_METHODS else OTHER_METHOD
+        endpoint_key = f"{method} {metric.route or UNMATCHED_ROUTE}"
+        endpoint = self.endpoints.get(endpoint_key)
+        if endpoint is None:
+            endpoint = self.endpoints[endpoint_key] = EndpointStats()
 
-        # Update counts
-        endpoint_key = f"{metric.method} {metric.path}"
-        self.request_counts[endpoint_key] += 1
+        error = metric.status_code >= 400
+        self.overall.record(metric.duration, error, metric.timestamp)
+        endpoint.record(metric.duration, error, metric.timestamp)
 
-        if metric.status_code >= 400:
-            self.error_counts[endpoint_key] += 1
+        if error:
             self.error_requests.append(metric)
-
-        # Track slow requests (>1 second)
-        if metric.duration > 1.0:
+        if metric.duration > SLOW_REQUEST_THRESHOLD:
             self.slow_requests.append(metric)
 
     def record_system_metrics(self) -> None:
@@ -148,58 +219,74 @@ class PerformanceMonitor:
             logger.error(f"Failed to record system metrics: {e}")
 
     def get_request_stats(self, minutes: int = 60) -> Dict[str, Any]:
-        """Get request statistics for the last N minutes."""
-        cutoff_time = time.time() - (minutes * 60)
-        recent_requests = [
-            metric for metric in self.request_metrics if metric.timestamp >= cutoff_time
-        ]
+        """Get request statistics for the last N minutes (at most 60).
 
-        if not recent_requests:
+        Minutes are whole clock minutes, the current one included.
+        """
+        minutes = max(1, min(minutes, _WINDOW_MINUTES))
+        now = time.time()
+        histogram = self.overall.window(minutes, now)
+
+        if not histogram.count:
             return {
                 "total_requests": 0,
+                "error_requests": 0,
                 "error_rate": 0.0,
                 "avg_duration": 0.0,
                 "slowest_duration": 0.0,
                 "requests_per_minute": 0.0,
+                "p50": 0.0,
+                "p90": 0.0,
+                "p99": 0.0,
             }
 
-        # Calculate statistics
-        total_requests = len(recent_requests)
-        error_requests = sum(1 for r in recent_requests if r.status_code >= 400)
-        error_rate = error_requests / total_requests if total_requests > 0 else 0
-
-        durations = [r.duration for r in recent_requests]
-        avg_duration = sum(durations) / len(durations)
-        slowest_duration = max(durations)
-
-        requests_per_minute = total_requests / minutes if minutes > 0 else 0
+        total_requests = histogram.count
+        error_requests = self.overall.recent_errors.total(minutes, now)
 
         return {
             "total_requests": total_requests,
             "error_requests": error_requests,
-            "error_rate": error_rate,
-            "avg_duration": avg_duration,
-            "slowest_duration": slowest_duration,
-            "requests_per_minute": requests_per_minute,
+            "error_rate": error_requests / total_requests,
+            "avg_duration": histogram.sum / total_requests,
+            "slowest_duration": histogram.max,
+            "requests_per_minute": total_requests / minutes,
+            **_latency_summary(histogram),
         }
 
-    def get_endpoint_stats(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get top endpoints by request count."""
+    def get_latency_windows(self) -> Dict[str, Dict[str, Any]]:
+        """Get overall request count and latency percentiles per rollup window."""
+        now = time.time()
+        windows = {}
+        for minutes in LATENCY_WINDOWS:
+            histogram = self.overall.window(minutes, now)
+            windows[f"{minutes}m"] = {
+                "requests": histogram.count,
+                **_latency_summary(histogram),
+            }
+        return windows
+
+    def get_endpoint_stats(
+        self, limit: int = 10, minutes: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Get top endpoints by request count.
+
+        Counts cover the monitor's lifetime; latency percentiles cover the
+        last N minutes.
+        """
         sorted_endpoints = sorted(
-            self.request_counts.items(), key=lambda x: x[1], reverse=True
+            self.endpoints.items(), key=lambda x: x[1].requests, reverse=True
         )[:limit]
 
+        now = time.time()
         endpoint_stats = []
-        for endpoint, count in sorted_endpoints:
-            errors = self.error_counts.get(endpoint, 0)
-            error_rate = errors / count if count > 0 else 0
-
+        for endpoint, stats in sorted_endpoints:
             endpoint_stats.append(
                 {
                     "endpoint": endpoint,
-                    "requests": count,
-                    "errors": errors,
-                    "error_rate": error_rate,
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "error_rate": stats.errors / stats.requests,
+                    **_latency_summary(stats.window(minutes, now)),
                 }
             )
 
@@ -254,8 +341,8 @@ class PerformanceMonitor:
             "issues": health_issues,
             "request_stats": request_stats,
             "system_stats": system_stats,
-            "slow_requests_count": len(self.slow_requests),
-            "recent_errors_count": len(self.error_requests),
+            "slow_requests_count": self.overall.recent_slow.total(_WINDOW_MINUTES),
+            "recent_errors_count": self.overall.recent_errors.total(_WINDOW_MINUTES),
         }
 
 
@@ -294,6 +381,7 @@ def record_request_metric(
     duration: float,
     memory_usage: Optional[float] = None,
     cpu_usage: Optional[float] = None,
+    route: Optional[str] = None,
 ) -> None:
     """Record a request metric.
 
@@ -304,6 +392,8 @@ def record_request_metric(
         duration: Request duration in seconds
         memory_usage: Memory usage during request (optional)
         cpu_usage: CPU usage during request (optional)
+        route: Matched route template; requests without one are grouped
+            under a single unmatched endpoint
 
     """
     metric = RequestMetric(
@@ -314,6 +404,7 @@ def record_request_metric(
         timestamp=time.time(),
         memory_usage=memory_usage,
         cpu_usage=cpu_usage,
+        route=route,
     )
 
     performance_monitor.record_request(metric)
@@ -324,6 +415,7 @@ def get_performance_stats() -> Dict[str, Any]:
     return {
         "health_summary": performance_monitor.get_health_summary(),
         "request_stats": performance_monitor.get_request_stats(),
+        "latency_windows": performance_monitor.get_latency_windows(),
         "endpoint_stats": performance_monitor.get_endpoint_stats(),
         "system_stats": performance_monitor.get_system_stats(),
     }
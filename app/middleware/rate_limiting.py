@@ -1,183 +1,435 @@
 """Rate limiting middleware and abuse prevention system.
 
-Provides rate limiting capabilities with throttling algorithms, client identification,
-and abuse prevention mechanisms. Implements multiple rate limiting strategies including
-sliding window, token bucket, and adaptive throttling with distributed systems support.
+Provides rate limiting with the generic cell rate algorithm (GCRA), per-route
+policies and per-user client identification. GCRA keeps a single "theoretical
+arrival time" per client and policy, so each check is O(1) and needs no lock.
+
+Limiter state lives in a pluggable backend:
+
+- ``memory``: a per-process dictionary; limits apply per worker
+- ``postgres``: an UNLOGGED table updated with a single atomic upsert, so
+  limits hold across all workers and nodes sharing the database. The table
+  is created by the ``005_rate_limit_state`` migration.
 """
 
 import asyncio
+import functools
 import logging
 import time
-from collections import defaultdict
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import Request
+from jose import JWTError, jwt
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from app.config import settings
-from app.core.exceptions import RateLimitError
+from app.utils.metrics import CounterFamily
 
 logger = logging.getLogger(__name__)
 
+# Table holding shared limiter state for the postgres backend
+RATE_LIMIT_TABLE = "rate_limit_state"
 
-class RateLimiter:
-    """Sliding window rate limiter with abuse prevention.
 
-    Implements rate limiting algorithms with sliding window approach, client tracking,
-    and monitoring capabilities for production environments with configurable policies.
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """A request allowance: ``limit`` requests per ``period`` seconds.
+
+    Under GCRA the allowance refills continuously at one request every
+    ``period / limit`` seconds, with bursts of up to ``limit`` requests.
     """
 
-    def __init__(self, max_requests: int = 100, time_window: int = 60):
-        """Initialize rate limiter with configurable policies.
+    name: str
+    limit: int
+    period: float
 
-        Sets up sliding window rate limiter with specified limits and time windows.
+    @property
+    def emission_interval(self) -> float:
+        """Seconds between requests at the sustained rate."""
+        return self.period / self.limit
 
-        Args:
-            max_requests: Maximum number of requests allowed per time window
-            time_window: Time window duration in seconds for rate limit calculation
 
-        """
-        self.max_requests = max_requests
-        self.time_window = time_window
-        self.requests: Dict[str, list] = defaultdict(list)
-        self._lock = asyncio.Lock()
+class RateLimitBackend:
+    """Storage for per-client GCRA state."""
 
-    async def is_allowed(self, client_id: str) -> tuple[bool, Optional[int]]:
-        """Check if request is allowed for client with rate limit evaluation.
+    name = "base"
 
-        Performs rate limit evaluation using sliding window algorithm with automatic
-        cleanup and retry-after calculation.
+    async def start(self) -> None:
+        """Prepare the backend for use."""
+
+    async def close(self) -> None:
+        """Release the backend's resources."""
+
+    async def acquire(
+        self, key: str, policy: RateLimitPolicy, cost: float = 1.0
+    ) -> Optional[float]:
+        """Consume cost units of key's allowance if it has room for them.
 
         Args:
-            client_id: Unique identifier for the client (IP, user ID, API key, etc.)
+            key: Client and policy identifier
+            policy: Policy being enforced
+            cost: Units to consume; 0 only checks that the allowance is not
+                overdrawn
 
         Returns:
-            Tuple containing:
-                - bool: True if request is allowed, False if rate limit exceeded
-                - Optional[int]: Retry-after seconds when rate limit exceeded, None when allowed
+            Optional[float]: None if allowed, else seconds until a request
+                would be allowed
+
+        """
+        raise NotImplementedError
+
+    async def charge(self, key: str, policy: RateLimitPolicy, cost: float) -> None:
+        """Consume cost units of key's allowance unconditionally.
+
+        Used to bill work whose cost is only known after it has been done;
+        the allowance may become overdrawn, which blocks further acquires
+        until it refills.
+        """
+        raise NotImplementedError
+
+    async def cleanup(self) -> None:
+        """Remove state of clients whose allowance has fully refilled."""
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return backend statistics."""
+        return {"backend": self.name}
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process GCRA state.
+
+    Each check reads and writes one dictionary entry without awaiting, so it
+    is atomic on the event loop without a lock.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        """Initialize empty state."""
+        self._tat: Dict[str, float] = {}
+
+    async def acquire(
+        self, key: str, policy: RateLimitPolicy, cost: float = 1.0
+    ) -> Optional[float]:
+        """Consume cost units of key's allowance if it has room for them."""
+        now = time.monotonic()
+        tat = max(self._tat.get(key, now), now) + cost * policy.emission_interval
+        if tat - now > policy.period:
+            return tat - policy.period - now
+        self._tat[key] = tat
+        return None
+
+    async def charge(self, key: str, policy: RateLimitPolicy, cost: float) -> None:
+        """Consume cost units of key's allowance unconditionally."""
+        now = time.monotonic()
+        tat = max(self._tat.get(key, now), now)
+        self._tat[key] = tat + cost * policy.emission_interval
+
+    async def cleanup(self) -> None:
+        """Remove state of clients whose allowance has fully refilled."""
+        now = time.monotonic()
+        expired = [key for key, tat in self._tat.items() if tat <= now]
+        for key in expired:
+            del self._tat[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return backend statistics."""
+        return {"backend": self.name, "tracked_clients": len(self._tat)}
+
+
+class PostgresRateLimitBackend(RateLimitBackend):
+    """GCRA state shared through a PostgreSQL UNLOGGED table.
+
+    Each check is one upsert that advances the client's theoretical arrival
+    time only if the request is allowed. Times come from the database clock
+    so all nodes agree. UNLOGGED skips the WAL; state is lost on a database
+    crash, which at worst resets limits.
+
+    Checks run on a small dedicated connection pool in autocommit mode, so
+    each is a single round trip and never waits for the application's pool.
+    If the database is unreachable, or no connection frees up within
+    ``rate_limit_pool_timeout``, requests are allowed rather than failing
+    the whole API.
+    """
 
+    name = "postgres"
+
+    def __init__(self):
+        """Initialize backend; the connection pool is created on start."""
+        self._engine: Optional[AsyncEngine] = None
+
+    # EXCLUDED.tat is now + interval. The update runs only if the stored
+    # arrival time is at most `tolerance` (period - interval) ahead of now.
+    _ACQUIRE_SQL = text(
+        f"""
+        WITH updated AS (
+            INSERT INTO {RATE_LIMIT_TABLE} AS s (key, tat)
+            VALUES (
+                CAST(:key AS text),
+                extract(epoch FROM clock_timestamp())::double precision
+                    + CAST(:interval AS double precision)
+            )
+            ON CONFLICT (key) DO UPDATE
+                SET tat = GREATEST(
+                    s.tat + CAST(:interval AS double precision), EXCLUDED.tat
+                )
+                WHERE s.tat - EXCLUDED.tat + CAST(:interval AS double precision)
+                    <= CAST(:tolerance AS double precision)
+            RETURNING tat
+        )
+        SELECT
+            (SELECT tat FROM updated) AS allowed_tat,
+            (SELECT tat FROM {RATE_LIMIT_TABLE} WHERE key = CAST(:key AS text))
+                AS current_tat,
+            extract(epoch FROM clock_timestamp())::double precision AS now
+        """
+    )
+
+    _CHARGE_SQL = text(
+        f"""
+        INSERT INTO {RATE_LIMIT_TABLE} AS s (key, tat)
+        VALUES (
+            CAST(:key AS text),
+            extract(epoch FROM clock_timestamp())::double precision
+                + CAST(:interval AS double precision)
+        )
+        ON CONFLICT (key) DO UPDATE
+            SET tat = GREATEST(
+                s.tat + CAST(:interval AS double precision), EXCLUDED.tat
+            )
         """
-        async with self._lock:
-            current_time = time.time()
-            client_requests = self.requests[client_id]
-
-            # Remove old requests outside the time window
-            client_requests[:] = [
-                req_time
-                for req_time in client_requests
-                if current_time - req_time < self.time_window
-            ]
-
-            # Check if limit exceeded
-            if len(client_requests) >= self.max_requests:
-                # Calculate retry after time
-                oldest_request = (
-                    min(client_requests) if client_requests else current_time
+    )
+
+    async def start(self) -> None:
+        """Create the connection pool and check that the state table exists."""
+        self._engine = create_async_engine(
+            settings.database_url,
+            isolation_level="AUTOCOMMIT",
+            pool_size=settings.rate_limit_pool_size,
+            max_overflow=0,
+            pool_timeout=settings.rate_limit_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            connect_args={"command_timeout": 5},
+        )
+        async with self._engine.connect() as conn:
+            exists = (
+                await conn.execute(
+                    text("SELECT to_regclass(CAST(:table AS text))"),
+                    {"table": RATE_LIMIT_TABLE},
+                )
+            ).scalar()
+        if exists is None:
+            logger.error(
+                f"Rate limit table {RATE_LIMIT_TABLE} is missing; run the "
+                "database migrations (alembic upgrade head)"
+            )
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+    async def acquire(
+        self, key: str, policy: RateLimitPolicy, cost: float = 1.0
+    ) -> Optional[float]:
+        """Consume cost units of key's allowance if it has room for them."""
+        if self._engine is None:
+            return None
+
+        interval = cost * policy.emission_interval
+        try:
+            async with self._engine.connect() as conn:
+                row = (
+                    await conn.execute(
+                        self._ACQUIRE_SQL,
+                        {
+                            "key": key,
+                            "interval": interval,
+                            "tolerance": policy.period - interval,
+                        },
+                    )
+                ).one()
+        except Exception as e:
+            logger.warning(f"Rate limit check failed, allowing request: {e}")
+            return None
+
+        if row.allowed_tat is not None:
+            return None
+        # current_tat is the state before this statement
+        return row.current_tat + interval - policy.period - row.now
+
+    async def charge(self, key: str, policy: RateLimitPolicy, cost: float) -> None:
+        """Consume cost units of key's allowance unconditionally."""
+        if self._engine is None:
+            return
+
+        try:
+            async with self._engine.connect() as conn:
+                await conn.execute(
+                    self._CHARGE_SQL,
+                    {"key": key, "interval": cost * policy.emission_interval},
                 )
-                retry_after = (
-                    int(self.time_window - (current_time - oldest_request)) + 1
+        except Exception as e:
+            logger.warning(f"Rate limit charge failed: {e}")
+
+    async def cleanup(self) -> None:
+        """Remove state of clients whose allowance has fully refilled."""
+        if self._engine is None:
+            return
+
+        async with self._engine.connect() as conn:
+            await conn.execute(
+                text(
+                    f"DELETE FROM {RATE_LIMIT_TABLE} "
+                    "WHERE tat <= extract(epoch FROM clock_timestamp())"
                 )
-                return False, retry_after
+            )
 
-            # Add current request
-            client_requests.append(current_time)
-            return True, None
 
-    async def cleanup_old_entries(self):
-        """Remove expired entries to prevent memory leaks and maintain performance.
+RATE_LIMIT_BACKENDS = {
+    "memory": MemoryRateLimitBackend,
+    "postgres": PostgresRateLimitBackend,
+}
 
-        Performs cleanup of expired rate limit entries across all clients to ensure
-        long-running applications maintain consistent performance and memory usage.
-        """
-        async with self._lock:
-            current_time = time.time()
-            clients_to_remove = []
 
-            for client_id, requests in self.requests.items():
-                # Remove old requests
-                requests[:] = [
-                    req_time
-                    for req_time in requests
-                    if current_time - req_time < self.time_window
-                ]
+class RateLimiter:
+    """Applies per-route rate limit policies to clients.
 
-                # Mark clients with no recent requests for removal
-                if not requests:
-                    clients_to_remove.append(client_id)
+    Routes are matched by path prefix in order; requests matching no route
+    use the default policy. Each client has independent state per policy.
+    """
 
-            # Remove empty client entries
-            for client_id in clients_to_remove:
-                del self.requests[client_id]
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        default_policy: RateLimitPolicy,
+        route_policies: Optional[List[Tuple[str, RateLimitPolicy]]] = None,
+    ):
+        """Initialize rate limiter.
 
+        Args:
+            backend: Storage for limiter state
+            default_policy: Policy for paths without a route policy
+            route_policies: Ordered (path prefix, policy) pairs
 
-# Global rate limiters
-general_limiter = RateLimiter(
-    max_requests=settings.rate_limit_requests, time_window=settings.rate_limit_period
-)
+        """
+        self.backend = backend
+        self.default_policy = default_policy
+        self.route_policies = route_policies or []
+        self.rejections = CounterFamily(("policy",))
 
-auth_limiter = RateLimiter(
-    max_requests=10, time_window=300
-)  # 10 requests per 5 minutes for auth
-upload_limiter = RateLimiter(max_requests=20, time_window=3600)  # 20 uploads per hour
+    def policy_for(self, path: str) -> RateLimitPolicy:
+        """Return the policy that applies to a request path."""
+        for prefix, policy in self.route_policies:
+            if path.startswith(prefix):
+                return policy
+        return self.default_policy
 
+    async def check(self, path: str, client_key: str) -> Optional[float]:
+        """Consume one request for a client on a path.
 
-async def rate_limit_middleware(request: Request, call_next):
-    """Rate limiting middleware with client identification and endpoint-specific policies.
+        Args:
+            path: Request path, used to select the policy
+            client_key: Client identifier from rate_limit_key()
+
+        Returns:
+            Optional[float]: None if allowed, else seconds until retry
+
+        """
+        policy = self.policy_for(path)
+        retry_after = await self.backend.acquire(f"{policy.name}:{client_key}", policy)
+        if retry_after is not None:
+            self.rejections.inc(policy.name)
+        return retry_after
+
+
+@functools.lru_cache(maxsize=4096)
+def _token_subject(token: str) -> Optional[str]:
+    """Return the subject of a validly signed token, or None."""
+    try:
+        # Expired tokens still identify their user for rate limiting
+        payload = jwt.decode(
+            token,
+            settings.secret_key,
+            algorithms=[settings.algorithm],
+            options={"verify_exp": False},
+        )
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
+def rate_limit_key(client_ip: str, authorization: Optional[str]) -> str:
+    """Build the rate limiting key for a request.
 
-    Provides rate limiting enforcement with client fingerprinting and endpoint-specific
-    policy selection for protection against abuse and resource exhaustion.
+    Authenticated requests are limited per user, across all their addresses;
+    anonymous requests per client address.
 
     Args:
-        request: The incoming HTTP request object for rate limit evaluation
-        call_next: The next middleware or endpoint handler in the processing chain
+        client_ip: Client address
+        authorization: Authorization header value, if any
 
     Returns:
-        Response: The HTTP response from the downstream handler when rate limits allow
-
-    Raises:
-        RateLimitError: Raised when rate limits are exceeded (429 Too Many Requests)
+        str: Client identifier
 
     """
-    # Get client identifier
-    client_ip = request.client.host if request.client else "unknown"
-    user_agent = request.headers.get("user-agent", "unknown")
-    client_id = f"{client_ip}:{hash(user_agent) % 10000}"  # Simple client fingerprint
-
-    # Choose appropriate limiter based on endpoint
-    path = request.url.path
-
-    if "/auth/" in path:
-        limiter = auth_limiter
-    elif "/upload" in path:
-        limiter = upload_limiter
-    else:
-        limiter = general_limiter
-
-    # Check rate limit
-    is_allowed, retry_after = await limiter.is_allowed(client_id)
-
-    if not is_allowed:
-        logger.warning(f"Rate limit exceeded for client {client_id} on path {path}")
-
-        raise RateLimitError(
-            "Rate limit exceeded",
-            details={"retry_after": retry_after} if retry_after else None
+    if authorization:
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            subject = _token_subject(token)
+            if subject:
+                return f"user:{subject}"
+    return f"ip:{client_ip}"
+
+
+def _create_rate_limiter() -> RateLimiter:
+    backend_class = RATE_LIMIT_BACKENDS.get(settings.rate_limit_backend)
+    if backend_class is None:
+        raise ValueError(
+            f"Unknown rate limit backend: {settings.rate_limit_backend}. "
+            f"Use: {', '.join(RATE_LIMIT_BACKENDS)}"
         )
-
-    response = await call_next(request)
-    return response
+    auth_policy = RateLimitPolicy("auth", limit=10, period=300)  # 10 per 5 minutes
+    return RateLimiter(
+        backend_class(),
+        default_policy=RateLimitPolicy(
+            "general",
+            limit=settings.rate_limit_requests,
+            period=settings.rate_limit_period,
+        ),
+        route_policies=[
+            ("/api/v1/auth/login", auth_policy),
+            ("/api/v1/auth/register", auth_policy),
+            ("/api/v1/auth/password-reset", auth_policy),
+            (
+                "/api/v1/documents/upload",
+                RateLimitPolicy("upload", limit=20, period=3600),  # 20 per hour
+            ),
+        ],
+    )
+
+
+# Global rate limiter
+rate_limiter = _create_rate_limiter()
+
+
+async def stop_rate_limiter() -> None:
+    """Release the rate limit backend's resources."""
+    await rate_limiter.backend.close()
 
 
 async def start_rate_limiter_cleanup():
-    """Start background task to clean up old rate limiter entries."""
+    """Prepare the rate limit backend and start its periodic cleanup."""
+    await rate_limiter.backend.start()
 
     async def cleanup_loop():
         while True:
             try:
                 await asyncio.sleep(300)  # Clean up every 5 minutes
 
-                await general_limiter.cleanup_old_entries()
-                await auth_limiter.cleanup_old_entries()
-                await upload_limiter.cleanup_old_entries()
+                await rate_limiter.backend.cleanup()
 
                 logger.debug("Rate limiter cleanup completed")
 
@@ -185,13 +437,11 @@ async def start_rate_limiter_cleanup():
                 logger.error(f"Rate limiter cleanup failed: {e}")
 
     asyncio.create_task(cleanup_loop())
-    logger.info("Rate limiter cleanup task started")
+    logger.info(
+        f"Rate limiter cleanup task started ({rate_limiter.backend.name} backend)"
+    )
 
 
-def get_rate_limiter_stats() -> Dict[str, int]:
+def get_rate_limiter_stats() -> Dict[str, Any]:
     """Get current rate limiter statistics."""
-    return {
-        "general_clients": len(general_limiter.requests),
-        "auth_clients": len(auth_limiter.requests),
-        "upload_clients": len(upload_limiter.requests),
-    }
+    return rate_limiter.backend.get_stats()
@@ -9,9 +9,6 @@ import logging
 import re
 from typing import Any, Dict, List
 
-from fastapi import Request
-from pydantic import ValidationError as PydanticValidationError
-
 from app.core.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
@@ -220,85 +217,6 @@ class InputValidator:
         return check_depth(payload)
 
 
-async def validate_request_middleware(request: Request, call_next):
-    """Comprehensive request validation middleware with advanced security enforcement.
-
-    Provides enterprise-grade request validation including size validation, header
-    analysis, and security threat detection with comprehensive protection against
-    malicious requests, DoS attacks, and data integrity violations. Implements
-    multi-layer security validation with intelligent threat detection and
-    automated response capabilities for production-ready security enforcement.
-
-    Args:
-        request (Request): The incoming HTTP request object for comprehensive validation:
-            - Content length validation preventing resource exhaustion attacks
-            - Header analysis for suspicious patterns and malicious content
-            - User agent validation preventing bot attacks and reconnaissance
-            - Request structure validation ensuring data integrity and format compliance
-        call_next (Callable): The next middleware or endpoint handler in the processing
-            chain, called only after successful validation and security clearance
-
-    Returns:
-        Response: The HTTP response from the downstream handler after validation:
-            - Original response preserved when validation passes successfully
-            - Request metadata enhanced with validation results and security context
-
-    Raises:
-        ValidationError: Raised for validation failures with specific error codes:
-            - 413 Payload Too Large: For oversized requests exceeding configured limits
-            - 422 Unprocessable Entity: For malformed request structure and invalid data
-            - 400 Bad Request: For general validation failures and security violations
-
-    Security Notes:
-        - Content length validation prevents DoS attacks through oversized payloads
-        - User agent analysis detects bot traffic and suspicious client behavior
-        - Header validation prevents header injection and malformed request attacks
-        - Comprehensive logging for security monitoring and incident response
-        - Automatic threat detection with real-time alerting and response capabilities
-
-    Performance Notes:
-        - Efficient validation algorithms with minimal processing overhead
-        - Early termination for obvious violations reducing resource consumption
-        - Asynchronous processing ensuring non-blocking request validation
-        - Memory-efficient validation with automatic cleanup and resource management
-        - Optimized pattern matching with compiled regular expressions
-
-    Use Cases:
-        - Production API protection against malicious requests and abuse attempts
-        - DoS prevention through request size and rate validation
-        - Bot detection and mitigation with behavioral analysis
-        - Data integrity enforcement ensuring consistent request processing
-        - Security compliance validation for regulatory requirements
-
-    Example:
-        # Applied automatically as middleware to all requests
-        # Validates request size, headers, and security parameters
-        # Blocks malicious requests and logs security events
-
-    """
-    try:
-        # Check request size (basic DoS protection)
-        content_length = request.headers.get("content-length")
-        if content_length and int(content_length) > 50 * 1024 * 1024:  # 50MB limit
-            raise ValidationError("Request too large")
-
-        # Check for suspicious user agents (basic bot protection)
-        user_agent = request.headers.get("user-agent", "")
-        if not user_agent or len(user_agent) > 500:
-            logger.warning(f"Suspicious user agent: {user_agent[:100]}...")
-
-        # Process request normally
-        response = await call_next(request)
-        return response
-
-    except PydanticValidationError as e:
-        logger.warning(f"Request validation failed: {e}")
-        raise ValidationError("Invalid request format")
-    except Exception as e:
-        logger.error(f"Request validation middleware error: {e}")
-        raise ValidationError("Request validation failed")
-
-
 def validate_search_query(query: str) -> str:
     """Validate and sanitize search queries.
 
@@ -10,6 +10,7 @@ Core Models:
 - MCPServer/MCPTool: Model Context Protocol integration
 - LLMProfile: Language model configuration management
 - Prompt: Prompt template management
+- BulkOperation: Progress of background bulk deletions
 
 All models inherit from BaseModelDB providing BIGSERIAL primary keys, automatic
 timestamps, and consistent table naming conventions.
@@ -17,6 +18,7 @@ timestamps, and consistent table naming conventions.
 
 # Import SQLAlchemy base classes only
 from app.models.base import BaseModelDB, BigSerialMixin, TimestampMixin
+from app.models.bulk_operation import BulkOperation
 from app.models.conversation import Conversation, Message
 from app.models.document import Document, DocumentChunk
 
@@ -47,4 +49,5 @@ __all__ = [
     "MCPTool",
     "Prompt",
     "LLMProfile",
+    "BulkOperation",
 ]
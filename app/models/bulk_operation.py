@@ -0,0 +1,67 @@
+"""Bulk operation status model.
+
+This module defines the BulkOperation model, which persists the progress of
+background bulk deletions so any worker can report it, including after a
+restart.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import JSON, DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModelDB
+
+
+class BulkOperation(BaseModelDB):
+    """Status of one background bulk operation.
+
+    A row is written when the operation is queued and updated after every
+    batch and when it finishes.
+    """
+
+    __tablename__ = "bulk_operations"
+
+    operation_id: Mapped[str] = mapped_column(
+        String(36),
+        unique=True,
+        nullable=False,
+        index=True,
+        doc="Public identifier of the operation",
+    )
+    target: Mapped[str] = mapped_column(
+        String(20), nullable=False, doc="Entity type being processed"
+    )
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, index=True, doc="Operation status"
+    )
+    requested_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, doc="Number of requested IDs"
+    )
+    id_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, doc="Number of valid IDs to process"
+    )
+    processed_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, doc="Number of IDs processed so far"
+    )
+    deleted_ids: Mapped[List[str]] = mapped_column(
+        JSON, nullable=False, default=list, doc="IDs deleted so far"
+    )
+    failed_ids: Mapped[List[str]] = mapped_column(
+        JSON, nullable=False, default=list, doc="IDs that could not be deleted"
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        """Return string representation of BulkOperation."""
+        return (
+            f"<BulkOperation(operation_id={self.operation_id}, "
+            f"target={self.target}, status={self.status})>"
+        )
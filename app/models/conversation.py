@@ -20,6 +20,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import BaseModelDB
+from app.utils.text_search import ts_vector
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -59,6 +60,7 @@ class Conversation(BaseModelDB):
         "Message",
         back_populates="conversation",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="Message.created_at",
     )
     user: Mapped["User"] = relationship("User", back_populates="conversations")
@@ -68,6 +70,13 @@ class Conversation(BaseModelDB):
         Index("idx_conversations_user_id", "user_id"),
         Index("idx_conversations_active", "is_active"),
         Index("idx_conversations_title", "title"),
+        Index(
+            "idx_conversations_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index("idx_conversations_user_updated", "user_id", "updated_at", "id"),
     )
 
     def __repr__(self) -> str:
@@ -122,6 +131,9 @@ class Message(BaseModelDB):
         Index("idx_messages_conversation_id", "conversation_id"),
         Index("idx_messages_role", "role"),
         Index("idx_messages_created_at", "created_at"),
+        Index(
+            "idx_messages_conversation_created", "conversation_id", "created_at", "id"
+        ),
     )
 
     def __repr__(self) -> str:
@@ -132,3 +144,10 @@ class Message(BaseModelDB):
 
         """
         return f"<Message(role='{self.role}', conv_id={self.conversation_id})>"
+
+
+# Full-text search vector over message content; queries must use this same
+# expression to hit the GIN expression index
+MESSAGE_SEARCH_VECTOR = ts_vector(Message.content)
+
+Index("idx_messages_content_tsv", MESSAGE_SEARCH_VECTOR, postgresql_using="gin")
@@ -8,11 +8,25 @@ from enum import Enum
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import JSON, BigInteger, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    exists,
+    or_,
+    select,
+)
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.elements import ColumnElement
 
 from app.models.base import BaseModelDB
+from app.utils.text_search import ts_match, ts_query, ts_vector
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -106,13 +120,13 @@ class Document(BaseModelDB):
 
     metainfo: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
 
-    # Content and processing
+    # Content and processing (deferred: loaded only when accessed or undeferred)
     content: Mapped[Optional[str]] = mapped_column(
-        Text, nullable=True, doc="Extracted text content"
+        Text, nullable=True, deferred=True, doc="Extracted text content"
     )
 
     summary: Mapped[Optional[str]] = mapped_column(
-        Text, nullable=True, doc="AI-generated summary"
+        Text, nullable=True, deferred=True, doc="AI-generated summary"
     )
 
     # Processing metadata
@@ -145,6 +159,7 @@ class Document(BaseModelDB):
         "DocumentChunk",
         back_populates="document",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         doc="Text chunks from this document",
     )
 
@@ -160,10 +175,17 @@ class Document(BaseModelDB):
         Index("idx_documents_owner_status", "owner_id", "status"),
         Index("idx_documents_owner_type", "owner_id", "file_type"),
         Index("idx_documents_owner_created", "owner_id", "created_at"),
+        Index("idx_documents_owner_title", "owner_id", "title", "id"),
         Index("idx_documents_status_created", "status", "created_at"),
         # Search indexes
         Index("idx_documents_title", "title"),
         Index("idx_documents_filename", "filename"),
+        Index(
+            "idx_documents_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
     )
 
     def __repr__(self) -> str:
@@ -215,10 +237,11 @@ class DocumentChunk(BaseModelDB):
         Integer, nullable=True, doc="Ending character offset in original document"
     )
 
-    # Vector embedding
+    # Vector embedding (deferred: search compares it in SQL, not in Python)
     embedding: Mapped[Optional[List[float]]] = mapped_column(
         Vector(3072),
         nullable=True,
+        deferred=True,
         doc="Vector embedding for semantic search",
     )
 
@@ -276,3 +299,32 @@ class DocumentChunk(BaseModelDB):
 
         """
         return f"<DocumentChunk(id={self.id}, document_id={self.document_id}, index={self.chunk_index})>"
+
+
+# Full-text search vectors; queries must use these same expressions to hit the
+# GIN expression indexes below. Document.content is deliberately not indexed:
+# a tsvector is capped at 1MB, so indexing the full text of a large document
+# would make storing it fail. Its words are matched through the chunks.
+DOCUMENT_SEARCH_VECTOR = ts_vector(Document.title, Document.summary)
+CHUNK_SEARCH_VECTOR = ts_vector(DocumentChunk.content)
+
+Index("idx_documents_search_tsv", DOCUMENT_SEARCH_VECTOR, postgresql_using="gin")
+Index("idx_chunks_content_tsv", CHUNK_SEARCH_VECTOR, postgresql_using="gin")
+
+
+def document_text_match(term: str) -> ColumnElement:
+    """Return a condition matching documents whose text contains the words of term.
+
+    Title and summary are matched on the document, and content through an
+    EXISTS over the document's chunks; both use the indexed tsvectors.
+    """
+    query = ts_query(term)
+    return or_(
+        ts_match(DOCUMENT_SEARCH_VECTOR, query),
+        exists(
+            select(DocumentChunk.id).where(
+                DocumentChunk.document_id == Document.id,
+                ts_match(CHUNK_SEARCH_VECTOR, query),
+            )
+        ),
+    )
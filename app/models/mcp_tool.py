@@ -44,6 +44,10 @@ class MCPTool(BaseModelDB):
         success_count (Mapped[int]): Number of successful executions.
         error_count (Mapped[int]): Number of failed executions.
         average_duration_ms (Mapped[Optional[int]]): Average execution duration in milliseconds.
+        cacheable (Mapped[bool]): Whether results of the tool may be cached.
+        cache_ttl (Mapped[Optional[int]]): Cache TTL in seconds (None uses the default).
+        cache_key_params (Mapped[Optional[list]]): Argument names forming the cache key (None uses all).
+        cache_normalization (Mapped[str]): Argument normalization rule for cache keys.
         server (relationship): Related MCP server.
 
     """
@@ -97,6 +101,24 @@ class MCPTool(BaseModelDB):
     average_duration_ms: Mapped[Optional[int]] = mapped_column(
         Integer, nullable=True, doc="Average execution duration in milliseconds"
     )
+    cacheable: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        nullable=False,
+        doc="Whether results of the tool may be cached",
+    )
+    cache_ttl: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, doc="Cache TTL in seconds (None uses the default)"
+    )
+    cache_key_params: Mapped[Optional[list]] = mapped_column(
+        JSON, nullable=True, doc="Argument names forming the cache key (None uses all)"
+    )
+    cache_normalization: Mapped[str] = mapped_column(
+        String(20),
+        default="exact",
+        nullable=False,
+        doc="Argument normalization rule for cache keys (exact or casefold)",
+    )
 
     # Relationships
     server: Mapped["MCPServer"] = relationship("MCPServer", back_populates="tools")
@@ -136,8 +158,6 @@ class MCPTool(BaseModelDB):
                 self.average_duration_ms = int(
                     (total_duration + duration_ms) / self.usage_count
                 )
-        print(self)
-        print(dir(self))
 
     def __repr__(self) -> str:
         """Return string representation of MCPTool model."""
@@ -82,6 +82,19 @@ class Prompt(BaseModelDB):
         Index("idx_prompts_usage_count", "usage_count"),
         Index("idx_prompts_last_used", "last_used_at"),
         Index("idx_prompts_category", "category"),
+        # Trigram indexes for substring search
+        Index(
+            "idx_prompts_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_prompts_content_trgm",
+            "content",
+            postgresql_using="gin",
+            postgresql_ops={"content": "gin_trgm_ops"},
+        ),
     )
 
     def record_usage(self):
@@ -14,10 +14,10 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.core.exceptions import AuthenticationError, ValidationError
+from app.core.exceptions import AuthenticationError, RateLimitError, ValidationError
 from app.models.user import User
 from app.services.base import BaseService
-from app.utils.security import get_password_hash, verify_password
+from app.utils.security import check_password, hash_password
 from app.utils.timestamp import utcnow
 from shared.schemas.auth import RegisterRequest, Token
 
@@ -118,7 +118,7 @@ class AuthService(BaseService):
                 raise ValidationError("Email already exists")
 
             # Create new user
-            hashed_password = get_password_hash(user_data.password)
+            hashed_password = await hash_password(user_data.password)
 
             user = User(
                 username=user_data.username,
@@ -136,7 +136,7 @@ class AuthService(BaseService):
             logger.info(f"User registered: {user.username}")
             return user
 
-        except ValidationError:
+        except (ValidationError, RateLimitError):
             raise
         except Exception as e:
             logger.error(f"User registration failed: {e}")
@@ -212,7 +212,7 @@ class AuthService(BaseService):
                 raise AuthenticationError("Account is inactive")
 
             # Verify password
-            if not verify_password(password, user.hashed_password):
+            if not await check_password(password, user.hashed_password):
                 raise AuthenticationError("Invalid username or password")
 
             # Update last login
@@ -225,7 +225,7 @@ class AuthService(BaseService):
             logger.info(f"User authenticated: {user.username}")
             return token_data
 
-        except AuthenticationError:
+        except (AuthenticationError, RateLimitError):
             raise
         except Exception as e:
             logger.error(f"Authentication failed: {e}")
@@ -280,8 +280,9 @@ class AuthService(BaseService):
 
         """
         to_encode = data.copy()
-        expire = utcnow() + timedelta(minutes=self.access_token_expire_minutes)
-        to_encode.update({"exp": expire})
+        issued_at = utcnow()
+        expire = issued_at + timedelta(minutes=self.access_token_expire_minutes)
+        to_encode.update({"exp": expire, "iat": issued_at})
 
         encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
 
@@ -341,16 +342,30 @@ class AuthService(BaseService):
                 # Token invalid, require authentication
                 raise AuthenticationError("Invalid or expired token")
 
+        """
+        payload = self.decode_token(token)
+        if payload is None:
+            return None
+        return payload.get("sub")
+
+    def decode_token(self, token: str) -> Optional[Dict[str, Any]]:
+        """Verify a JWT token and return its claims.
+
+        Args:
+            token: JWT token string to verify and decode
+
+        Returns:
+            Optional[Dict[str, Any]]: Token claims, or None if the token is
+                invalid, expired, malformed or has no subject
+
         """
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            username: str = payload.get("sub")
-            if username is None:
-                return None
-            return username
-
         except JWTError:
             return None
+        if payload.get("sub") is None:
+            return None
+        return payload
 
     async def get_user_by_username(self, username: str) -> Optional[User]:
         """Retrieve user account by username with case-insensitive matching.
@@ -16,6 +16,7 @@ from typing import TYPE_CHECKING, Any, Dict, Optional
 from sqlalchemy import select, update
 
 from app.config import settings
+from app.core.tracing import continue_trace, span, trace_headers
 from app.models.document import Document, DocumentChunk, FileStatus
 from app.services.base import BaseService
 from app.services.embedding import EmbeddingService
@@ -75,6 +76,10 @@ class ProcessingTask:
         self.completed_at: Optional[datetime] = None
         self.error_message: Optional[str] = None
         self.progress = 0.0
+        # Current step of a processing task: extract, chunk, embed or store
+        self.stage: Optional[str] = None
+        # Trace of the request that queued the task, continued by the worker
+        self.trace_context = trace_headers()
 
     def __lt__(self, other):
         """Priority queue comparison (lower priority number = higher priority)."""
@@ -334,7 +339,17 @@ class BackgroundProcessor(BaseService):
             )
 
             if task.task_type == "process_document":
-                await self._process_document_task(task, db)
+                with continue_trace(
+                    "ingestion.process_document",
+                    task.trace_context,
+                    kind="consumer",
+                    attributes={
+                        "task.id": task.task_id,
+                        "document.id": task.document_id,
+                        "task.retries": task.retries,
+                    },
+                ):
+                    await self._process_document_task(task, db)
             else:
                 raise ValueError(f"Unknown task type: {task.task_type}")
 
@@ -392,12 +407,14 @@ class BackgroundProcessor(BaseService):
 
         try:
             # Step 1: Extract text (20% progress)
+            task.stage = "extract"
             task.progress = 0.1
             logger.info(f"Extracting text from document {document.id}")
 
-            extracted_text = await self.file_processor.extract_text(
-                document.file_path, document.file_type.value
-            )
+            with span("ingestion.extract", {"file.type": document.file_type.value}):
+                extracted_text = await self.file_processor.extract_text(
+                    document.file_path, document.file_type.value
+                )
 
             task.progress = 0.2
 
@@ -407,86 +424,94 @@ class BackgroundProcessor(BaseService):
             task.progress = 0.3
 
             # Step 3: Create chunks (40% progress)
+            task.stage = "chunk"
             logger.info(f"Creating chunks for document {document.id}")
 
-            chunks = self.text_processor.create_chunks(
-                extracted_text,
-                metainfo={
-                    "document_id": str(document.id),
-                    "document_title": document.title,
-                    "language": text_stats.get("language"),
-                },
-            )
+            with span("ingestion.chunk") as chunk_span:
+                chunks = self.text_processor.create_chunks(
+                    extracted_text,
+                    metainfo={
+                        "document_id": str(document.id),
+                        "document_title": document.title,
+                        "language": text_stats.get("language"),
+                    },
+                )
+                if chunk_span is not None:
+                    chunk_span.set_attribute("chunk.count", len(chunks))
 
             task.progress = 0.4
 
             logger.info(f"Created {len(chunks)} chunks for document {document.id}")
 
             # Step 4: Generate embeddings and save chunks (40-90% progress)
+            task.stage = "embed"
             chunk_records = []
             progress_step = 0.5 / len(chunks) if chunks else 0
 
             embedding_service = EmbeddingService(db)
 
-            for i, chunk in enumerate(chunks):
-                # Generate embedding
-                embedding = await embedding_service.generate_embedding(
-                    chunk.content
-                )
+            with span("ingestion.embed", {"chunk.count": len(chunks)}):
+                for i, chunk in enumerate(chunks):
+                    # Generate embedding
+                    embedding = await embedding_service.generate_embedding(
+                        chunk.content
+                    )
 
-                # Create chunk record
-                chunk_record = DocumentChunk(
-                    content=chunk.content,
-                    chunk_index=chunk.chunk_index,
-                    start_offset=chunk.start_char,
-                    end_offset=chunk.end_char,
-                    token_count=len(
-                        chunk.content.split()
-                    ),  # Simple word count approximation
-                    embedding=embedding,
-                    embedding_model=str(settings.openai_embedding_model),
-                    language=text_stats.get("language"),
-                    document_id=document.id,
-                )
+                    # Create chunk record
+                    chunk_record = DocumentChunk(
+                        content=chunk.content,
+                        chunk_index=chunk.chunk_index,
+                        start_offset=chunk.start_char,
+                        end_offset=chunk.end_char,
+                        token_count=len(
+                            chunk.content.split()
+                        ),  # Simple word count approximation
+                        embedding=embedding,
+                        embedding_model=str(settings.openai_embedding_model),
+                        language=text_stats.get("language"),
+                        document_id=document.id,
+                    )
 
-                chunk_records.append(chunk_record)
-                db.add(chunk_record)
+                    chunk_records.append(chunk_record)
+                    db.add(chunk_record)
 
-                # Update progress
-                task.progress = 0.4 + (i + 1) * progress_step
+                    # Update progress
+                    task.progress = 0.4 + (i + 1) * progress_step
 
-                # Allow other tasks to run
-                await asyncio.sleep(0)
+                    # Allow other tasks to run
+                    await asyncio.sleep(0)
 
             task.progress = 0.9
 
             # Step 5: Update document (90-100% progress)
+            task.stage = "store"
             processing_time = time.time() - start_time
 
             # Update document with results
-            await db.execute(
-                update(Document)
-                .where(Document.id == document.id)
-                .values(
-                    content=extracted_text,
-                    status=FileStatus.COMPLETED,
-                    chunk_count=len(chunks),
-                    processing_time=processing_time,
-                    metainfo={
-                        **(document.metainfo or {}),
-                        "text_stats": text_stats,
-                        "processing_completed_at": utcnow().isoformat(),
-                        "chunk_count": len(chunks),
-                        "processing_config": {
-                            "chunk_size": self.text_processor.chunk_size,
-                            "chunk_overlap": self.text_processor.chunk_overlap,
-                            "embedding_model": str(settings.openai_embedding_model),
+            with span("ingestion.store", {"chunk.count": len(chunks)}):
+                await db.execute(
+                    update(Document)
+                    .where(Document.id == document.id)
+                    .values(
+                        content=extracted_text,
+                        status=FileStatus.COMPLETED,
+                        chunk_count=len(chunks),
+                        processing_time=processing_time,
+                        metainfo={
+                            **(document.metainfo or {}),
+                            "text_stats": text_stats,
+                            "processing_completed_at": utcnow().isoformat(),
+                            "chunk_count": len(chunks),
+                            "processing_config": {
+                                "chunk_size": self.text_processor.chunk_size,
+                                "chunk_overlap": self.text_processor.chunk_overlap,
+                                "embedding_model": str(settings.openai_embedding_model),
+                            },
                         },
-                    },
+                    )
                 )
-            )
 
-            await db.commit()
+                await db.commit()
             task.progress = 1.0
 
             logger.info(
@@ -586,6 +611,14 @@ class BackgroundProcessor(BaseService):
                 },
             )
 
+    def get_stage_depths(self) -> Dict[str, int]:
+        """Return the number of tasks waiting in the queue and in each stage."""
+        depths = {"queued": self.task_queue.qsize()}
+        for task in list(self.active_tasks.values()):
+            stage = task.stage or "pending"
+            depths[stage] = depths.get(stage, 0) + 1
+        return depths
+
     async def get_queue_status(self) -> Dict[str, Any]:
         """Get the current status of the task queue.
 
@@ -628,6 +661,11 @@ class BackgroundProcessor(BaseService):
 _background_processor: Optional[BackgroundProcessor] = None
 
 
+def peek_background_processor() -> Optional[BackgroundProcessor]:
+    """Return the global background processor if it has been started."""
+    return _background_processor
+
+
 async def get_background_processor() -> BackgroundProcessor:
     """Get the global background processor instance.
 
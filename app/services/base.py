@@ -56,11 +56,12 @@ Service Patterns:
 
 from typing import Any, Dict, List, Optional, Type, TypeVar
 
-from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy import String, and_, cast, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
 from app.core.logging import StructuredLogger
+from app.utils.pagination import count_rows, paginate_keyset
 
 ModelType = TypeVar("ModelType")
 
@@ -276,6 +277,80 @@ class BaseService:
         entities = result.scalars().all()
         return list(entities), total
 
+    async def _list_with_keyset(
+        self,
+        model: Type[ModelType],
+        filters: Optional[List[Any]] = None,
+        sort_column: Any = None,
+        size: int = 20,
+        cursor: Optional[str] = None,
+        page: int = 1,
+        descending: bool = False,
+        count: str = "exact",
+    ) -> tuple[List[ModelType], Optional[int], Optional[str], bool]:
+        """List entities with keyset (cursor) pagination on (sort column, id).
+
+        Args:
+            model: SQLAlchemy model class
+            filters: List of filter conditions
+            sort_column: Column to order by (defaults to model.id)
+            size: Items per page
+            cursor: Cursor returned with the previous page
+            page: Page number used when no cursor is given
+            descending: Whether to sort in descending order
+            count: Total count mode: exact, estimate or none
+
+        Returns:
+            Tuple of (entities list, total count or None, next page cursor,
+            whether more entities follow)
+
+        """
+        query = select(model)
+        if filters:
+            query = query.where(and_(*filters))
+
+        total = await count_rows(
+            self.db, query, mode=count, table_name=model.__tablename__
+        )
+        entities, next_cursor, has_more = await paginate_keyset(
+            self.db,
+            query,
+            sort_column if sort_column is not None else model.id,
+            model.id,
+            size=size,
+            cursor=cursor,
+            page=page,
+            descending=descending,
+        )
+        return entities, total, next_cursor, has_more
+
+    def _search_filter(
+        self, model: Type[ModelType], search_fields: List[str], search_term: str
+    ) -> Any:
+        """Build a case-insensitive match of search_term on any of search_fields.
+
+        Non-text columns (e.g. JSON tags) are cast to text before matching.
+        Substring matches on large text columns are served by pg_trgm GIN
+        indexes.
+
+        Args:
+            model: SQLAlchemy model class
+            search_fields: List of field names to search in
+            search_term: Term to search for
+
+        Returns:
+            OR-combined filter condition
+
+        """
+        search_pattern = f"%{search_term}%"
+        conditions = []
+        for field_name in search_fields:
+            field = getattr(model, field_name)
+            if not isinstance(field.type, String):
+                field = cast(field, String)
+            conditions.append(field.ilike(search_pattern))
+        return or_(*conditions)
+
     async def _search_entities(
         self,
         model: Type[ModelType],
@@ -299,19 +374,8 @@ class BaseService:
             Tuple of (entities list, total count)
 
         """
-        search_conditions = []
-        search_pattern = f"%{search_term}%"
-
-        # Build search conditions
-        for field_name in search_fields:
-            field = getattr(model, field_name)
-            search_conditions.append(field.ilike(search_pattern))
-
-        # Combine with OR for search conditions
-        search_filter = or_(*search_conditions)
-
         # Combine with additional filters using AND
-        filters = [search_filter]
+        filters = [self._search_filter(model, search_fields, search_term)]
         if additional_filters:
             filters.extend(additional_filters)
 
@@ -0,0 +1,469 @@
+"""Set-based bulk deletion of documents, conversations and prompts.
+
+Rows are deleted in batched transactions, each a single
+``DELETE ... WHERE id IN (...) RETURNING`` statement. Document chunks and
+conversation messages are removed by the database's ON DELETE CASCADE rather
+than loaded into the session. Uploaded files of deleted documents are handed
+to a background reaper, so neither requests nor delete batches wait on disk
+I/O. Long-running deletions run as tracked operations whose progress can be
+polled by operation id. Progress is persisted in the bulk_operations table
+after every batch, so any worker can report it, also after a restart.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.exceptions import ValidationError
+from app.models.bulk_operation import BulkOperation
+from app.models.conversation import Conversation
+from app.models.document import Document
+from app.models.prompt import Prompt
+from app.services.background_processor import TaskStatus
+from app.utils.timestamp import utcnow
+
+logger = logging.getLogger(__name__)
+
+# Bulk delete target -> model
+BULK_DELETE_TARGETS = {
+    "documents": Document,
+    "conversations": Conversation,
+    "prompts": Prompt,
+}
+
+# Finished operations kept in memory for status queries
+_MAX_FINISHED_OPERATIONS = 100
+
+# Finished operations are removed from the database after this long
+_FINISHED_OPERATION_RETENTION = timedelta(days=7)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to delete file {path}: {e}")
+
+
+class FileReaper:
+    """Removes files of deleted documents in the background."""
+
+    def __init__(self):
+        """Initialize the reaper; the worker starts on first use."""
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker_task: Optional[asyncio.Task] = None
+
+    def submit(self, paths: Iterable[Optional[str]]) -> None:
+        """Queue files for removal; empty paths are ignored."""
+        for path in paths:
+            if path:
+                self._queue.put_nowait(path)
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = asyncio.create_task(self._worker_loop())
+
+    async def _worker_loop(self):
+        while True:
+            path = await self._queue.get()
+            try:
+                await asyncio.to_thread(_remove_file, path)
+            finally:
+                self._queue.task_done()
+
+    async def stop(self, timeout: float = 30.0):
+        """Finish removing queued files, then stop the worker."""
+        if self._worker_task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"File reaper stopped with {self._queue.qsize()} files pending"
+            )
+        self._worker_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._worker_task
+        self._worker_task = None
+
+
+async def delete_documents_where(
+    session: AsyncSession,
+    filters: Sequence[Any],
+    reaper: "FileReaper",
+    batch_size: Optional[int] = None,
+) -> Tuple[int, int]:
+    """Delete all documents matching filters in batched transactions.
+
+    Args:
+        session: Database session
+        filters: Conditions selecting the documents to delete
+        reaper: Reaper that removes the deleted documents' files
+        batch_size: Documents deleted per transaction
+
+    Returns:
+        Tuple of (deleted count, total size in bytes of the deleted files)
+
+    """
+    batch_size = batch_size or settings.bulk_delete_batch_size
+    deleted_count = 0
+    deleted_size = 0
+    while True:
+        batch = select(Document.id).where(*filters).limit(batch_size)
+        result = await session.execute(
+            delete(Document)
+            .where(Document.id.in_(batch.scalar_subquery()))
+            .returning(Document.file_path, Document.file_size)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+        await session.commit()
+        if not rows:
+            return deleted_count, deleted_size
+        deleted_count += len(rows)
+        deleted_size += sum(row.file_size or 0 for row in rows)
+        reaper.submit(row.file_path for row in rows)
+
+
+class BulkDeleteOperation:
+    """Progress of a bulk delete running in the background."""
+
+    def __init__(self, operation_id: str, target: str, ids: List[int], invalid_ids: List[str]):
+        """Initialize an operation.
+
+        Args:
+            operation_id: Unique identifier for the operation
+            target: Entity type being deleted (see BULK_DELETE_TARGETS)
+            ids: IDs to delete
+            invalid_ids: Requested IDs that could not be parsed
+
+        """
+        self.operation_id = operation_id
+        self.target = target
+        self.ids = ids
+        self.id_count = len(ids)
+        self.requested_count = len(ids) + len(invalid_ids)
+        self.processed_count = 0
+        self.deleted_ids: List[str] = []
+        self.failed_ids: List[str] = list(invalid_ids)
+        self.status = TaskStatus.QUEUED
+        self.created_at = utcnow()
+        self.started_at = None
+        self.completed_at = None
+        self.error_message: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: BulkOperation) -> "BulkDeleteOperation":
+        """Rebuild an operation's status from its database row."""
+        operation = cls(row.operation_id, row.target, [], [])
+        operation.id_count = row.id_count
+        operation.requested_count = row.requested_count
+        operation.processed_count = row.processed_count
+        operation.deleted_ids = list(row.deleted_ids or [])
+        operation.failed_ids = list(row.failed_ids or [])
+        operation.status = TaskStatus(row.status)
+        operation.created_at = row.created_at
+        operation.started_at = row.started_at
+        operation.completed_at = row.completed_at
+        operation.error_message = row.error_message
+        return operation
+
+    @property
+    def progress(self) -> float:
+        """Fraction of requested IDs processed."""
+        if not self.id_count:
+            return 1.0
+        return self.processed_count / self.id_count
+
+    def row_values(self) -> Dict[str, Any]:
+        """Return the operation state as BulkOperation column values."""
+        return {
+            "operation_id": self.operation_id,
+            "target": self.target,
+            "status": self.status.value,
+            "requested_count": self.requested_count,
+            "id_count": self.id_count,
+            "processed_count": self.processed_count,
+            "deleted_ids": self.deleted_ids,
+            "failed_ids": self.failed_ids,
+            "started_at": self.started_at,
+            "completed_at": self.completed_at,
+            "error_message": self.error_message,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the operation state for API responses."""
+        return {
+            "operation_id": self.operation_id,
+            "target": self.target,
+            "status": self.status.value,
+            "progress": self.progress,
+            "requested_count": self.requested_count,
+            "deleted_count": len(self.deleted_ids),
+            "failed_count": len(self.failed_ids),
+            "deleted_ids": self.deleted_ids,
+            "failed_ids": self.failed_ids,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": (
+                self.completed_at.isoformat() if self.completed_at else None
+            ),
+            "error_message": self.error_message,
+        }
+
+
+class BulkDeleteManager:
+    """Runs and tracks bulk delete operations.
+
+    Each operation runs as an asyncio task with its own database session and
+    commits once per batch of ``bulk_delete_batch_size`` rows. Its status is
+    stored in the bulk_operations table when queued, after every batch and
+    when it finishes; operations started by this worker are also kept in
+    memory.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None):
+        """Initialize the manager.
+
+        Args:
+            batch_size: Rows deleted per transaction (defaults to settings)
+
+        """
+        self.batch_size = batch_size or settings.bulk_delete_batch_size
+        self.file_reaper = FileReaper()
+        self.operations: Dict[str, BulkDeleteOperation] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def start(self, target: str, ids: Sequence[str]) -> BulkDeleteOperation:
+        """Start deleting entities of a target type in the background.
+
+        Args:
+            target: Entity type (documents, conversations or prompts)
+            ids: IDs to delete; unparseable IDs are reported as failed
+
+        Returns:
+            BulkDeleteOperation: The queued operation
+
+        Raises:
+            ValidationError: If the target is unknown
+
+        """
+        if target not in BULK_DELETE_TARGETS:
+            raise ValidationError(
+                f"Invalid bulk delete target. Use: {', '.join(BULK_DELETE_TARGETS)}"
+            )
+
+        valid_ids: List[int] = []
+        invalid_ids: List[str] = []
+        for raw_id in dict.fromkeys(ids):
+            try:
+                valid_ids.append(int(raw_id))
+            except (TypeError, ValueError):
+                invalid_ids.append(str(raw_id))
+
+        self._prune_finished()
+        operation = BulkDeleteOperation(
+            str(uuid.uuid4()), target, valid_ids, invalid_ids
+        )
+        await self._insert_status(operation)
+        self.operations[operation.operation_id] = operation
+        self._tasks[operation.operation_id] = asyncio.create_task(
+            self._run(operation)
+        )
+        logger.info(
+            f"Bulk delete queued: {operation.operation_id}",
+            extra={"target": target, "requested_count": operation.requested_count},
+        )
+        return operation
+
+    async def get_operation(self, operation_id: str) -> Optional[BulkDeleteOperation]:
+        """Return an operation by id, or None if unknown or expired.
+
+        Operations started by another worker, or before a restart, are read
+        from the database.
+        """
+        operation = self.operations.get(operation_id)
+        if operation is not None:
+            return operation
+
+        from app.database import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as session:
+            row = (
+                await session.execute(
+                    select(BulkOperation).where(
+                        BulkOperation.operation_id == operation_id
+                    )
+                )
+            ).scalar_one_or_none()
+            await session.commit()
+        return BulkDeleteOperation.from_row(row) if row is not None else None
+
+    async def _insert_status(self, operation: BulkDeleteOperation):
+        """Store a new operation and drop expired finished ones."""
+        from app.database import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                delete(BulkOperation).where(
+                    BulkOperation.completed_at
+                    < utcnow() - _FINISHED_OPERATION_RETENTION
+                )
+            )
+            await session.execute(
+                insert(BulkOperation).values(**operation.row_values())
+            )
+            await session.commit()
+
+    @staticmethod
+    async def _save_status(session: AsyncSession, operation: BulkDeleteOperation):
+        """Update an operation's stored status in its own transaction."""
+        await session.execute(
+            update(BulkOperation)
+            .where(BulkOperation.operation_id == operation.operation_id)
+            .values(**operation.row_values())
+        )
+        await session.commit()
+
+    def _prune_finished(self):
+        finished = [
+            op
+            for op in self.operations.values()
+            if op.operation_id not in self._tasks
+        ]
+        excess = len(finished) - _MAX_FINISHED_OPERATIONS + 1
+        for op in sorted(finished, key=lambda op: op.created_at)[: max(excess, 0)]:
+            del self.operations[op.operation_id]
+
+    async def _run(self, operation: BulkDeleteOperation):
+        from app.database import AsyncSessionLocal
+
+        operation.status = TaskStatus.PROCESSING
+        operation.started_at = utcnow()
+        try:
+            async with AsyncSessionLocal() as session:
+                await self._save_status(session, operation)
+                for start in range(0, len(operation.ids), self.batch_size):
+                    batch = operation.ids[start : start + self.batch_size]
+                    deleted = await self._delete_batch(
+                        session, operation.target, batch
+                    )
+                    deleted_set = set(deleted)
+                    operation.deleted_ids.extend(str(i) for i in deleted)
+                    operation.failed_ids.extend(
+                        str(i) for i in batch if i not in deleted_set
+                    )
+                    operation.processed_count += len(batch)
+                    await self._save_status(session, operation)
+            operation.status = TaskStatus.COMPLETED
+        except asyncio.CancelledError:
+            operation.status = TaskStatus.CANCELLED
+            raise
+        except Exception as e:
+            operation.status = TaskStatus.FAILED
+            operation.error_message = str(e)
+            logger.error(
+                f"Bulk delete failed: {operation.operation_id}: {e}", exc_info=True
+            )
+        finally:
+            operation.completed_at = utcnow()
+            self._tasks.pop(operation.operation_id, None)
+            try:
+                async with AsyncSessionLocal() as session:
+                    await self._save_status(session, operation)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to store bulk delete status: {operation.operation_id}: {e}"
+                )
+            logger.info(
+                f"Bulk delete finished: {operation.operation_id}",
+                extra={
+                    "target": operation.target,
+                    "status": operation.status.value,
+                    "deleted_count": len(operation.deleted_ids),
+                    "failed_count": len(operation.failed_ids),
+                },
+            )
+
+    async def _delete_batch(
+        self, session: AsyncSession, target: str, ids: List[int]
+    ) -> List[int]:
+        """Delete one batch in a single transaction; return the deleted ids."""
+        model = BULK_DELETE_TARGETS[target]
+        returning = [model.id]
+        if model is Document:
+            returning.append(Document.file_path)
+        elif model is Prompt:
+            returning.append(Prompt.is_default)
+
+        result = await session.execute(
+            delete(model)
+            .where(model.id.in_(ids))
+            .returning(*returning)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+        await session.commit()
+
+        if model is Document:
+            self.file_reaper.submit(row.file_path for row in rows)
+        elif model is Prompt and any(row.is_default for row in rows):
+            from app.services.prompt_service import PromptService
+
+            await PromptService(session).ensure_default_prompt()
+
+        return [row.id for row in rows]
+
+    async def stop(self, timeout: float = 30.0):
+        """Let running operations finish, then drain the file reaper.
+
+        Operations still running after timeout seconds are cancelled; their
+        stored status records how far they got.
+        """
+        tasks = list(self._tasks.values())
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            if pending:
+                logger.warning(f"Cancelling {len(pending)} unfinished bulk deletes")
+            for task in pending:
+                task.cancel()
+            for task in pending:
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        await self.file_reaper.stop()
+
+
+# Global bulk delete manager instance
+_bulk_delete_manager: Optional[BulkDeleteManager] = None
+
+
+def get_bulk_delete_manager() -> BulkDeleteManager:
+    """Get the global bulk delete manager instance."""
+    global _bulk_delete_manager
+
+    if _bulk_delete_manager is None:
+        _bulk_delete_manager = BulkDeleteManager()
+
+    return _bulk_delete_manager
+
+
+def get_file_reaper() -> FileReaper:
+    """Get the file reaper shared by all document deletions."""
+    return get_bulk_delete_manager().file_reaper
+
+
+async def shutdown_bulk_delete_manager():
+    """Shutdown the global bulk delete manager."""
+    global _bulk_delete_manager
+
+    if _bulk_delete_manager is not None:
+        await _bulk_delete_manager.stop()
+        _bulk_delete_manager = None
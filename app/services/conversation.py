@@ -5,26 +5,36 @@ session creation, message handling, AI model integration, and RAG (Retrieval
 Augmented Generation) capabilities with embedding services and tool calling.
 """
 
+import asyncio
 import logging
-from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, desc, func, select
+from sqlalchemy import and_, desc, func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.tracing import span, traced_stream
 from app.models.conversation import Conversation, Message
 from app.services.base import BaseService
 from app.services.embedding import EmbeddingService
+from app.services.llm_metrics import timing_metainfo
 from app.services.mcp_service import MCPService
 from app.services.openai_client import OpenAIClient
 from app.services.profile_service import LLMProfileService
 from app.services.prompt_service import PromptService
 from app.services.search import SearchService
+from app.utils.json_stream import JSONStreamReader
+from app.utils.pagination import count_rows
+from app.utils.timestamp import utcnow
 from shared.schemas.conversation import (
     ChatRequest,
     ConversationCreate,
     ConversationResponse,
     ConversationUpdate,
+    ImportConversationResult,
     MessageResponse,
 )
 from shared.schemas.document import DocumentSearchRequest
@@ -57,6 +67,8 @@ class ConversationService(BaseService):
         self.llm_profile_service = LLMProfileService(db)
         self.mcp_service = MCPService(db)
         self.openai_client = OpenAIClient(self.mcp_service)
+        # Prompt of the stream in progress, for usage estimates
+        self._stream_prompt: Optional[List[Dict[str, Any]]] = None
 
     async def create_conversation(
         self, request: ConversationCreate, user_id: int
@@ -121,44 +133,46 @@ class ConversationService(BaseService):
         return conversation
 
     async def list_conversations(
-        self, user_id: int, page: int = 1, size: int = 20, active_only: bool = True
-    ) -> Tuple[List[Conversation], int]:
-        """List conversations for a user with pagination.
+        self,
+        user_id: int,
+        page: int = 1,
+        size: int = 20,
+        active_only: bool = True,
+        cursor: Optional[str] = None,
+        count: str = "exact",
+    ) -> Tuple[List[Conversation], Optional[int], Optional[str], bool]:
+        """List conversations for a user, most recently updated first.
 
         Args:
             user_id: User ID
-            page: Page number (1-based)
+            page: Page number (1-based), used when no cursor is given
             size: Items per page
             active_only: Filter to active conversations only
+            cursor: Cursor returned with the previous page
+            count: Total count mode: exact, estimate or none
 
         Returns:
-            Tuple[List[Conversation], int]: List of conversations and total count
+            Tuple[List[Conversation], Optional[int], Optional[str], bool]:
+                Conversations, total count, cursor for the next page and
+                whether more conversations follow
 
         """
         # Build filters
         filters = [Conversation.user_id == user_id]
         if active_only:
-            filters.append(Conversation.is_active is True)
-
-        # Count total conversations
-        count_query = select(func.count(Conversation.id)).where(and_(*filters))
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Get conversations with pagination
-        query = (
-            select(Conversation)
-            .where(and_(*filters))
-            .order_by(desc(Conversation.updated_at))
-            .offset((page - 1) * size)
-            .limit(size)
+            filters.append(Conversation.is_active.is_(True))
+
+        return await self._list_with_keyset(
+            model=Conversation,
+            filters=filters,
+            sort_column=Conversation.updated_at,
+            size=size,
+            cursor=cursor,
+            page=page,
+            descending=True,
+            count=count,
         )
 
-        result = await self.db.execute(query)
-        conversations = result.scalars().all()
-
-        return list(conversations), total
-
     async def update_conversation(
         self, conversation_id: int, request: ConversationUpdate, user_id: int
     ) -> Conversation:
@@ -209,43 +223,269 @@ class ConversationService(BaseService):
         return True
 
     async def get_messages(
-        self, conversation_id: int, user_id: int, page: int = 1, size: int = 50
-    ) -> Tuple[List[Message], int]:
-        """Get messages in a conversation.
+        self,
+        conversation_id: int,
+        user_id: int,
+        page: int = 1,
+        size: int = 50,
+        cursor: Optional[str] = None,
+        count: str = "exact",
+    ) -> Tuple[List[Message], Optional[int], Optional[str], bool]:
+        """Get messages in a conversation, oldest first.
 
         Args:
             conversation_id: Conversation ID
             user_id: User ID for access control
-            page: Page number (1-based)
+            page: Page number (1-based), used when no cursor is given
             size: Items per page
+            cursor: Cursor returned with the previous page
+            count: Total count mode: exact, estimate or none
 
         Returns:
-            Tuple[List[Message], int]: List of messages and total count
+            Tuple[List[Message], Optional[int], Optional[str], bool]: Messages,
+                total count, cursor for the next page and whether more
+                messages follow
 
         """
         # Verify conversation access
-        await self.get_conversation(conversation_id, user_id)
+        conversation = await self.get_conversation(conversation_id, user_id)
 
-        # Count total messages
-        count_query = select(func.count(Message.id)).where(
-            Message.conversation_id == conversation_id
+        messages, _, next_cursor, has_more = await self._list_with_keyset(
+            model=Message,
+            filters=[Message.conversation_id == conversation_id],
+            sort_column=Message.created_at,
+            size=size,
+            cursor=cursor,
+            page=page,
+            count="none",
         )
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
 
-        # Get messages with pagination
-        query = (
-            select(Message)
-            .where(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at)
-            .offset((page - 1) * size)
-            .limit(size)
+        # The conversation keeps a running message count, so an exact total
+        # only needs COUNT(*) when explicitly requested
+        if count == "none":
+            total = None
+        elif count == "estimate":
+            total = conversation.message_count
+        else:
+            total = await count_rows(
+                self.db,
+                select(Message).where(Message.conversation_id == conversation_id),
+            )
+
+        return messages, total, next_cursor, has_more
+
+    async def import_conversations(
+        self,
+        reader: JSONStreamReader,
+        user_id: int,
+        title: Optional[str] = None,
+        json_lines: bool = False,
+        single: bool = False,
+    ) -> List[ImportConversationResult]:
+        """Import conversations from a streamed JSON upload.
+
+        Accepted layouts are a single export ({"conversation": {...},
+        "messages": [...]}), an archive ({"conversations": [<export>, ...]} or
+        a top-level list of exports) and JSON Lines with one export per line.
+        Messages of a single export are parsed one at a time, and archive
+        entries one conversation at a time. Conversation metadata must precede
+        the messages to be applied. Each conversation is committed separately,
+        so if the file turns out to be malformed after some conversations were
+        committed, those results are returned followed by an entry describing
+        the parse error.
+
+        Args:
+            reader: Reader over the uploaded file
+            user_id: User ID who will own the imported conversations
+            title: Optional title overriding the imported ones
+            json_lines: Whether the upload is JSON Lines
+            single: Reject uploads holding more than one conversation; an
+                archive is checked before anything is written
+
+        Returns:
+            List[ImportConversationResult]: One result per conversation
+
+        Raises:
+            ValidationError: If the file is not valid JSON before any
+                conversation was imported, has no conversations, or holds
+                several conversations when single is set
+
+        """
+        results: List[ImportConversationResult] = []
+        try:
+            if json_lines:
+                await self._import_entries(
+                    reader.iter_values(), user_id, title, single, results
+                )
+                return results
+
+            first = await reader.peek()
+            if first == "[":
+                await self._import_entries(
+                    reader.iter_array(), user_id, title, single, results
+                )
+                return results
+            if first != "{":
+                raise ValidationError("Import file must contain a JSON object or array")
+
+            metadata: Dict[str, Any] = {}
+            async for key in reader.iter_object():
+                if key in ("messages", "conversations") and single and results:
+                    raise ValidationError(_SINGLE_IMPORT_ERROR)
+                if key == "conversation":
+                    metadata = await reader.read_value()
+                    if not isinstance(metadata, dict):
+                        metadata = {}
+                elif key == "messages":
+                    results.append(
+                        await self._import_messages(
+                            metadata, reader.iter_array(), user_id, title
+                        )
+                    )
+                elif key == "conversations":
+                    await self._import_entries(
+                        reader.iter_array(), user_id, title, single, results
+                    )
+                else:
+                    await reader.read_value()
+        except (ValueError, UnicodeDecodeError) as e:
+            await self.db.rollback()
+            if not results:
+                raise ValidationError(f"Invalid JSON format: {e}")
+            # Earlier conversations are already committed; report them so a
+            # retry does not import them twice
+            results.append(
+                ImportConversationResult(
+                    conversation_id="",
+                    conversation_title="",
+                    imported_messages=0,
+                    total_messages=0,
+                    errors=[f"Invalid JSON format: {e}"],
+                )
+            )
+            return results
+
+        if not results:
+            raise ValidationError("Invalid conversation format: missing 'messages' field")
+        return results
+
+    async def _import_entries(
+        self,
+        entries: AsyncIterator[Any],
+        user_id: int,
+        title: Optional[str],
+        single: bool,
+        results: List[ImportConversationResult],
+    ) -> None:
+        """Import archive entries one at a time, appending each result."""
+        if not single:
+            async for entry in entries:
+                results.append(await self._import_entry(entry, user_id, title))
+            return
+
+        # Read to the end first so a second conversation is rejected before
+        # the first one is written
+        pending: List[Any] = []
+        async for entry in entries:
+            if pending:
+                raise ValidationError(_SINGLE_IMPORT_ERROR)
+            pending.append(entry)
+        for entry in pending:
+            results.append(await self._import_entry(entry, user_id, title))
+
+    async def _import_entry(
+        self, entry: Any, user_id: int, title: Optional[str]
+    ) -> ImportConversationResult:
+        """Import one fully decoded archive entry, recording failures in the result."""
+        metadata = entry.get("conversation") if isinstance(entry, dict) else None
+        metadata = metadata if isinstance(metadata, dict) else {}
+        messages = entry.get("messages") if isinstance(entry, dict) else None
+        try:
+            if not isinstance(messages, list):
+                raise ValidationError("Invalid conversation format: missing 'messages' field")
+            return await self._import_messages(
+                metadata, _iterate(messages), user_id, title
+            )
+        except (ValidationError, SQLAlchemyError) as e:
+            if isinstance(e, SQLAlchemyError):
+                await self.db.rollback()
+                logger.warning(f"Failed to import archived conversation: {e}")
+                error = f"Database error: {e.__class__.__name__}"
+            else:
+                error = e.message
+            return ImportConversationResult(
+                conversation_id="",
+                conversation_title=title or str(metadata.get("title", "")),
+                imported_messages=0,
+                total_messages=len(messages) if isinstance(messages, list) else 0,
+                errors=[error],
+            )
+
+    async def _import_messages(
+        self,
+        metadata: Dict[str, Any],
+        messages: AsyncIterator[Any],
+        user_id: int,
+        title: Optional[str],
+    ) -> ImportConversationResult:
+        """Create a conversation and bulk insert its messages in batches."""
+        conv_title = (
+            title
+            or metadata.get("title")
+            or f"Imported conversation {utcnow().strftime('%Y-%m-%d %H:%M')}"
+        )
+        conversation = Conversation(
+            title=str(conv_title)[:500],
+            user_id=user_id,
+            is_active=True,
+            message_count=0,
+            metainfo=metadata.get("metainfo"),
+        )
+        self.db.add(conversation)
+        await self.db.flush()
+
+        imported = 0
+        total = 0
+        errors: List[str] = []
+        batch: List[Dict[str, Any]] = []
+        async for msg_data in messages:
+            total += 1
+            row = _message_import_row(msg_data, conversation.id, errors)
+            if row is not None:
+                batch.append(row)
+            if len(batch) >= settings.import_batch_size:
+                imported += await self._insert_message_batch(batch)
+                batch = []
+        if batch:
+            imported += await self._insert_message_batch(batch)
+
+        if total == 0:
+            await self.db.rollback()
+            raise ValidationError("No messages found in import file")
+
+        conversation.message_count = imported
+        await self.db.commit()
+        logger.info(
+            f"Imported conversation {conversation.id} with {imported}/{total} messages"
         )
 
-        result = await self.db.execute(query)
-        messages = result.scalars().all()
+        return ImportConversationResult(
+            conversation_id=str(conversation.id),
+            conversation_title=conversation.title,
+            imported_messages=imported,
+            total_messages=total,
+            errors=errors,
+        )
 
-        return list(messages), total
+    async def _insert_message_batch(self, rows: List[Dict[str, Any]]) -> int:
+        """Count tokens off the event loop and insert rows in one executemany."""
+        token_counts = await asyncio.to_thread(
+            self.openai_client.count_tokens_batch, [row["content"] for row in rows]
+        )
+        for row, token_count in zip(rows, token_counts):
+            row["token_count"] = token_count
+        await self.db.execute(insert(Message), rows)
+        return len(rows)
 
     async def process_chat(self, request: ChatRequest, user_id: int) -> Dict[str, Any]:
         """Process chat request and generate AI response.
@@ -283,13 +523,17 @@ class ConversationService(BaseService):
             self.db.add(user_message)
 
             # Get conversation history
-            history_messages = await self._get_conversation_history(conversation.id)
+            with span("chat.history", {"conversation.id": conversation.id}):
+                history_messages = await self._get_conversation_history(
+                    conversation.id
+                )
 
             # Prepare messages for AI
             ai_messages = []
 
             # Add system message if needed
-            system_prompt = await self._build_system_prompt(request)
+            with span("chat.prompt", {"prompt.name": request.prompt_name}):
+                system_prompt = await self._build_system_prompt(request)
             if system_prompt:
                 ai_messages.append({"role": "system", "content": system_prompt})
 
@@ -303,7 +547,8 @@ class ConversationService(BaseService):
             # Get RAG context if enabled
             rag_context = None
             if request.use_rag:
-                rag_context = await self._get_rag_context(request, user_id)
+                with span("chat.rag"):
+                    rag_context = await self._get_rag_context(request, user_id)
                 if rag_context:
                     # Add RAG context to system message
                     context_text = self._format_rag_context(rag_context)
@@ -368,9 +613,10 @@ class ConversationService(BaseService):
                 openai_params["use_tools"] = False
 
             # Get AI response with enhanced registry integration
-            ai_response = await self.openai_client.chat_completion(
-                messages=ai_messages, **openai_params
-            )
+            with span("chat.llm", {"llm.profile": getattr(llm_profile, "name", None)}):
+                ai_response = await self.openai_client.chat_completion(
+                    messages=ai_messages, **openai_params
+                )
 
             # Create AI message
             ai_message = Message(
@@ -378,19 +624,21 @@ class ConversationService(BaseService):
                 content=ai_response["content"],
                 conversation_id=conversation.id,
                 token_count=ai_response["usage"]["completion_tokens"],
+                metainfo=timing_metainfo(ai_response.get("timing")),
             )
             self.db.add(ai_message)
 
             # Update conversation
             conversation.message_count += 2  # User + AI message
 
-            await self.db.commit()
-            await self.db.refresh(user_message)
-            await self.db.refresh(ai_message)
+            with span("chat.persist"):
+                await self.db.commit()
+                await self.db.refresh(user_message)
+                await self.db.refresh(ai_message)
 
-            # Re-fetch conversation to ensure it's persistent
-            conversation = await self.get_conversation(conversation.id, user_id)
-            await self.db.refresh(conversation)
+                # Re-fetch conversation to ensure it's persistent
+                conversation = await self.get_conversation(conversation.id, user_id)
+                await self.db.refresh(conversation)
 
             logger.info(f"Chat processed for conversation {conversation.id}")
 
@@ -452,16 +700,22 @@ class ConversationService(BaseService):
                 token_count=self.openai_client.count_tokens(request.user_message),
             )
             self.db.add(user_message)
-            await self.db.flush()  # Save user message immediately
+            conversation.message_count += 1
+            # Persist the user message in its own short transaction
+            await self.db.commit()
 
             # Get conversation history
-            history_messages = await self._get_conversation_history(conversation.id)
+            with span("chat.history", {"conversation.id": conversation.id}):
+                history_messages = await self._get_conversation_history(
+                    conversation.id
+                )
 
             # Prepare messages for AI
             ai_messages = []
 
             # Add system message if needed
-            system_prompt = await self._build_system_prompt(request)
+            with span("chat.prompt", {"prompt.name": request.prompt_name}):
+                system_prompt = await self._build_system_prompt(request)
             if system_prompt:
                 ai_messages.append({"role": "system", "content": system_prompt})
 
@@ -475,7 +729,8 @@ class ConversationService(BaseService):
             # Get RAG context if enabled
             rag_context = None
             if request.use_rag:
-                rag_context = await self._get_rag_context(request, user_id)
+                with span("chat.rag"):
+                    rag_context = await self._get_rag_context(request, user_id)
                 if rag_context:
                     # Add RAG context to system message
                     context_text = self._format_rag_context(rag_context)
@@ -536,17 +791,38 @@ class ConversationService(BaseService):
             else:
                 openai_params["use_tools"] = False
 
+            # Load tools up front so nothing touches the database before the
+            # first token arrives
+            if openai_params["use_tools"]:
+                try:
+                    openai_params["tools"] = await self.mcp_service.get_openai_tools()
+                except Exception as e:
+                    logger.warning(f"Failed to load MCP tools: {e}")
+                    openai_params["tools"] = []
+
+            # End the read transaction so no pooled connection is held while
+            # the LLM streams; tool executions use their own short transactions
+            await self.db.commit()
+
             # Stream AI response
-            full_content = ""
+            content_parts: List[str] = []
             tool_calls_executed = []
-
-            async for chunk in self.openai_client.chat_completion_stream(
-                messages=ai_messages, **openai_params
+            usage = None
+            timing = None
+            self._stream_prompt = ai_messages
+
+            # The span must not stay current across this generator's yields
+            async for chunk in traced_stream(
+                "chat.llm",
+                self.openai_client.chat_completion_stream(
+                    messages=ai_messages, **openai_params
+                ),
+                {"llm.profile": getattr(llm_profile, "name", None)},
             ):
                 chunk_type = chunk.get("type")
                 if chunk_type == "content":
                     content = chunk.get("content", "")
-                    full_content += content
+                    content_parts.append(content)
                     yield {"type": "content", "content": content}
                 elif chunk_type == "tool_call":
                     yield {
@@ -554,44 +830,58 @@ class ConversationService(BaseService):
                         "tool": chunk.get("tool"),
                         "result": chunk.get("result"),
                     }
-                    tool_calls_executed.append(chunk)
+                    if chunk.get("result"):
+                        tool_calls_executed.append(chunk["result"])
+                elif chunk_type in ("tool_start", "tool_progress"):
+                    yield chunk
+                elif chunk_type == "usage":
+                    usage = chunk.get("usage")
+                elif chunk_type == "timing":
+                    timing = chunk.get("timing")
 
             # Create AI message with complete content
+            full_content = "".join(content_parts)
+
+            # Report token usage for quota accounting, estimated locally if
+            # the provider did not return it
+            if usage is None:
+                usage = self._estimate_usage(ai_messages, full_content)
+            yield {"type": "usage", "usage": usage}
             ai_message = Message(
                 role="assistant",
                 content=full_content,
                 conversation_id=conversation.id,
                 token_count=self.openai_client.count_tokens(full_content),
+                metainfo=timing_metainfo(timing),
             )
             self.db.add(ai_message)
-
-            # Update conversation
-            conversation.message_count += 2  # User + AI message
-
+            conversation.message_count += 1
+
+            # Persist the AI message in a fresh short transaction
+            with span("chat.persist"):
+                await self.db.commit()
+                await self.db.refresh(ai_message)
+                await self.db.refresh(conversation)
+            response = {
+                "ai_message": MessageResponse.model_validate(ai_message),
+                "conversation": ConversationResponse.model_validate(conversation),
+                "rag_context": rag_context,
+                "tool_call_summary": None,
+            }
+            # Release the connection before handing the result to the client
             await self.db.commit()
-            await self.db.refresh(ai_message)
-
-            # Re-fetch conversation to ensure it's persistent
-            conversation = await self.get_conversation(conversation.id, user_id)
-            await self.db.refresh(conversation)
 
             # Create tool call summary if tools were executed
-            tool_call_summary = None
             if tool_calls_executed:
-                tool_call_summary = self._create_tool_call_summary(tool_calls_executed)
+                response["tool_call_summary"] = self._create_tool_call_summary(
+                    tool_calls_executed
+                )
 
             # Send completion event
-            yield {
-                "type": "complete",
-                "response": {
-                    "ai_message": MessageResponse.model_validate(ai_message),
-                    "conversation": ConversationResponse.model_validate(conversation),
-                    "rag_context": rag_context,
-                    "tool_call_summary": tool_call_summary,
-                },
-            }
+            yield {"type": "complete", "response": response}
         except Exception as e:
             logger.error(f"Streaming chat processing failed: {e}")
+            await self.db.rollback()
 
             yield {"type": "error", "error": str(e)}
 
@@ -704,6 +994,34 @@ class ConversationService(BaseService):
 
         return "\n".join(formatted_parts)
 
+    def _estimate_usage(
+        self, messages: List[Dict[str, Any]], completion: str
+    ) -> Dict[str, int]:
+        """Estimate token usage locally when the provider did not report it."""
+        return {
+            "prompt_tokens": sum(
+                self.openai_client.count_tokens(m["content"])
+                for m in messages
+                if isinstance(m.get("content"), str)
+            ),
+            "completion_tokens": self.openai_client.count_tokens(completion),
+        }
+
+    def estimate_stream_usage(self, completion: str) -> Optional[Dict[str, int]]:
+        """Estimate the usage of a stream that ended before reporting it.
+
+        Args:
+            completion: Content streamed to the client so far
+
+        Returns:
+            Optional[dict]: Estimated usage, or None if the stream never
+                reached the LLM
+
+        """
+        if self._stream_prompt is None:
+            return None
+        return self._estimate_usage(self._stream_prompt, completion)
+
     def _create_tool_call_summary(
         self, tool_calls_executed: List[Dict[str, Any]]
     ) -> ToolCallSummary:
@@ -847,3 +1165,58 @@ class ConversationService(BaseService):
         except Exception as e:
             logger.error(f"Failed to get registry stats: {e}")
             return {}
+
+
+# Number of per-message import errors reported back to the caller
+_MAX_IMPORT_ERRORS = 5
+
+
+# Error for multi-conversation uploads sent to the single import endpoint
+_SINGLE_IMPORT_ERROR = (
+    "Import file contains more than one conversation; "
+    "use /conversations/import/batch for archives"
+)
+
+
+async def _iterate(items: List[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+def _message_import_row(
+    msg_data: Any, conversation_id: int, errors: List[str]
+) -> Optional[Dict[str, Any]]:
+    """Validate an imported message and convert it to an insert row."""
+    error = None
+    if not isinstance(msg_data, dict):
+        error = "Message is not a JSON object"
+    else:
+        missing_field = next(
+            (field for field in ("role", "content") if field not in msg_data), None
+        )
+        if missing_field:
+            error = f"Message missing required field: {missing_field}"
+    if error:
+        if len(errors) < _MAX_IMPORT_ERRORS:
+            errors.append(error)
+        return None
+
+    # Keep original timestamps so imported histories stay in order
+    created_at = utcnow()
+    if msg_data.get("created_at"):
+        try:
+            created_at = datetime.fromisoformat(str(msg_data["created_at"]))
+            if created_at.tzinfo is not None:
+                created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        except ValueError:
+            created_at = utcnow()
+
+    return {
+        "conversation_id": conversation_id,
+        "role": str(msg_data["role"])[:20],
+        "content": str(msg_data["content"] or ""),
+        "tool_calls": msg_data.get("tool_calls"),
+        "metainfo": msg_data.get("metainfo"),
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
@@ -0,0 +1,314 @@
+"""Streaming conversation export.
+
+Formats conversations and their messages as JSON, NDJSON, CSV or plain text
+incrementally. Messages are read through a server-side cursor and emitted in
+chunks, so export memory use stays flat regardless of conversation size.
+"""
+
+import csv
+import io
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationError
+from app.models.conversation import Conversation, Message
+
+# Export format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "txt": ("text/plain", "txt"),
+}
+
+# Flush output once this many characters are buffered
+_CHUNK_SIZE = 64 * 1024
+
+# Messages fetched per server-side cursor round trip
+_YIELD_PER = 500
+
+
+def conversation_metadata(conversation: Conversation) -> Dict[str, Any]:
+    """Return export metadata for a conversation."""
+    return {
+        "id": str(conversation.id),
+        "title": conversation.title,
+        "created_at": conversation.created_at.isoformat(),
+        "updated_at": (
+            conversation.updated_at.isoformat() if conversation.updated_at else None
+        ),
+        "is_active": conversation.is_active,
+        "message_count": conversation.message_count,
+    }
+
+
+def exported_message(message: Message) -> Dict[str, Any]:
+    """Return the export record for a message."""
+    return {
+        "id": str(message.id),
+        "role": message.role,
+        "content": message.content,
+        "created_at": message.created_at.isoformat(),
+        "tool_calls": message.tool_calls,
+    }
+
+
+class _ExportWriter:
+    """Base writer; each hook returns the text to append to the output."""
+
+    def __init__(self, include_metadata: bool, bulk: bool):
+        self.include_metadata = include_metadata
+        self.bulk = bulk
+
+    def begin(self) -> str:
+        return ""
+
+    def start_conversation(self, conversation: Conversation) -> str:
+        return ""
+
+    def message(self, conversation: Conversation, message: Message) -> str:
+        return ""
+
+    def end_conversation(self, conversation: Conversation) -> str:
+        return ""
+
+    def end(self) -> str:
+        return ""
+
+
+class _JSONWriter(_ExportWriter):
+    """Import-compatible JSON: one export object, or {"conversations": [...]}."""
+
+    def begin(self) -> str:
+        self._first_conversation = True
+        return '{"conversations": [' if self.bulk else ""
+
+    def start_conversation(self, conversation: Conversation) -> str:
+        self._first_message = True
+        prefix = "" if self._first_conversation else ", "
+        self._first_conversation = False
+        if not self.include_metadata:
+            return prefix + '{"messages": ['
+        metadata = json.dumps(conversation_metadata(conversation))
+        return f'{prefix}{{"conversation": {metadata}, "messages": ['
+
+    def message(self, conversation: Conversation, message: Message) -> str:
+        prefix = "" if self._first_message else ", "
+        self._first_message = False
+        return prefix + json.dumps(exported_message(message))
+
+    def end_conversation(self, conversation: Conversation) -> str:
+        return "]}"
+
+    def end(self) -> str:
+        return "]}" if self.bulk else ""
+
+
+class _NDJSONWriter(_ExportWriter):
+    """One JSON object per message, tagged with its conversation."""
+
+    def message(self, conversation: Conversation, message: Message) -> str:
+        record = exported_message(message)
+        record["conversation_id"] = str(conversation.id)
+        if self.include_metadata:
+            record["conversation_title"] = conversation.title
+        return json.dumps(record) + "\n"
+
+
+class _CSVWriter(_ExportWriter):
+    """RFC 4180 CSV with one row per message."""
+
+    def __init__(self, include_metadata: bool, bulk: bool):
+        super().__init__(include_metadata, bulk)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _row(self, values: Sequence[Any]) -> str:
+        self._writer.writerow(values)
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+    def begin(self) -> str:
+        header = ["timestamp", "role", "content", "tool_calls"]
+        if self.include_metadata or self.bulk:
+            header = ["conversation_id", "conversation_title"] + header
+        return self._row(header)
+
+    def message(self, conversation: Conversation, message: Message) -> str:
+        values = [
+            message.created_at.isoformat(),
+            message.role,
+            message.content or "",
+            json.dumps(message.tool_calls) if message.tool_calls else "",
+        ]
+        if self.include_metadata or self.bulk:
+            values = [conversation.id, conversation.title] + values
+        return self._row(values)
+
+
+class _TextWriter(_ExportWriter):
+    """Human-readable transcript."""
+
+    def start_conversation(self, conversation: Conversation) -> str:
+        if not self.include_metadata:
+            return ""
+        return (
+            f"Conversation: {conversation.title}\n"
+            f"Created: {conversation.created_at.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"Messages: {conversation.message_count}\n"
+            f"{'-' * 50}\n\n"
+        )
+
+    def message(self, conversation: Conversation, message: Message) -> str:
+        timestamp = message.created_at.strftime("%Y-%m-%d %H:%M:%S")
+        return f"[{timestamp}] {message.role.upper()}: {message.content}\n\n"
+
+    def end_conversation(self, conversation: Conversation) -> str:
+        return "\n" if self.bulk else ""
+
+
+_WRITERS = {
+    "json": _JSONWriter,
+    "ndjson": _NDJSONWriter,
+    "csv": _CSVWriter,
+    "txt": _TextWriter,
+}
+
+
+class ConversationExporter:
+    """Streams one or all of a user's conversations in an export format."""
+
+    def __init__(
+        self, format: str = "json", include_metadata: bool = True, compress: bool = False
+    ):
+        """Initialize exporter.
+
+        Args:
+            format: Export format: json, ndjson, csv or txt
+            include_metadata: Include conversation metadata in the output
+            compress: Gzip the output
+
+        Raises:
+            ValidationError: If the format is not supported
+
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValidationError(
+                f"Invalid export format. Use: {', '.join(EXPORT_FORMATS)}"
+            )
+        self.format = format
+        self.include_metadata = include_metadata
+        self.compress = compress
+
+    @property
+    def media_type(self) -> str:
+        """Media type of the produced stream."""
+        return "application/gzip" if self.compress else EXPORT_FORMATS[self.format][0]
+
+    def filename(self, stem: str) -> str:
+        """Return a download filename for the export."""
+        name = f"{stem}.{EXPORT_FORMATS[self.format][1]}"
+        return f"{name}.gz" if self.compress else name
+
+    def render(self, conversation: Conversation, messages: List[Message]) -> str:
+        """Render an already loaded conversation in one piece."""
+        writer = _WRITERS[self.format](self.include_metadata, bulk=False)
+        parts = [writer.begin(), writer.start_conversation(conversation)]
+        parts.extend(writer.message(conversation, message) for message in messages)
+        parts.extend([writer.end_conversation(conversation), writer.end()])
+        return "".join(parts)
+
+    async def stream(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        conversation_id: Optional[int] = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream the export of a user's conversations.
+
+        Conversations are read up front (metadata only); messages are read in
+        (conversation, created_at) order through a server-side cursor.
+
+        Args:
+            session: Database session owned by the caller for the stream's lifetime
+            user_id: Owner of the exported conversations
+            conversation_id: Export only this conversation; all when None
+
+        Yields:
+            bytes: Encoded (and optionally gzip-compressed) output chunks
+
+        """
+        chunks = self._stream_text(session, user_id, conversation_id)
+        if not self.compress:
+            async for chunk in chunks:
+                yield chunk.encode("utf-8")
+            return
+
+        compressor = zlib.compressobj(wbits=31)  # gzip container
+        async for chunk in chunks:
+            data = compressor.compress(chunk.encode("utf-8"))
+            if data:
+                yield data
+        yield compressor.flush()
+
+    async def _stream_text(
+        self, session: AsyncSession, user_id: int, conversation_id: Optional[int]
+    ) -> AsyncIterator[str]:
+        conversation_filter = [Conversation.user_id == user_id]
+        if conversation_id is not None:
+            conversation_filter.append(Conversation.id == conversation_id)
+
+        result = await session.execute(
+            select(Conversation).where(*conversation_filter).order_by(Conversation.id)
+        )
+        conversations = list(result.scalars().all())
+
+        writer = _WRITERS[self.format](
+            self.include_metadata, bulk=conversation_id is None
+        )
+        buffer: List[str] = [writer.begin()]
+        buffered = 0
+
+        messages = await session.stream_scalars(
+            select(Message)
+            .join(Conversation, Message.conversation_id == Conversation.id)
+            .where(*conversation_filter)
+            .order_by(Message.conversation_id, Message.created_at, Message.id)
+            .execution_options(yield_per=_YIELD_PER)
+        )
+
+        # Merge the ordered conversation list with the ordered message stream
+        # so conversations without messages are exported too
+        known_ids = {conversation.id for conversation in conversations}
+        remaining = iter(conversations)
+        current = None
+        async for message in messages:
+            if message.conversation_id not in known_ids:
+                # Conversation created after the metadata query
+                continue
+            while current is None or current.id != message.conversation_id:
+                if current is not None:
+                    buffer.append(writer.end_conversation(current))
+                current = next(remaining)
+                buffer.append(writer.start_conversation(current))
+            text = writer.message(current, message)
+            buffer.append(text)
+            buffered += len(text)
+            if buffered >= _CHUNK_SIZE:
+                yield "".join(buffer)
+                buffer.clear()
+                buffered = 0
+
+        if current is not None:
+            buffer.append(writer.end_conversation(current))
+        for conversation in remaining:
+            buffer.append(writer.start_conversation(conversation))
+            buffer.append(writer.end_conversation(conversation))
+        buffer.append(writer.end())
+        yield "".join(buffer)
@@ -13,14 +13,20 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import UploadFile
-from sqlalchemy import and_, select
+from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.core.exceptions import DocumentError, NotFoundError, ValidationError
-from app.models.document import Document, DocumentChunk, FileStatus
+from app.models.document import (
+    Document,
+    DocumentChunk,
+    FileStatus,
+    document_text_match,
+)
 from app.services.background_processor import get_background_processor
 from app.services.base import BaseService
+from app.services.bulk_delete import get_file_reaper
 from app.services.embedding import EmbeddingService
 from app.utils.file_processing import FileProcessor
 from app.utils.text_processing import TextProcessor
@@ -419,18 +425,24 @@ class DocumentService(BaseService):
         search: Optional[str] = None,
         file_type: Optional[str] = None,
         status_filter: Optional[str] = None,
-    ) -> Tuple[List[Document], int]:
+        cursor: Optional[str] = None,
+        count: str = "exact",
+    ) -> Tuple[List[Document], Optional[int], Optional[str], bool]:
         """List documents for a user with pagination and filtering.
 
         Args:
             user_id: User ID
-            page: Page number (1-based)
+            page: Page number (1-based), used when no cursor is given
             size: Items per page
             file_type: Filter by file type
             status_filter: Filter by processing status
+            cursor: Cursor returned with the previous page
+            count: Total count mode: exact, estimate or none
 
         Returns:
-            Tuple[List[Document], int]: List of documents and total count
+            Tuple[List[Document], Optional[int], Optional[str], bool]:
+                Documents, total count, cursor for the next page and whether
+                more documents follow
 
         """
         # Build filters
@@ -443,24 +455,25 @@ class DocumentService(BaseService):
             filters.append(Document.status == status_filter)
 
         if search:
-            # Use the base service search functionality
-            return await self._search_entities(
-                model=Document,
-                search_fields=["title", "summary", "content"],
-                search_term=search,
-                additional_filters=filters,
-                page=page,
-                size=size,
-            )
-        else:
-            return await self._list_with_filters(
-                model=Document,
-                filters=filters,
-                page=page,
-                size=size,
-                order_by=Document.title,
+            # Substring match on title (trigram index) or word match on
+            # title, summary and chunk content (tsvector indexes)
+            filters.append(
+                or_(
+                    Document.title.ilike(f"%{search}%"),
+                    document_text_match(search),
+                )
             )
 
+        return await self._list_with_keyset(
+            model=Document,
+            filters=filters,
+            sort_column=Document.title,
+            size=size,
+            cursor=cursor,
+            page=page,
+            count=count,
+        )
+
     async def update_document(
         self, document_id: int, request: DocumentUpdate, user_id: int
     ) -> Document:
@@ -505,18 +518,15 @@ class DocumentService(BaseService):
 
         """
         document = await self.get_document(document_id, user_id)
+        file_path = document.file_path
 
-        # Delete file from disk
-        try:
-            if os.path.exists(document.file_path):
-                os.remove(document.file_path)
-        except Exception as e:
-            logger.warning(f"Failed to delete file {document.file_path}: {e}")
-
-        # Delete database record (cascades to chunks)
+        # Delete database record (the database cascades to chunks)
         await self.db.delete(document)
         await self.db.commit()
 
+        # Remove the file in the background
+        get_file_reaper().submit([file_path])
+
         logger.info(f"Document deleted: {document_id}")
         return True
 
@@ -9,15 +9,28 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 from croniter import croniter
-from sqlalchemy import and_, desc, func, or_, select, update
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError, ValidationError
 from app.models.job import Job
 from app.services.base import BaseService
+from app.utils.pagination import count_rows, paginate_keyset
 from app.utils.timestamp import utcnow
 from shared.schemas.job import JobCreate, JobSearchParams, JobUpdate, JobStatus, ScheduleType
 
+# Columns list_jobs may sort by, keyed by the sort_by parameter
+JOB_SORT_COLUMNS = {
+    "created_at": Job.created_at,
+    "updated_at": Job.updated_at,
+    "name": Job.name,
+    "title": Job.title,
+    "job_type": Job.job_type,
+    "status": Job.status,
+    "last_run_at": Job.last_run_at,
+    "next_run_at": Job.next_run_at,
+}
+
 
 class JobService(BaseService):
     """Service for managing scheduled jobs with comprehensive CRUD and scheduling operations."""
@@ -180,14 +193,18 @@ class JobService(BaseService):
     async def list_jobs(
         self, 
         params: Optional[JobSearchParams] = None
-    ) -> Tuple[List[Job], int]:
+    ) -> Tuple[List[Job], Optional[int], Optional[str], bool]:
         """List jobs with filtering, searching and pagination.
         
         Args:
             params: Search and filter parameters
             
         Returns:
-            Tuple of (jobs list, total count)
+            Tuple of (jobs list, total count or None, next page cursor,
+            whether more jobs follow)
+            
+        Raises:
+            ValidationError: If sort_by is not a sortable job field
         """
         if params is None:
             params = JobSearchParams()
@@ -195,6 +212,13 @@ class JobService(BaseService):
         self._log_operation_start("list_jobs", page=params.page, size=params.size)
         
         try:
+            sort_field = JOB_SORT_COLUMNS.get(params.sort_by or "created_at")
+            if sort_field is None:
+                raise ValidationError(
+                    f"Invalid sort field '{params.sort_by}', expected one of: "
+                    + ", ".join(JOB_SORT_COLUMNS)
+                )
+
             # Build base query
             query = select(Job)
             
@@ -249,29 +273,25 @@ class JobService(BaseService):
             if filters:
                 query = query.where(and_(*filters))
             
-            # Apply sorting
-            sort_field = getattr(Job, params.sort_by, None)
-            if sort_field is not None:
-                if params.sort_order == "desc":
-                    query = query.order_by(desc(sort_field))
-                else:
-                    query = query.order_by(sort_field)
-            
             # Get total count
-            count_query = select(func.count()).select_from(query.subquery())
-            total_result = await self.db.execute(count_query)
-            total = total_result.scalar() or 0
-            
-            # Apply pagination
-            offset = (params.page - 1) * params.size
-            query = query.offset(offset).limit(params.size)
+            total = await count_rows(
+                self.db, query, mode=params.count, table_name=Job.__tablename__
+            )
             
-            # Execute query
-            result = await self.db.execute(query)
-            jobs = result.scalars().all()
+            # Keyset pagination on (sort field, id)
+            jobs, next_cursor, has_more = await paginate_keyset(
+                self.db,
+                query,
+                sort_field,
+                Job.id,
+                size=params.size,
+                cursor=params.cursor,
+                page=params.page,
+                descending=params.sort_order == "desc",
+            )
             
             self._log_operation_success("list_jobs", count=len(jobs), total=total)
-            return list(jobs), total
+            return jobs, total, next_cursor, has_more
             
         except Exception as e:
             self._log_operation_error("list_jobs", e)
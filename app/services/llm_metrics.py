@@ -0,0 +1,223 @@
+"""LLM latency and throughput metrics per model and LLM profile.
+
+Each chat completion is timed with an LLMTimer and recorded in the global
+``llm_metrics`` aggregate:
+
+- queue time: from sending the request until the provider starts the
+  response (streamed calls only)
+- time to first token: until the first content or tool call delta
+  (streamed calls only)
+- inter-token latency: mean gap between output tokens after the first
+  (streamed calls only)
+- generation time: from sending the request until the last token
+- output tokens per second: output tokens over the generation time
+
+Histograms have fixed buckets and the number of (model, profile) series is
+capped at ``llm_metrics_max_series``, so memory stays bounded however many
+profiles are used; further series are recorded under ``other``.
+"""
+
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.config import settings
+from app.utils.metrics import CounterFamily, HistogramFamily
+
+# Label value of series beyond the series cap
+OTHER_SERIES = "other"
+
+# Seconds between output tokens (1ms .. 1s)
+INTER_TOKEN_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.02,
+    0.03,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+# Seconds for a whole generation (0.25s .. 5 minutes)
+GENERATION_BUCKETS: Tuple[float, ...] = (
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    20.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+)
+
+# Output tokens per second
+THROUGHPUT_BUCKETS: Tuple[float, ...] = (
+    1,
+    5,
+    10,
+    20,
+    30,
+    50,
+    75,
+    100,
+    150,
+    200,
+    300,
+    500,
+)
+
+
+class LLMTimer:
+    """Timestamps of one LLM call; timing starts on creation."""
+
+    def __init__(self, model: str, profile: Optional[str] = None):
+        """Initialize timer.
+
+        Args:
+            model: Model the request was sent to
+            profile: LLM profile name (None for the built-in defaults)
+
+        """
+        self.model = model
+        self.profile = profile or "default"
+        self.started = time.perf_counter()
+        self.response_started: Optional[float] = None
+        self.first_token: Optional[float] = None
+        self.last_token: Optional[float] = None
+        self.token_chunks = 0
+
+    def response_start(self) -> None:
+        """Mark that the provider started the response."""
+        if self.response_started is None:
+            self.response_started = time.perf_counter()
+
+    def token(self) -> None:
+        """Mark a streamed content or tool call delta."""
+        now = time.perf_counter()
+        if self.first_token is None:
+            self.first_token = now
+        self.last_token = now
+        self.token_chunks += 1
+
+    def finish(self, output_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Return the call's timing in seconds.
+
+        Args:
+            output_tokens: Completion tokens reported by the provider; the
+                number of streamed deltas is used if not reported
+
+        Returns:
+            dict: Model, profile, times and output token rate; times that
+                were not observed are None
+
+        """
+        ended = self.last_token or time.perf_counter()
+        if output_tokens is None:
+            output_tokens = self.token_chunks
+        generation_time = ended - self.started
+
+        timing: Dict[str, Any] = {
+            "model": self.model,
+            "profile": self.profile,
+            "queue_time": None,
+            "time_to_first_token": None,
+            "inter_token_latency": None,
+            "generation_time": generation_time,
+            "output_tokens": output_tokens,
+            "output_tokens_per_second": (
+                output_tokens / generation_time if generation_time > 0 else None
+            ),
+        }
+        if self.response_started is not None:
+            timing["queue_time"] = self.response_started - self.started
+        if self.first_token is not None:
+            timing["time_to_first_token"] = self.first_token - self.started
+            if output_tokens > 1:
+                timing["inter_token_latency"] = (
+                    self.last_token - self.first_token
+                ) / (output_tokens - 1)
+        return timing
+
+
+class LLMMetrics:
+    """Bounded aggregate of LLM call timings keyed by model and profile."""
+
+    label_names = ("model", "profile")
+
+    def __init__(self, max_series: Optional[int] = None):
+        """Initialize aggregate.
+
+        Args:
+            max_series: Maximum distinct (model, profile) series
+                (defaults to settings.llm_metrics_max_series)
+
+        """
+        self.max_series = max_series or settings.llm_metrics_max_series
+        self._series: Set[Tuple[str, str]] = set()
+        self.requests = CounterFamily(("model", "profile", "outcome"))
+        self.queue_seconds = HistogramFamily(self.label_names)
+        self.ttft_seconds = HistogramFamily(self.label_names)
+        self.inter_token_seconds = HistogramFamily(
+            self.label_names, INTER_TOKEN_BUCKETS
+        )
+        self.generation_seconds = HistogramFamily(
+            self.label_names, GENERATION_BUCKETS
+        )
+        self.output_tokens_per_second = HistogramFamily(
+            self.label_names, THROUGHPUT_BUCKETS
+        )
+
+    def _labels(self, model: str, profile: str) -> Tuple[str, str]:
+        key = (model, profile)
+        if key not in self._series:
+            if len(self._series) >= self.max_series:
+                return (OTHER_SERIES, OTHER_SERIES)
+            self._series.add(key)
+        return key
+
+    def record(self, timing: Dict[str, Any]) -> None:
+        """Record a completed call from LLMTimer.finish()."""
+        labels = self._labels(timing["model"], timing["profile"])
+        self.requests.inc(*labels, "ok")
+        for family, value in (
+            (self.queue_seconds, timing["queue_time"]),
+            (self.ttft_seconds, timing["time_to_first_token"]),
+            (self.inter_token_seconds, timing["inter_token_latency"]),
+            (self.generation_seconds, timing["generation_time"]),
+            (self.output_tokens_per_second, timing["output_tokens_per_second"]),
+        ):
+            if value is not None:
+                family.labels(*labels).observe(value)
+
+    def record_error(self, timer: LLMTimer) -> None:
+        """Record a call that failed before it finished."""
+        self.requests.inc(*self._labels(timer.model, timer.profile), "error")
+
+
+def timing_metainfo(timing: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return message metainfo holding a call's timing.
+
+    Returns:
+        Optional[dict]: ``{"llm_timing": ...}`` with rounded values, or None
+            if there is no timing or ``llm_timing_persist`` is off
+
+    """
+    if not timing or not settings.llm_timing_persist:
+        return None
+    return {
+        "llm_timing": {
+            key: round(value, 4) if isinstance(value, float) else value
+            for key, value in timing.items()
+        }
+    }
+
+
+# Global LLM metrics aggregate
+llm_metrics = LLMMetrics()
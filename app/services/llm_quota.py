@@ -0,0 +1,238 @@
+"""Per-user LLM token and concurrency quotas.
+
+Request rate limits do not bound what chat actually costs, so each user also
+has:
+
+- a token quota: prompt and completion tokens reported in the LLM ``usage``
+  are billed against an allowance of ``llm_token_quota`` tokens per
+  ``llm_token_quota_period`` seconds that refills continuously. A request is
+  admitted while the allowance is not overdrawn; its real cost is billed
+  when it finishes.
+- a concurrency cap: at most ``llm_max_concurrent_streams`` chat streams at
+  once. Further streams wait up to ``llm_stream_queue_timeout`` seconds for
+  a slot before they are rejected.
+
+Rejections raise RateLimitError with a ``retry_after`` detail, which the API
+reports as 429 with a Retry-After header. Token allowances are kept in the
+rate limiter's backend, so they are shared across workers with the postgres
+backend; stream slots are per worker.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.core.exceptions import RateLimitError
+from app.middleware.rate_limiting import (
+    RateLimitBackend,
+    RateLimitPolicy,
+    rate_limiter,
+)
+from app.utils.metrics import CounterFamily
+
+logger = logging.getLogger(__name__)
+
+# Retry-After suggested when no stream slot frees up in time
+_STREAM_RETRY_AFTER = 5
+
+
+class _UserStreams:
+    """Active and waiting streams of one user."""
+
+    def __init__(self):
+        self.active = 0
+        self.waiting = 0
+        self.released = asyncio.Condition()
+
+
+class StreamSlot:
+    """A held chat stream slot; release() is idempotent."""
+
+    def __init__(
+        self,
+        manager: "LLMQuotaManager",
+        user_id: int,
+        streams: Optional[_UserStreams] = None,
+    ):
+        self._manager = manager
+        self._user_id = user_id
+        self._streams = streams
+        self._released = streams is None
+
+    async def release(self) -> None:
+        """Return the slot to the user's pool."""
+        if self._released:
+            return
+        self._released = True
+        await self._manager._release_stream(self._user_id, self._streams)
+
+
+class LLMQuotaManager:
+    """Enforces per-user LLM token quotas and stream concurrency."""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        token_quota: Optional[int] = None,
+        token_quota_period: Optional[int] = None,
+        max_concurrent_streams: Optional[int] = None,
+        stream_queue_timeout: Optional[float] = None,
+    ):
+        """Initialize quota manager; limits default to settings.
+
+        Args:
+            backend: Storage for token allowances
+            token_quota: Tokens per user per period (0 disables)
+            token_quota_period: Quota period in seconds
+            max_concurrent_streams: Concurrent streams per user (0 disables)
+            stream_queue_timeout: Seconds to wait for a free stream slot
+
+        """
+        self.backend = backend
+        token_quota = (
+            settings.llm_token_quota if token_quota is None else token_quota
+        )
+        self.token_policy = (
+            RateLimitPolicy(
+                "llm_tokens",
+                limit=token_quota,
+                period=token_quota_period or settings.llm_token_quota_period,
+            )
+            if token_quota
+            else None
+        )
+        self.max_concurrent_streams = (
+            settings.llm_max_concurrent_streams
+            if max_concurrent_streams is None
+            else max_concurrent_streams
+        )
+        self.stream_queue_timeout = (
+            settings.llm_stream_queue_timeout
+            if stream_queue_timeout is None
+            else stream_queue_timeout
+        )
+        self._streams: Dict[int, _UserStreams] = {}
+        self.rejections = CounterFamily(("reason",))
+
+    def _token_key(self, user_id: int) -> str:
+        return f"{self.token_policy.name}:user:{user_id}"
+
+    async def check_tokens(self, user_id: int) -> None:
+        """Admit an LLM request if the user's token allowance is not overdrawn.
+
+        Raises:
+            RateLimitError: If the user has used up their token quota
+
+        """
+        if self.token_policy is None:
+            return
+        retry_after = await self.backend.acquire(
+            self._token_key(user_id), self.token_policy, cost=0
+        )
+        if retry_after is not None:
+            self.rejections.inc("tokens")
+            logger.warning(f"LLM token quota exceeded for user {user_id}")
+            raise RateLimitError(
+                "LLM token quota exceeded",
+                details={"retry_after": max(int(retry_after) + 1, 1)},
+            )
+
+    async def record_usage(
+        self, user_id: int, usage: Optional[Dict[str, Any]]
+    ) -> None:
+        """Bill the tokens of a finished LLM request to the user.
+
+        Args:
+            user_id: User who made the request
+            usage: LLM usage with prompt_tokens and completion_tokens
+
+        """
+        if self.token_policy is None or not usage:
+            return
+        tokens = (usage.get("prompt_tokens") or 0) + (
+            usage.get("completion_tokens") or 0
+        )
+        if tokens > 0:
+            await self.backend.charge(
+                self._token_key(user_id), self.token_policy, tokens
+            )
+
+    async def acquire_stream(self, user_id: int) -> StreamSlot:
+        """Take one of the user's chat stream slots, waiting if all are busy.
+
+        Raises:
+            RateLimitError: If no slot frees up within stream_queue_timeout
+
+        """
+        if not self.max_concurrent_streams:
+            return StreamSlot(self, user_id)
+
+        streams = self._streams.setdefault(user_id, _UserStreams())
+        if streams.active < self.max_concurrent_streams and not streams.waiting:
+            streams.active += 1
+            return StreamSlot(self, user_id, streams)
+
+        # Counted before awaiting the lock so the entry is not discarded
+        streams.waiting += 1
+        try:
+            async with streams.released:
+                await asyncio.wait_for(
+                    streams.released.wait_for(
+                        lambda: streams.active < self.max_concurrent_streams
+                    ),
+                    timeout=self.stream_queue_timeout,
+                )
+                streams.active += 1
+        except asyncio.TimeoutError:
+            self.rejections.inc("streams")
+            logger.warning(f"Concurrent stream limit reached for user {user_id}")
+            raise RateLimitError(
+                "Too many concurrent chat streams",
+                details={"retry_after": _STREAM_RETRY_AFTER},
+            )
+        finally:
+            streams.waiting -= 1
+            self._discard_idle(user_id, streams)
+        return StreamSlot(self, user_id, streams)
+
+    async def _release_stream(self, user_id: int, streams: _UserStreams) -> None:
+        async with streams.released:
+            streams.active -= 1
+            streams.released.notify()
+        self._discard_idle(user_id, streams)
+
+    def _discard_idle(self, user_id: int, streams: _UserStreams) -> None:
+        if (
+            not streams.active
+            and not streams.waiting
+            and self._streams.get(user_id) is streams
+        ):
+            del self._streams[user_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return quota configuration and current stream usage."""
+        return {
+            "token_quota": self.token_policy.limit if self.token_policy else 0,
+            "token_quota_period": (
+                self.token_policy.period if self.token_policy else None
+            ),
+            "max_concurrent_streams": self.max_concurrent_streams,
+            "users_streaming": len(self._streams),
+            "active_streams": sum(s.active for s in self._streams.values()),
+            "queued_streams": sum(s.waiting for s in self._streams.values()),
+        }
+
+
+# Global quota manager instance
+_llm_quota_manager: Optional[LLMQuotaManager] = None
+
+
+def get_llm_quota_manager() -> LLMQuotaManager:
+    """Get the global LLM quota manager instance."""
+    global _llm_quota_manager
+
+    if _llm_quota_manager is None:
+        _llm_quota_manager = LLMQuotaManager(rate_limiter.backend)
+
+    return _llm_quota_manager
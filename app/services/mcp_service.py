@@ -6,21 +6,35 @@ featuring retry, parallelization, and API response result caching.
 """
 
 import asyncio
+import copy
 import json
 import time
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
 from fastmcp import Client
 from fastmcp.client import StreamableHttpTransport
-from sqlalchemy import and_, select, update
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.config import settings
 from app.core.exceptions import ExternalServiceError
 from app.core.logging import get_api_logger
+from app.core.tracing import span, trace_headers
 from app.models.mcp_server import MCPServer
 from app.models.mcp_tool import MCPTool
+from app.utils.caching import canonicalize_arguments, tool_result_cache
+from app.utils.metrics import CounterFamily, HistogramFamily
 from app.utils.timestamp import utcnow
 from shared.schemas.mcp import (
     MCPDiscoveryResultSchema,
@@ -39,6 +53,28 @@ from shared.schemas.mcp import (
 
 logger = get_api_logger("mcp_service")
 
+# Tool call latency and failures per MCP server
+mcp_tool_call_seconds = HistogramFamily(("server",))
+mcp_tool_call_failures = CounterFamily(("server",))
+
+# Receives (progress, total, message) for MCP progress notifications
+ProgressHandler = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+
+
+def _propagating_client(client: Client) -> Client:
+    """Return client, or a copy sending the current trace context to the server.
+
+    The copy shares the client's configuration but opens its own session, so
+    concurrent calls each carry their own trace headers.
+    """
+    headers = trace_headers()
+    if not headers or not isinstance(client.transport, StreamableHttpTransport):
+        return client
+    traced = client.new()
+    traced.transport = copy.copy(client.transport)
+    traced.transport.headers = {**client.transport.headers, **headers}
+    return traced
+
 
 class MCPService:
     """MCP service for registry, client proxy, and tool execution.
@@ -259,20 +295,19 @@ class MCPService:
 
     async def update_connection_status(
         self, name: str, is_connected: bool, increment_errors: bool = False
-    ) -> Optional[MCPServerSchema]:
-        """Update the connection status of a server."""
-        updates_dict = {
-            "is_connected": is_connected,
-        }
+    ) -> bool:
+        """Update the connection status of a server in a single statement."""
+        values: Dict[str, Any] = {"is_connected": is_connected}
         if is_connected:
-            updates_dict["last_connected_at"] = utcnow()
-            updates_dict["connection_errors"] = 0
+            values["last_connected_at"] = utcnow()
+            values["connection_errors"] = 0
         elif increment_errors:
-            server = await self.get_server(name)
-            if server:
-                updates_dict["connection_errors"] = server.connection_errors + 1
-        updates = MCPServerUpdateSchema(**updates_dict)
-        return await self.update_server(name, updates)
+            values["connection_errors"] = MCPServer.connection_errors + 1
+        result = await self.db.execute(
+            update(MCPServer).where(MCPServer.name == name).values(**values)
+        )
+        await self.db.commit()
+        return result.rowcount > 0
 
     async def register_tool(
         self, tool_data: MCPToolCreateSchema
@@ -311,6 +346,10 @@ class MCPService:
             description=tool_data.description,
             parameters=tool_data.parameters or {},
             is_enabled=tool_data.is_enabled,
+            cacheable=tool_data.cacheable,
+            cache_ttl=tool_data.cache_ttl,
+            cache_key_params=tool_data.cache_key_params,
+            cache_normalization=tool_data.cache_normalization,
         )
         self.db.add(tool)
         await self.db.commit()
@@ -372,6 +411,7 @@ class MCPService:
                 setattr(tool, key, value)
         await self.db.commit()
         await self.db.refresh(tool, ["server"])
+        await tool_result_cache.delete_prefix(self._tool_cache_key(tool_name))
         logger.info(f"Updated tool: {tool_name}")
         return MCPToolResponse.model_validate(tool)
 
@@ -409,6 +449,7 @@ class MCPService:
         )
         await self.db.commit()
         if result.rowcount > 0:
+            await tool_result_cache.delete_prefix(self._tool_cache_key(tool_name))
             logger.info(f"Disabled tool: {tool_name}")
             return True
         return False
@@ -429,14 +470,10 @@ class MCPService:
         """
         tool = await self.db.execute(select(MCPTool).where(MCPTool.name == tool_name))
         tool = tool.scalar_one_or_none()
-        print("=========================tool", tool)
         if not tool:
             return False
-        print("ASDFASDF")
         tool.record_usage(success, duration_ms)
-        print("QWERQWER")
         await self.db.commit()
-        print("#############################")
         return True
 
     async def batch_record_tool_usage(self, usage_records: List[Dict[str, Any]]) -> int:
@@ -511,7 +548,7 @@ class MCPService:
             server_name: Name of the server to discover tools from.
 
         Returns:
-            Discovery result with counts of new and updated tools.
+            Discovery result with counts of new, updated and removed tools.
 
         """
         server_result = await self.db.execute(
@@ -528,70 +565,22 @@ class MCPService:
             return MCPDiscoveryResultSchema(
                 success=False, server_name=server_name, error="Server is disabled"
             )
-        try:
-            discovered_tools = await self._discover_server_tools(
-                server.url, server.timeout
-            )
-            new_tools = 0
-            updated_tools = 0
-            errors = []
-            for tool_info in discovered_tools:
-                try:
-                    tool_name = f"{server_name}_{tool_info.get('name', 'unknown')}"
-                    tool_data = MCPToolCreateSchema(
-                        name=tool_name,
-                        original_name=tool_info.get("name", "unknown"),
-                        server_name=server_name,
-                        description=tool_info.get("description"),
-                        parameters=tool_info.get("parameters", {}),
-                        is_enabled=True,
-                    )
-                    existing_tool = await self.get_tool(tool_name)
-                    if existing_tool:
-                        updates = MCPToolUpdateSchema(
-                            description=tool_data.description,
-                            parameters=tool_data.parameters,
-                        )
-                        await self.update_tool(tool_name, updates)
-                        updated_tools += 1
-                        logger.info(f"Updated existing tool: {tool_name}")
-                    else:
-                        await self.register_tool(tool_data)
-                        new_tools += 1
-                        logger.info(f"Discovered new tool: {tool_name}")
-                except Exception as e:
-                    error_msg = f"Failed to process tool {tool_info.get('name', 'unknown')}: {e}"
-                    errors.append(error_msg)
-                    logger.error(error_msg)
-            await self.update_connection_status(server_name, True, False)
-            result = MCPDiscoveryResultSchema(
-                success=True,
-                server_name=server_name,
-                new_tools=new_tools,
-                updated_tools=updated_tools,
-                total_discovered=len(discovered_tools),
-                errors=errors,
-            )
-            logger.info(
-                f"Tool discovery completed for {server_name}: {new_tools} new, {updated_tools} updated"
-            )
-            return result
-        except Exception as e:
-            error_msg = f"Failed to discover tools from server {server_name}: {e}"
-            logger.error(error_msg)
-            await self.update_connection_status(server_name, False, True)
-            return MCPDiscoveryResultSchema(
-                success=False,
-                server_name=server_name,
-                error=str(e),
-                new_tools=0,
-                updated_tools=0,
-                total_discovered=0,
-            )
+        discovered_tools, error = await self._fetch_server_tools(
+            server.name, server.url, server.timeout
+        )
+        if error is not None:
+            return await self._record_discovery_failure(server.name, error)
+        return await self._store_discovered_tools(
+            server.id, server.name, discovered_tools
+        )
 
     async def discover_tools_all_servers(self) -> List[MCPDiscoveryResultSchema]:
         """Discover tools from all enabled servers.
 
+        Servers are queried concurrently (bounded by ``mcp_discovery_concurrency``)
+        with a per-server timeout; results are then written one server at a time
+        since the database session cannot be shared between tasks.
+
         Returns:
             List of discovery results for all servers.
 
@@ -602,13 +591,140 @@ class MCPService:
             logger.info("No enabled MCP servers found for tool discovery")
             return []
         logger.info(f"Starting tool discovery for {len(servers)} servers")
+        semaphore = asyncio.Semaphore(settings.mcp_discovery_concurrency)
+
+        async def fetch(server: MCPServerSchema):
+            async with semaphore:
+                return await self._fetch_server_tools(
+                    server.name, server.url, server.timeout
+                )
+
+        fetched = await asyncio.gather(*(fetch(server) for server in servers))
         discovery_results = []
-        for server in servers:
-            result = await self.discover_tools_from_server(server.name)
+        for server, (discovered_tools, error) in zip(servers, fetched):
+            if error is not None:
+                result = await self._record_discovery_failure(server.name, error)
+            else:
+                result = await self._store_discovered_tools(
+                    server.id, server.name, discovered_tools
+                )
             discovery_results.append(result)
-            await asyncio.sleep(0.5)
         return discovery_results
 
+    async def _fetch_server_tools(
+        self, server_name: str, server_url: str, timeout: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Fetch the tool list from a server, returning (tools, error)."""
+        try:
+            tools = await asyncio.wait_for(
+                self._discover_server_tools(server_url, timeout), timeout=timeout
+            )
+            return tools, None
+        except asyncio.TimeoutError:
+            return [], f"Tool discovery timed out after {timeout}s"
+        except Exception as e:
+            return [], str(e)
+
+    async def _record_discovery_failure(
+        self, server_name: str, error: str
+    ) -> MCPDiscoveryResultSchema:
+        logger.error(f"Failed to discover tools from server {server_name}: {error}")
+        try:
+            await self.update_connection_status(server_name, False, True)
+        except Exception as e:
+            await self.db.rollback()
+            logger.warning(f"Failed to update connection status for {server_name}: {e}")
+        return MCPDiscoveryResultSchema(
+            success=False,
+            server_name=server_name,
+            error=error,
+            new_tools=0,
+            updated_tools=0,
+            total_discovered=0,
+        )
+
+    async def _store_discovered_tools(
+        self, server_id: int, server_name: str, discovered_tools: List[Dict[str, Any]]
+    ) -> MCPDiscoveryResultSchema:
+        """Upsert a server's tool list and drop tools it no longer reports.
+
+        The upsert, the removal of stale tools and the connection status update
+        are applied in a single transaction. Enabled flags and cache policies of
+        existing tools are preserved.
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        for tool_info in discovered_tools:
+            original_name = tool_info.get("name", "unknown")
+            tool_name = f"{server_name}_{original_name}"
+            rows[tool_name] = {
+                "name": tool_name,
+                "original_name": original_name,
+                "server_id": server_id,
+                "description": tool_info.get("description"),
+                "parameters": tool_info.get("parameters") or {},
+                "is_enabled": True,
+            }
+        try:
+            existing_result = await self.db.execute(
+                select(MCPTool.name).where(MCPTool.server_id == server_id)
+            )
+            existing = set(existing_result.scalars().all())
+            if rows:
+                stmt = pg_insert(MCPTool).values(list(rows.values()))
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[MCPTool.name],
+                    set_={
+                        "original_name": stmt.excluded.original_name,
+                        "server_id": stmt.excluded.server_id,
+                        "description": stmt.excluded.description,
+                        "parameters": stmt.excluded.parameters,
+                        "updated_at": func.now(),
+                    },
+                )
+                await self.db.execute(stmt)
+            stale = existing - rows.keys()
+            if stale:
+                await self.db.execute(
+                    delete(MCPTool).where(
+                        MCPTool.server_id == server_id, MCPTool.name.in_(stale)
+                    )
+                )
+            await self.db.execute(
+                update(MCPServer)
+                .where(MCPServer.id == server_id)
+                .values(
+                    is_connected=True, last_connected_at=utcnow(), connection_errors=0
+                )
+            )
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            error_msg = f"Failed to store tools for server {server_name}: {e}"
+            logger.error(error_msg)
+            return MCPDiscoveryResultSchema(
+                success=False,
+                server_name=server_name,
+                error=error_msg,
+                total_discovered=len(discovered_tools),
+            )
+
+        for tool_name in existing:
+            await tool_result_cache.delete_prefix(self._tool_cache_key(tool_name))
+        new_tools = len(rows.keys() - existing)
+        updated_tools = len(rows.keys() & existing)
+        logger.info(
+            f"Tool discovery completed for {server_name}: {new_tools} new, "
+            f"{updated_tools} updated, {len(stale)} removed"
+        )
+        return MCPDiscoveryResultSchema(
+            success=True,
+            server_name=server_name,
+            new_tools=new_tools,
+            updated_tools=updated_tools,
+            removed_tools=len(stale),
+            total_discovered=len(discovered_tools),
+        )
+
     async def _auto_discover_on_server_change(
         self, server_name: str, was_enabled: bool, is_enabled: bool
     ) -> Optional[MCPDiscoveryResultSchema]:
@@ -707,14 +823,19 @@ class MCPService:
     async def call_tool(
         self,
         request: MCPToolExecutionRequestSchema,
+        tool: Optional[MCPToolResponse] = None,
+        progress_handler: Optional[ProgressHandler] = None,
     ) -> MCPToolExecutionResultSchema:
         """Execute a single tool call (with MCP registry), using FastMCP client proxy.
 
         Does NOT apply retry or caching logic. For managed execution use 'execute_tool_call'.
+        An already loaded tool may be passed to skip the registry lookup, and
+        progress_handler receives the server's progress notifications.
         """
         #        if not self.is_initialized:
         #            raise ExternalServiceError("MCP client not initialized")
-        tool = await self.get_tool(request.tool_name)
+        if tool is None:
+            tool = await self.get_tool(request.tool_name)
         if not tool:
             available_tools = [t.name for t in await self.list_tools()]
             raise ExternalServiceError(
@@ -733,10 +854,18 @@ class MCPService:
         start_time = time.time()
         success = False
         try:
-            async with client:
-                result = await client.call_tool(
-                    name=tool.original_name, arguments=request.parameters
-                )
+            with span(
+                "mcp.call_tool",
+                {"mcp.server": server_name, "mcp.tool": tool.original_name},
+                kind="client",
+            ):
+                client = _propagating_client(client)
+                async with client:
+                    result = await client.call_tool(
+                        name=tool.original_name,
+                        arguments=request.parameters,
+                        progress_handler=progress_handler,
+                    )
             success = True
             formatted_result = MCPToolExecutionResultSchema(
                 success=True,
@@ -758,6 +887,11 @@ class MCPService:
             )
             raise ExternalServiceError(f"Tool execution failed: {e}")
         finally:
+            mcp_tool_call_seconds.labels(server_name).observe(
+                time.time() - start_time
+            )
+            if not success:
+                mcp_tool_call_failures.inc(server_name)
             if request.record_usage:
                 try:
                     duration_ms = int((time.time() - start_time) * 1000)
@@ -873,33 +1007,92 @@ class MCPService:
         tool_call: Dict[str, Any],
         max_retries: int = 3,
         use_cache: bool = True,
-        cache_ttl: int = 300,
+        cache_ttl: Optional[int] = None,
+        progress_handler: Optional[ProgressHandler] = None,
+        tool: Optional[MCPToolResponse] = None,
+        record_usage: bool = True,
     ) -> Dict[str, Any]:
-        """Execute a single tool call, with retry and API response caching logic.
+        """Execute a single tool call, with retry and result caching logic.
+
+        Results are only cached for tools flagged as cacheable. Concurrent
+        calls with the same canonical arguments share a single execution;
+        only the caller that started it receives progress notifications, so
+        coalesced callers get the result without progress events. The shared
+        execution runs detached from its callers and never touches the
+        service's session: usage is recorded by the starting caller once the
+        result is back. Concurrent tool calls must pass a preloaded tool and
+        record_usage=False so they do not share the service's session.
 
         Args:
             tool_call: Dict with keys: id (str), name (str), arguments (dict)
             max_retries: Number of retry attempts on failure (default 3)
             use_cache: If True, cache successful results for identical arguments
-            cache_ttl: TTL for result cache in seconds
+            cache_ttl: TTL override for the result cache in seconds; falls back
+                to the tool's own TTL and then the configured default
+            progress_handler: Optional callback for MCP progress notifications
+            tool: Already loaded tool, skipping the registry lookup
+            record_usage: Whether to record usage statistics in the registry
 
         Returns:
             Dict describing the tool execution result (see below).
 
         """
-        import time
-
         tool_call_id = tool_call.get("id", "")
         tool_name = tool_call.get("name")
         arguments = tool_call.get("arguments", {})
 
-        # if use_cache:
-        #    cache_key = make_cache_key("tool_call", tool_name, arguments)
-        #    cached_result = await api_response_cache.get(cache_key)
-        #    if cached_result is not None:
-        #        logger.debug(f"Using cached result for tool call: {tool_name}")
-        #        return cached_result
+        if tool is None and use_cache:
+            try:
+                tool = await self.get_tool(tool_name)
+            except Exception as e:
+                logger.warning(f"Failed to look up tool '{tool_name}' for caching: {e}")
+
+        if tool is None or not use_cache or not tool.cacheable:
+            result = await self._execute_tool_with_retry(
+                tool_name, arguments, max_retries, tool, progress_handler, record_usage
+            )
+            return {"tool_call_id": tool_call_id, **result}
+
+        cache_key = self._tool_cache_key(tool_name) + canonicalize_arguments(
+            arguments, tool.cache_key_params, tool.cache_normalization
+        )
+        result, cached = await tool_result_cache.get_or_compute(
+            cache_key,
+            lambda: self._execute_tool_with_retry(
+                tool_name, arguments, max_retries, tool, progress_handler, False
+            ),
+            ttl=cache_ttl or tool.cache_ttl,
+            should_cache=lambda r: r["success"],
+        )
+        if cached:
+            logger.debug(f"Using cached result for tool call: {tool_name}")
+            return {"tool_call_id": tool_call_id, **result, "cached": True}
+        if record_usage:
+            try:
+                duration_ms = result.get("execution_time_ms")
+                await self.record_tool_usage(
+                    tool_name,
+                    result["success"],
+                    int(duration_ms) if duration_ms is not None else None,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to record tool usage: {e}")
+        return {"tool_call_id": tool_call_id, **result}
+
+    @staticmethod
+    def _tool_cache_key(tool_name: str) -> str:
+        return f"tool:{tool_name}:"
 
+    async def _execute_tool_with_retry(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        max_retries: int,
+        tool: Optional[MCPToolResponse] = None,
+        progress_handler: Optional[ProgressHandler] = None,
+        record_usage: bool = True,
+    ) -> Dict[str, Any]:
+        """Run a tool with retries and return a result dict without call id."""
         last_exception = None
         for attempt in range(max_retries):
             start_time = time.time()
@@ -908,13 +1101,15 @@ class MCPService:
                     f"Executing tool call '{tool_name}', attempt {attempt + 1}/{max_retries}"
                 )
                 req = MCPToolExecutionRequestSchema(
-                    tool_name=tool_name, parameters=arguments, record_usage=True
+                    tool_name=tool_name,
+                    parameters=arguments,
+                    record_usage=record_usage,
+                )
+                result = await self.call_tool(
+                    req, tool=tool, progress_handler=progress_handler
                 )
-                result = await self.call_tool(req)
                 execution_time = (time.time() - start_time) * 1000
-                print("RESULT", result)
-                result_dict = {
-                    "tool_call_id": tool_call_id,
+                return {
                     "tool_name": tool_name,
                     "success": result.success,
                     "content": result.content,
@@ -922,10 +1117,6 @@ class MCPService:
                     "provider": "fastmcp",
                     "execution_time_ms": execution_time,
                 }
-                print("RESULTDICT", result_dict)
-                # if use_cache and cache_key and result.success:
-                #    await api_response_cache.set(cache_key, result_dict, ttl=cache_ttl)
-                return result_dict
             except Exception as e:
                 last_exception = e
                 logger.warning(f"Tool execution attempt {attempt + 1} failed: {e}")
@@ -938,7 +1129,6 @@ class MCPService:
             f"Tool execution failed after {max_retries} attempts: {tool_name} (error: {last_exception})"
         )
         return {
-            "tool_call_id": tool_call_id,
             "tool_name": tool_name,
             "success": False,
             "content": [],
@@ -973,9 +1163,10 @@ class MCPService:
         )
 
         if parallel_execution:
+            tools, errors = await self._prepare_tools(tool_calls)
             tasks = [
-                self.execute_tool_call(
-                    tool_call, max_retries=max_retries, use_cache=use_cache
+                self._execute_prepared_tool_call(
+                    tool_call, tools, errors, max_retries, use_cache
                 )
                 for tool_call in tool_calls
             ]
@@ -984,18 +1175,11 @@ class MCPService:
             for i, result in enumerate(results):
                 if isinstance(result, Exception):
                     processed_results.append(
-                        {
-                            "tool_call_id": tool_calls[i].get("id", ""),
-                            "tool_name": tool_calls[i].get("name", ""),
-                            "success": False,
-                            "content": [],
-                            "error": str(result),
-                            "provider": "fastmcp",
-                            "execution_time_ms": None,
-                        }
+                        self._failed_tool_result(tool_calls[i], str(result))
                     )
                 else:
                     processed_results.append(result)
+            await self._record_tool_call_usage(processed_results, tools)
             return processed_results
         else:
             results = []
@@ -1008,6 +1192,182 @@ class MCPService:
                 results.append(result)
             return results
 
+    async def execute_tool_calls_stream(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        max_retries: int = 3,
+        use_cache: bool = True,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Execute tool calls concurrently, yielding events as they happen.
+
+        Yields a ``tool_start`` event per call, ``tool_progress`` events for
+        progress notifications forwarded from the MCP server, and a
+        ``tool_result`` event as each call finishes (in completion order).
+
+        Args:
+            tool_calls: List of tool call dicts (see 'execute_tool_call')
+            max_retries: Number of retry attempts per call
+            use_cache: If True, use tool result caching
+
+        Yields:
+            dict: Tool execution events
+
+        """
+        if not tool_calls:
+            return
+        logger.info(f"Streaming execution of {len(tool_calls)} tool calls")
+        tools, errors = await self._prepare_tools(tool_calls)
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def run(tool_call: Dict[str, Any]) -> None:
+            tool_info = {"id": tool_call.get("id", ""), "name": tool_call.get("name")}
+
+            async def on_progress(
+                progress: float,
+                total: Optional[float] = None,
+                message: Optional[str] = None,
+            ) -> None:
+                queue.put_nowait(
+                    {
+                        "type": "tool_progress",
+                        "tool": tool_info,
+                        "progress": progress,
+                        "total": total,
+                        "message": message,
+                    }
+                )
+
+            queue.put_nowait({"type": "tool_start", "tool": tool_info})
+            try:
+                result = await self._execute_prepared_tool_call(
+                    tool_call, tools, errors, max_retries, use_cache, on_progress
+                )
+            except Exception as e:
+                result = self._failed_tool_result(tool_call, str(e))
+            queue.put_nowait(
+                {"type": "tool_result", "tool": tool_info, "result": result}
+            )
+
+        tasks = [asyncio.create_task(run(tool_call)) for tool_call in tool_calls]
+        results = []
+        try:
+            pending = len(tasks)
+            while pending:
+                event = await queue.get()
+                if event["type"] == "tool_result":
+                    pending -= 1
+                    results.append(event["result"])
+                yield event
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        await self._record_tool_call_usage(results, tools)
+
+    async def _prepare_tools(
+        self, tool_calls: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, MCPToolResponse], Dict[str, str]]:
+        """Load the tools of a batch of calls and connect their servers.
+
+        Runs one lookup at a time on the service's session, so the calls can
+        then execute concurrently without using it. The lookup transaction is
+        committed before servers are connected, so no pooled connection is
+        held while the tools run.
+
+        Returns:
+            Tuple of loaded tools by name and preparation errors by name
+
+        """
+        tools: Dict[str, MCPToolResponse] = {}
+        errors: Dict[str, str] = {}
+        servers: Dict[str, MCPServerSchema] = {}
+        for tool_call in tool_calls:
+            name = tool_call.get("name")
+            if name in tools or name in errors:
+                continue
+            try:
+                tool = await self.get_tool(name)
+                if tool is None:
+                    errors[name] = f"Tool '{name}' not found"
+                    continue
+                server_name = tool.server.name
+                if server_name not in self.clients and server_name not in servers:
+                    server = await self.get_server(server_name)
+                    if not server:
+                        errors[name] = f"Server '{server_name}' not found"
+                        continue
+                    servers[server_name] = server
+                tools[name] = tool
+            except Exception as e:
+                errors[name] = f"Tool preparation failed: {e}"
+        await self.db.commit()
+
+        for server in servers.values():
+            try:
+                await self._connect_server(server)
+            except Exception as e:
+                for name, tool in list(tools.items()):
+                    if tool.server.name == server.name:
+                        del tools[name]
+                        errors[name] = f"Tool preparation failed: {e}"
+        return tools, errors
+
+    async def _execute_prepared_tool_call(
+        self,
+        tool_call: Dict[str, Any],
+        tools: Dict[str, MCPToolResponse],
+        errors: Dict[str, str],
+        max_retries: int,
+        use_cache: bool,
+        progress_handler: Optional[ProgressHandler] = None,
+    ) -> Dict[str, Any]:
+        """Execute one call of a batch prepared by _prepare_tools."""
+        tool = tools.get(tool_call.get("name"))
+        if tool is None:
+            return self._failed_tool_result(
+                tool_call, errors.get(tool_call.get("name"), "Tool not found")
+            )
+        return await self.execute_tool_call(
+            tool_call,
+            max_retries=max_retries,
+            use_cache=use_cache,
+            progress_handler=progress_handler,
+            tool=tool,
+            record_usage=False,
+        )
+
+    async def _record_tool_call_usage(
+        self, results: List[Dict[str, Any]], tools: Dict[str, MCPToolResponse]
+    ) -> None:
+        """Record registry usage of executed calls once they have finished."""
+        usage_records = [
+            {
+                "tool_name": result["tool_name"],
+                "success": result["success"],
+                "duration_ms": (
+                    int(result["execution_time_ms"])
+                    if result.get("execution_time_ms") is not None
+                    else None
+                ),
+            }
+            for result in results
+            if result.get("tool_name") in tools and not result.get("cached")
+        ]
+        if usage_records:
+            await self.batch_record_tool_usage(usage_records)
+
+    @staticmethod
+    def _failed_tool_result(tool_call: Dict[str, Any], error: str) -> Dict[str, Any]:
+        return {
+            "tool_call_id": tool_call.get("id", ""),
+            "tool_name": tool_call.get("name", ""),
+            "success": False,
+            "content": [],
+            "error": error,
+            "provider": "fastmcp",
+            "execution_time_ms": None,
+        }
+
     async def health_check(self) -> MCPHealthStatusSchema:
         """Perform a health check of the MCP system: registry and client connections."""
         all_servers = await self.list_servers()
@@ -6,6 +6,7 @@ functionality including tool calling via ToolExecutor (now dependency-injected).
 """
 
 import json
+import time
 from typing import Any, Dict, List, Optional, Union
 
 import httpx
@@ -15,14 +16,21 @@ from openai import AsyncOpenAI
 
 from app.config import settings
 from app.core.logging import get_api_logger
+from app.core.tracing import span
+from app.services.llm_metrics import LLMTimer, llm_metrics
 from app.services.mcp_service import MCPService
 from app.utils.api_errors import handle_api_errors
 from app.utils.caching import embedding_cache, make_cache_key
+from app.utils.metrics import SIZE_BUCKETS, Histogram, HistogramFamily
 from app.utils.tool_middleware import RetryConfig, tool_operation
 from shared.schemas.tool_calling import ToolHandlingMode
 
 logger = get_api_logger("openai_client")
 
+# Embedding API call latency by operation (single, batch) and inputs per call
+embedding_request_seconds = HistogramFamily(("operation",))
+embedding_batch_size = Histogram(SIZE_BUCKETS)
+
 
 class OpenAIClient:
     """OpenAI API client with tool integration.
@@ -113,6 +121,28 @@ class OpenAIClient:
                 logger.warning(f"Failed to count tokens: {e}")
         return len(text.split()) + len(text) // 4
 
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Count tokens for many texts using tiktoken's threaded batch encoder.
+
+        Blocking; call from a worker thread when used inside the event loop.
+
+        Args:
+            texts: Text strings to count tokens for
+
+        Returns:
+            List[int]: Token count for each text, in order
+
+        """
+        if self.tokenizer:
+            try:
+                encoded = self.tokenizer.encode_ordinary_batch(
+                    texts, num_threads=settings.import_token_threads
+                )
+                return [len(tokens) for tokens in encoded]
+            except Exception as e:
+                logger.warning(f"Failed to count tokens in batch: {e}")
+        return [len(text.split()) + len(text) // 4 if text else 0 for text in texts]
+
     def count_messages_tokens(self, messages: List[Dict[str, Any]]) -> int:
         """Count tokens in a list of chat messages.
 
@@ -162,7 +192,8 @@ class OpenAIClient:
             max_retries: Maximum number of retry attempts
 
         Returns:
-            dict: Chat completion response with usage information and tool results
+            dict: Chat completion response with usage information, tool results
+                and the timing of the initial completion
 
         """
         final_tools = tools or []
@@ -203,10 +234,24 @@ class OpenAIClient:
             log_details=True,
         )
         async def _make_completion():
-            response = await self.client.chat.completions.create(**request_params)
-            return response
+            # Each attempt is timed on its own so backoff sleeps between
+            # retries are not counted as generation time; the SDK's own
+            # retries are disabled as tool_operation already retries
+            timer = LLMTimer(
+                request_params["model"], getattr(llm_profile, "name", None)
+            )
+            try:
+                response = await self.client.with_options(
+                    max_retries=0
+                ).chat.completions.create(**request_params)
+            except Exception:
+                llm_metrics.record_error(timer)
+                raise
+            timing = timer.finish(response.usage.completion_tokens)
+            llm_metrics.record(timing)
+            return response, timing
 
-        response = await _make_completion()
+        response, timing = await _make_completion()
         message = response.choices[0].message
         tool_calls_executed = []
         final_content = message.content or ""
@@ -261,6 +306,7 @@ class OpenAIClient:
             "finish_reason": response.choices[0].finish_reason,
             "usage": final_usage,
             "tool_handling_mode": tool_handling_mode,
+            "timing": timing,
         }
 
         return result
@@ -280,35 +326,33 @@ class OpenAIClient:
         Args:
             messages: List of messages
             llm_profile: LLM profile object containing model parameters (temperature, max_tokens, etc.)
-            tools: Custom tools (if None, will use tools if available)
+            tools: Custom tools (if None, registered MCP tools are loaded)
             tool_choice: Tool choice strategy
             use_tools: Whether to automatically include tools
             tool_handling_mode: How to handle tool call results
             max_retries: Maximum number of retry attempts
 
         Yields:
-            dict: Streaming response chunks with content or tool call results
+            dict: Streaming response chunks with content or tool call results,
+                and usage and timing chunks once generation ends
 
         """
-        final_tools = tools or []
-        print("$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$")
-        print("UISE", use_tools, tools)
-        if use_tools and not tools:
+        final_tools = list(tools or [])
+        if use_tools and tools is None:
             try:
                 tools = await self.mcp_service.get_openai_tools()
                 final_tools.extend(tools)
                 logger.info(f"Added {len(tools)} tools to streaming chat completion")
             except Exception as e:
                 logger.warning(f"Failed to add tools: {e}")
-        print(
-            "%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%"
-        )
-        print("TOOLS", final_tools)
         request_params = {
             "model": settings.openai_chat_model,
             "messages": messages,
             "stream": True,
         }
+        if settings.openai_stream_usage:
+            # The final chunk reports token usage for quota accounting
+            request_params["stream_options"] = {"include_usage": True}
 
         if llm_profile:
             profile_params = llm_profile.to_openai_params()
@@ -320,46 +364,96 @@ class OpenAIClient:
             request_params["tools"] = final_tools
             request_params["tool_choice"] = tool_choice
 
+        timer = LLMTimer(request_params["model"], getattr(llm_profile, "name", None))
+        timing = None
         try:
             stream = await self.client.chat.completions.create(**request_params)
-            tool_calls_data = []
-            full_content = ""
+            timer.response_start()
+            # Tool call deltas arrive in fragments keyed by index
+            tool_call_parts: Dict[int, Dict[str, Any]] = {}
+
+            usage = None
 
             async for chunk in stream:
-                print("CHUNK", chunk)
-                if chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    full_content += content
-                    yield {"type": "content", "content": content}
-
-                if chunk.choices[0].delta.tool_calls:
-                    for tool_call in chunk.choices[0].delta.tool_calls:
-                        print("TOOLCALLS", tool_call)
-                        print("FUNC", tool_call.function)
-                        print("FUNCNAME", tool_call.function.name)
-                        if tool_call.function and tool_call.function.name:
-                            tool_calls_data.append(tool_call)
-
-            print("DATA", tool_calls_data)
-            if tool_calls_data:
-                tool_calls_executed = await self._execute_tool_calls(tool_calls_data)
-                for tool_result in tool_calls_executed:
-                    yield {
-                        "type": "tool_call",
-                        "tool": tool_result.get("name"),
-                        "result": tool_result.get("result"),
+                if chunk.usage:
+                    usage = {
+                        "prompt_tokens": chunk.usage.prompt_tokens,
+                        "completion_tokens": chunk.usage.completion_tokens,
+                        "total_tokens": chunk.usage.total_tokens,
+                    }
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content or delta.tool_calls:
+                    timer.token()
+                if delta.content:
+                    yield {"type": "content", "content": delta.content}
+
+                if delta.tool_calls:
+                    for tool_call in delta.tool_calls:
+                        part = tool_call_parts.setdefault(
+                            tool_call.index, {"id": None, "name": "", "arguments": []}
+                        )
+                        if tool_call.id:
+                            part["id"] = tool_call.id
+                        if tool_call.function:
+                            if tool_call.function.name:
+                                part["name"] += tool_call.function.name
+                            if tool_call.function.arguments:
+                                part["arguments"].append(tool_call.function.arguments)
+
+            timing = timer.finish(usage["completion_tokens"] if usage else None)
+            llm_metrics.record(timing)
+            if usage:
+                yield {"type": "usage", "usage": usage}
+            yield {"type": "timing", "timing": timing}
+
+            if tool_call_parts:
+                tool_calls = [
+                    {
+                        "id": part["id"],
+                        "name": part["name"],
+                        "arguments": self._parse_tool_arguments(part["arguments"]),
                     }
+                    for _, part in sorted(tool_call_parts.items())
+                    if part["name"]
+                ]
+                executed = 0
+                async for event in self.mcp_service.execute_tool_calls_stream(
+                    tool_calls, max_retries=max_retries
+                ):
+                    if event["type"] == "tool_result":
+                        executed += 1
+                        yield {
+                            "type": "tool_call",
+                            "tool": event["tool"],
+                            "result": event["result"],
+                        }
+                    else:
+                        yield event
 
                 if tool_handling_mode == ToolHandlingMode.COMPLETE_WITH_RESULTS:
                     yield {
                         "type": "content",
-                        "content": f"\n\n[Tool calls completed: {len(tool_calls_executed)} tools executed]",
+                        "content": f"\n\n[Tool calls completed: {executed} tools executed]",
                     }
 
         except Exception as e:
+            if timing is None:
+                llm_metrics.record_error(timer)
             logger.error(f"Streaming chat completion failed: {e}")
             yield {"type": "error", "error": str(e)}
 
+    def _parse_tool_arguments(self, fragments: List[str]) -> Dict[str, Any]:
+        raw = "".join(fragments)
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid tool call arguments {raw!r}: {e}")
+            return {}
+
     async def _execute_tool_calls(self, tool_calls) -> List[Dict[str, Any]]:
         #try:
         print("TOOL_CALLS", tool_calls)
@@ -375,7 +469,8 @@ class OpenAIClient:
                 }
             )
         print("ASDFASDF", tools)
-        results = await self.mcp_service.execute_tool_calls(tools)
+        with span("chat.tool_calls", {"tool.count": len(tools)}):
+            results = await self.mcp_service.execute_tool_calls(tools)
         print("execute_tool_call rES", results)
         formatted_results = []
         for result in results:
@@ -565,11 +660,16 @@ class OpenAIClient:
             log_details=True,
         )
         async def _create_embedding():
+            start = time.perf_counter()
             response = await self.client.embeddings.create(
                 model=settings.openai_embedding_model,
                 input=text.strip(),
                 encoding_format="float",
             )
+            embedding_request_seconds.labels("single").observe(
+                time.perf_counter() - start
+            )
+            embedding_batch_size.observe(1)
             return response.data[0].embedding
 
         embedding = await _create_embedding()
@@ -596,9 +696,14 @@ class OpenAIClient:
 
         @tool_operation(enable_caching=False, log_details=True)
         async def _create_batch_embeddings():
+            start = time.perf_counter()
             response = await self.client.embeddings.create(
                 model=settings.openai_embedding_model, input=valid_texts
             )
+            embedding_request_seconds.labels("batch").observe(
+                time.perf_counter() - start
+            )
+            embedding_batch_size.observe(len(valid_texts))
             return [item.embedding for item in response.data]
 
         return await _create_batch_embeddings()
@@ -0,0 +1,213 @@
+"""Authenticated principal lookup with a short-lived cache.
+
+Resolving a bearer token to its user would otherwise cost a full User SELECT
+on every authenticated request. Principals are cached for
+``principal_cache_ttl`` seconds, keyed by the token's subject and issued-at
+time, and evicted as soon as the user changes. Changes are broadcast to the
+other workers with PostgreSQL LISTEN/NOTIFY so their caches are evicted too.
+The LISTEN connection is a dedicated asyncpg connection held for the life of
+the worker, outside the application's connection pool.
+"""
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.user import User
+from app.utils.caching import principal_cache
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel carrying the ids of changed users
+PRINCIPAL_CHANNEL = "principal_invalidation"
+
+# Delay before reconnecting a lost LISTEN connection
+_LISTEN_RETRY_SECONDS = 5.0
+
+# Incremented on every invalidation so lookups that started before it
+# are not cached
+_generation = 0
+
+_listener_task: Optional[asyncio.Task] = None
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user as seen by endpoints.
+
+    A detached snapshot of the user's identity and permissions; it carries
+    the User attributes endpoints read but is not bound to any session.
+    """
+
+    id: int
+    username: str
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+    is_superuser: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Build a principal from a User row."""
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            created_at=user.created_at,
+        )
+
+
+async def _load_principal(username: str) -> Optional[Principal]:
+    from app.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(User).where(User.username == username))
+        user = result.scalar_one_or_none()
+        return Principal.from_user(user) if user else None
+
+
+async def get_principal(payload: Dict[str, Any]) -> Optional[Principal]:
+    """Resolve a verified token payload to its principal.
+
+    Args:
+        payload: Decoded JWT claims; ``sub`` holds the username
+
+    Returns:
+        Optional[Principal]: The user's principal, or None if it does not exist
+
+    """
+    username = payload.get("sub")
+    if not username:
+        return None
+
+    generation = _generation
+    principal, _ = await principal_cache.get_or_compute(
+        f"{username}:{payload.get('iat', '')}",
+        lambda: _load_principal(username),
+        should_cache=lambda p: (
+            p is not None and p.is_active and generation == _generation
+        ),
+    )
+    return principal
+
+
+async def invalidate_principal(user_id: int) -> int:
+    """Evict a user's cached principals in this worker."""
+    global _generation
+
+    _generation += 1
+    return await principal_cache.delete_where(lambda p: p.id == user_id)
+
+
+async def invalidate_all_principals() -> None:
+    """Evict every cached principal in this worker."""
+    global _generation
+
+    _generation += 1
+    await principal_cache.clear()
+
+
+async def publish_principal_change(session: AsyncSession, user_id: int) -> None:
+    """Announce a user change to all workers when session commits.
+
+    NOTIFY is transactional, so nothing is sent if the transaction rolls
+    back. The caller still evicts its own worker's cache after the commit
+    with invalidate_principal() so its next request sees the change.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    await session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": PRINCIPAL_CHANNEL, "payload": str(user_id)},
+    )
+
+
+def _on_notification(connection, pid, channel, payload):
+    try:
+        user_id = int(payload)
+    except ValueError:
+        logger.warning(f"Ignoring malformed principal invalidation: {payload!r}")
+        return
+    asyncio.get_running_loop().create_task(invalidate_principal(user_id))
+
+
+def _listen_dsn() -> str:
+    """Return the database URL as a plain asyncpg DSN."""
+    url = make_url(settings.database_url).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+async def _listen_loop():
+    import asyncpg
+
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(
+                _listen_dsn(),
+                server_settings={"application_name": "principal-listener"},
+            )
+            lost = asyncio.Event()
+
+            def on_lost(_, lost: asyncio.Event = lost) -> None:
+                lost.set()
+
+            conn.add_termination_listener(on_lost)
+            await conn.add_listener(PRINCIPAL_CHANNEL, _on_notification)
+            try:
+                # Changes may have been missed while disconnected
+                await invalidate_all_principals()
+                await lost.wait()
+            finally:
+                conn.remove_termination_listener(on_lost)
+                if not conn.is_closed():
+                    await conn.remove_listener(PRINCIPAL_CHANNEL, _on_notification)
+            logger.warning("Principal invalidation listener connection lost")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Principal invalidation listener failed: {e}")
+        finally:
+            if conn is not None and not conn.is_closed():
+                conn.terminate()
+        await asyncio.sleep(_LISTEN_RETRY_SECONDS)
+
+
+async def start_principal_listener():
+    """Start listening for principal invalidations from other workers.
+
+    Only PostgreSQL supports LISTEN/NOTIFY; with other databases cached
+    principals expire after principal_cache_ttl.
+    """
+    global _listener_task
+
+    from app.database import engine
+
+    if engine.dialect.name != "postgresql" or _listener_task is not None:
+        return
+    _listener_task = asyncio.create_task(_listen_loop())
+    logger.info("Principal invalidation listener started")
+
+
+async def stop_principal_listener():
+    """Stop the principal invalidation listener."""
+    global _listener_task
+
+    if _listener_task is None:
+        return
+    _listener_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await _listener_task
+    _listener_task = None
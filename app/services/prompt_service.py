@@ -152,7 +152,7 @@ class PromptService(BaseService):
 
             # If we deleted the default prompt, assign a new default
             if was_default:
-                await self._ensure_default_prompt()
+                await self.ensure_default_prompt()
 
             self._log_operation_success(operation, name=name)
             return True
@@ -224,7 +224,7 @@ class PromptService(BaseService):
             if result > 0:
                 # If we deactivated the default prompt, assign a new default
                 if was_default:
-                    await self._ensure_default_prompt()
+                    await self.ensure_default_prompt()
 
                 self._log_operation_success(operation, name=name)
                 return True
@@ -322,7 +322,7 @@ class PromptService(BaseService):
             "total_tags": len(await self.get_all_tags()),
         }
 
-    async def _ensure_default_prompt(self) -> bool:
+    async def ensure_default_prompt(self) -> bool:
         """Ensure there is at least one default prompt active."""
         operation = "ensure_default_prompt"
         self._log_operation_start(operation)
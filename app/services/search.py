@@ -37,16 +37,49 @@ from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy import and_, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
 from app.core.exceptions import NotFoundError, SearchError
-from app.models.document import Document, DocumentChunk
+from app.core.tracing import span
+from app.models.document import CHUNK_SEARCH_VECTOR, Document, DocumentChunk
 from app.services.base import BaseService
 from app.services.embedding import EmbeddingService
+from app.utils.text_search import ts_match, ts_query, ts_rank
 from shared.schemas.document import DocumentChunkResponse, DocumentSearchRequest
 
 logger = logging.getLogger(__name__)
 
+# Columns needed to build a DocumentChunkResponse; search queries project only
+# these instead of loading full chunk and document rows
+_CHUNK_RESULT_COLUMNS = (
+    DocumentChunk.id,
+    DocumentChunk.content,
+    DocumentChunk.chunk_index,
+    DocumentChunk.start_offset,
+    DocumentChunk.end_offset,
+    DocumentChunk.token_count,
+    DocumentChunk.document_id,
+    DocumentChunk.created_at,
+    Document.title.label("document_title"),
+    Document.metainfo,
+)
+
+
+def _chunk_response(row, similarity_score: float) -> DocumentChunkResponse:
+    """Build a chunk search result from a row selected with _CHUNK_RESULT_COLUMNS."""
+    return DocumentChunkResponse(
+        id=row.id,
+        content=row.content,
+        chunk_index=row.chunk_index,
+        start_char=row.start_offset,
+        end_char=row.end_offset,
+        token_count=row.token_count,
+        document_id=row.document_id,
+        document_title=row.document_title,
+        similarity_score=similarity_score,
+        metainfo=row.metainfo,
+        created_at=row.created_at,
+    )
+
 
 # ----- In-memory LRU cache for embeddings -----
 class LRUCache:
@@ -158,7 +191,8 @@ class SearchService(BaseService):
             else:
                 return cached
 
-        embedding = await self.embedding_service.generate_embedding(query)
+        with span("search.embed_query"):
+            embedding = await self.embedding_service.generate_embedding(query)
         if embedding:
             # Validate embedding before caching
             if not isinstance(embedding, list):
@@ -219,9 +253,8 @@ class SearchService(BaseService):
 
         # Pre-filter user_id before vector op!
         query = (
-            select(DocumentChunk, distance_expr)
+            select(*_CHUNK_RESULT_COLUMNS, distance_expr)
             .join(Document, DocumentChunk.document_id == Document.id)
-            .options(joinedload(DocumentChunk.document))
             .where(Document.owner_id == user_id)
             .where(DocumentChunk.embedding.isnot(None))
         )
@@ -238,11 +271,12 @@ class SearchService(BaseService):
             .limit(request.limit)
         )
 
-        result = await self.db.execute(query)
-        rows = result.fetchall()
+        with span("search.vector_sql", {"search.limit": request.limit}):
+            result = await self.db.execute(query)
+            rows = result.fetchall()
 
         # Normalize scores to [0, 1]
-        distances = [distance for _, distance in rows]
+        distances = [row.distance for row in rows]
         max_distance = max(distances, default=1.0)
         min_distance = min(distances, default=0.0)
 
@@ -251,56 +285,29 @@ class SearchService(BaseService):
                 (d - min_distance) / (max_distance - min_distance + 1e-8)
             )  # [0,1], higher is better
 
-        results = []
-        for chunk, distance in rows:
-            similarity_score = norm(distance)
-
-            # Create DocumentChunkResponse directly with explicit field assignment
-            chunk_response = DocumentChunkResponse(
-                id=chunk.id,
-                content=chunk.content,
-                chunk_index=chunk.chunk_index,
-                start_char=chunk.start_offset,
-                end_char=chunk.end_offset,
-                token_count=chunk.token_count,
-                document_id=chunk.document_id,
-                document_title=chunk.document.title,
-                similarity_score=similarity_score,
-                metainfo=chunk.document.metainfo,
-                created_at=chunk.created_at,
-            )
-
-            results.append(chunk_response)
-        return results
+        return [_chunk_response(row, norm(row.distance)) for row in rows]
 
     async def _text_search(
         self, request: DocumentSearchRequest, user_id: int
     ) -> List[DocumentChunkResponse]:
-        """Full-text search using Postgres GIN index and tsvector column.
+        """Full-text search using Postgres GIN index on the chunk tsvector.
 
-        - Uses plainto_tsquery and tsvector column (content_tsv) for performance.
+        - Uses websearch_to_tsquery and the indexed CHUNK_SEARCH_VECTOR expression.
         - Uses BM25 ranking (if pg_bm25 is installed), else fallback to ts_rank_cd.
         """
-        ts_query = func.plainto_tsquery("english", request.query)
+        tsquery = ts_query(request.query)
         # Check support for bm25
         bm25_supported = await self.check_bm25_support()
         if bm25_supported:
-            rank_expr = func.bm25(
-                func.to_tsvector("english", DocumentChunk.content), ts_query
-            ).label("rank")
+            rank_expr = func.bm25(CHUNK_SEARCH_VECTOR, tsquery).label("rank")
         else:
-            rank_expr = func.ts_rank_cd(
-                func.to_tsvector("english", DocumentChunk.content), ts_query
-            ).label("rank")
+            rank_expr = ts_rank(CHUNK_SEARCH_VECTOR, tsquery).label("rank")
 
         query = (
-            select(DocumentChunk, rank_expr)
+            select(*_CHUNK_RESULT_COLUMNS, rank_expr)
             .join(Document, DocumentChunk.document_id == Document.id)
-            .options(joinedload(DocumentChunk.document))
             .where(Document.owner_id == user_id)
-            .where(
-                func.to_tsvector("english", DocumentChunk.content).op("@@")(ts_query)
-            )
+            .where(ts_match(CHUNK_SEARCH_VECTOR, tsquery))
         )
         if request.document_ids:
             query = query.where(Document.id.in_(request.document_ids))
@@ -309,11 +316,12 @@ class SearchService(BaseService):
 
         query = query.order_by(rank_expr.desc()).limit(request.limit)
 
-        result = await self.db.execute(query)
-        rows = result.fetchall()
+        with span("search.text_sql", {"search.limit": request.limit}):
+            result = await self.db.execute(query)
+            rows = result.fetchall()
 
         # Normalize rank to [0,1]
-        ranks = [float(rank) for _, rank in rows]
+        ranks = [float(row.rank) for row in rows]
         max_rank = max(ranks, default=1.0)
         min_rank = min(ranks, default=0.0)
 
@@ -321,24 +329,10 @@ class SearchService(BaseService):
             return (r - min_rank) / (max_rank - min_rank + 1e-8)
 
         results = []
-        for chunk, rank in rows:
-            score = norm(float(rank))
+        for row in rows:
+            score = norm(float(row.rank))
             if score >= request.threshold:
-                # Create DocumentChunkResponse directly with explicit field assignment
-                chunk_response = DocumentChunkResponse(
-                    id=chunk.id,
-                    content=chunk.content,
-                    chunk_index=chunk.chunk_index,
-                    start_char=chunk.start_offset,
-                    end_char=chunk.end_offset,
-                    token_count=chunk.token_count,
-                    document_id=chunk.document_id,
-                    document_title=chunk.document.title,
-                    similarity_score=score,
-                    metainfo=chunk.document.metainfo,
-                    created_at=chunk.created_at,
-                )
-                results.append(chunk_response)
+                results.append(_chunk_response(row, score))
         results.sort(key=lambda x: x.similarity_score or 0, reverse=True)
 
         return results[: request.limit]
@@ -475,16 +469,16 @@ class SearchService(BaseService):
         """
         try:
             chunk_result = await self.db.execute(
-                select(DocumentChunk)
+                select(DocumentChunk.embedding)
                 .join(Document, DocumentChunk.document_id == Document.id)
                 .where(and_(DocumentChunk.id == chunk_id, Document.owner_id == user_id))
             )
-            reference_chunk = chunk_result.scalar_one_or_none()
-            if not reference_chunk or not reference_chunk.embedding:
+            reference_embedding = chunk_result.scalar_one_or_none()
+            if reference_embedding is None:
                 raise NotFoundError("Reference chunk not found or has no embedding")
-            distance_expr = DocumentChunk.embedding.op("<=>")(reference_chunk.embedding)
+            distance_expr = DocumentChunk.embedding.op("<=>")(reference_embedding)
             query = (
-                select(DocumentChunk, distance_expr.label("distance"))
+                select(*_CHUNK_RESULT_COLUMNS, distance_expr.label("distance"))
                 .join(Document, DocumentChunk.document_id == Document.id)
                 .where(Document.owner_id == user_id)
                 .where(DocumentChunk.id != chunk_id)
@@ -496,7 +490,7 @@ class SearchService(BaseService):
             result = await self.db.execute(query)
             rows = result.fetchall()
 
-            distances = [distance for _, distance in rows]
+            distances = [row.distance for row in rows]
             max_distance = max(distances, default=1.0)
             min_distance = min(distances, default=0.0)
 
@@ -504,13 +498,12 @@ class SearchService(BaseService):
                 return 1.0 - ((d - min_distance) / (max_distance - min_distance + 1e-8))
 
             results = []
-            for chunk, distance in rows:
-                similarity_score = norm(distance)
-                chunk_response = DocumentChunkResponse.model_validate(chunk)
-                chunk_response.similarity_score = similarity_score
+            for row in rows:
+                similarity_score = norm(row.distance)
+                chunk_response = _chunk_response(row, similarity_score)
                 chunk_response.search_meta = {
                     "method": "vector",
-                    "distance": float(distance),
+                    "distance": float(row.distance),
                     "normalized_similarity": similarity_score,
                 }
                 results.append(chunk_response)
@@ -12,12 +12,18 @@ from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import AuthenticationError, NotFoundError, ValidationError
+from app.core.exceptions import (
+    AuthenticationError,
+    NotFoundError,
+    RateLimitError,
+    ValidationError,
+)
 from app.models.conversation import Conversation
 from app.models.document import Document
 from app.models.user import User
 from app.services.base import BaseService
-from app.utils.security import get_password_hash, verify_password
+from app.services.principal import invalidate_principal, publish_principal_change
+from app.utils.security import check_password, hash_password
 from app.utils.timestamp import utcnow
 from shared.schemas.user import UserUpdate
 
@@ -92,7 +98,7 @@ class UserService(BaseService):
                 raise ValidationError("Email already exists")
 
             # Create new user
-            hashed_password = get_password_hash(password)
+            hashed_password = await hash_password(password)
 
             user = User(
                 username=username,
@@ -116,7 +122,7 @@ class UserService(BaseService):
 
             return user
 
-        except ValidationError:
+        except (ValidationError, RateLimitError):
             raise
         except Exception as e:
             self._log_operation_error(operation, e, username=username, email=email)
@@ -290,7 +296,7 @@ class UserService(BaseService):
                 original_values["is_active"] = user.is_active
                 user.is_active = user_update.is_active
 
-            await self.db.commit()
+            await self._commit_principal_change(user_id)
             await self.db.refresh(user)
 
             self._log_operation_success(
@@ -368,7 +374,7 @@ class UserService(BaseService):
                 raise NotFoundError(f"User not found with ID: {user_id}")
 
             # Verify current password for security
-            if not verify_password(current_password, user.hashed_password):
+            if not await check_password(current_password, user.hashed_password):
                 self.logger.warning(
                     "Invalid current password provided",
                     user_id=str(user_id),
@@ -377,7 +383,7 @@ class UserService(BaseService):
                 raise AuthenticationError("Current password is incorrect")
 
             # Update to new password with secure hashing
-            user.hashed_password = get_password_hash(new_password)
+            user.hashed_password = await hash_password(new_password)
             await self.db.commit()
 
             self._log_operation_success(
@@ -451,11 +457,76 @@ class UserService(BaseService):
 
         # Delete user (cascades to related data)
         await self.db.delete(user)
-        await self.db.commit()
+        await self._commit_principal_change(user_id)
 
         logger.info(f"User deleted: {user.username}")
         return True
 
+    async def set_user_active(self, user_id: int, is_active: bool) -> User:
+        """Activate or deactivate a user account.
+
+        Args:
+            user_id: User ID to update
+            is_active: New account status
+
+        Returns:
+            User: Updated user
+
+        Raises:
+            NotFoundError: If user not found
+            ValidationError: If the account already has that status
+
+        """
+        user = await self.get_user_by_id(user_id)
+        if user.is_active == is_active:
+            state = "active" if is_active else "inactive"
+            raise ValidationError(f"User is already {state}")
+
+        user.is_active = is_active
+        await self._commit_principal_change(user_id)
+
+        logger.info(
+            f"User {'activated' if is_active else 'deactivated'}: {user.username}"
+        )
+        return user
+
+    async def set_user_superuser(self, user_id: int, is_superuser: bool) -> User:
+        """Promote a user to superuser or demote them to a regular user.
+
+        Args:
+            user_id: User ID to update
+            is_superuser: New superuser status
+
+        Returns:
+            User: Updated user
+
+        Raises:
+            NotFoundError: If user not found
+            ValidationError: If the user already has that status
+
+        """
+        user = await self.get_user_by_id(user_id)
+        if user.is_superuser == is_superuser:
+            raise ValidationError(
+                "User is already a superuser"
+                if is_superuser
+                else "User is not a superuser"
+            )
+
+        user.is_superuser = is_superuser
+        await self._commit_principal_change(user_id)
+
+        logger.info(
+            f"User {'promoted' if is_superuser else 'demoted'}: {user.username}"
+        )
+        return user
+
+    async def _commit_principal_change(self, user_id: int) -> None:
+        """Commit a change to a user and evict their cached principals everywhere."""
+        await publish_principal_change(self.db, user_id)
+        await self.db.commit()
+        await invalidate_principal(user_id)
+
     async def get_user_by_id(self, user_id: int) -> User:
         """Get user by ID.
 
@@ -491,7 +562,7 @@ class UserService(BaseService):
         user = await self.get_user_by_id(user_id)
 
         # Hash the new password
-        hashed_password = self.password_handler.hash(new_password)
+        hashed_password = await hash_password(new_password)
 
         # Update user password
         user.hashed_password = hashed_password
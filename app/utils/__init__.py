@@ -6,9 +6,11 @@ optimization, error handling, and advanced processing capabilities.
 """
 
 from app.utils.security import (
+    check_password,
     generate_secret_key,
     generate_token,
     get_password_hash,
+    hash_password,
     verify_password,
 )
 from app.utils.text_processing import TextProcessor
@@ -19,6 +21,8 @@ __all__ = [
     "StructuredLogger",
     "get_password_hash",
     "verify_password",
+    "hash_password",
+    "check_password",
     "generate_secret_key",
     "generate_token",
     "TextProcessor",
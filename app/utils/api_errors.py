@@ -17,6 +17,7 @@ from app.core.exceptions import (
     DocumentError,
     ExternalServiceError,
     NotFoundError,
+    RateLimitError,
     SearchError,
     ValidationError,
 )
@@ -122,6 +123,25 @@ def handle_api_errors(
                     error_details=e.details if include_details else None,
                 )
 
+            except RateLimitError as e:
+                if log_errors:
+                    logger.warning(
+                        f"Rate limit exceeded in {func.__name__}",
+                        extra={
+                            "error": str(e),
+                            "endpoint": func.__name__,
+                        },
+                    )
+                response = ErrorResponse.create(
+                    error_code="RATE_LIMIT_ERROR",
+                    message=e.message,
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    error_details=e.details if include_details else None,
+                )
+                if e.details and "retry_after" in e.details:
+                    response.headers["Retry-After"] = str(e.details["retry_after"])
+                return response
+
             except (DocumentError, SearchError) as e:
                 if log_errors:
                     logger.error(
@@ -7,9 +7,13 @@ and other frequently accessed data.
 
 import asyncio
 import hashlib
+import json
 import logging
 import time
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -117,10 +121,180 @@ class SimpleCache:
         }
 
 
+def _retrieve_exception(task: "asyncio.Future[Any]") -> None:
+    """Mark a failure as handled when no caller is left waiting for it."""
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlightLRUCache:
+    """Bounded LRU cache with TTL and single-flight request coalescing.
+
+    Concurrent lookups for the same missing key share a single execution of the
+    value factory instead of each computing it. The factory runs in its own
+    task, so a caller that is cancelled does not abort it for the others. All
+    state is only touched from the event loop, so no lock is needed.
+    """
+
+    def __init__(self, default_ttl: int = 300, max_size: int = 1000):
+        """Initialize cache.
+
+        Args:
+            default_ttl: Default time-to-live in seconds
+            max_size: Maximum number of items to cache
+
+        """
+        self._cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _lookup(self, key: str) -> tuple[bool, Any]:
+        item = self._cache.get(key)
+        if item is None:
+            return False, None
+        expires_at, value = item
+        if time.monotonic() > expires_at:
+            del self._cache[key]
+            return False, None
+        self._cache.move_to_end(key)
+        return True, value
+
+    def _store(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        self._cache[key] = (time.monotonic() + (ttl or self.default_ttl), value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get item from cache."""
+        found, value = self._lookup(key)
+        if found:
+            self.hits += 1
+            return value
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Set item in cache."""
+        self._store(key, value, ttl)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+    ) -> tuple[Any, bool]:
+        """Return the cached value for key, computing it at most once.
+
+        Args:
+            key: Cache key
+            factory: Coroutine function producing the value on a miss
+            ttl: Time-to-live override for the computed value
+            should_cache: Optional predicate deciding whether a value is stored
+
+        Returns:
+            tuple: (value, True if served from cache or a shared execution)
+
+        """
+        found, value = self._lookup(key)
+        if found:
+            self.hits += 1
+            return value, True
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight), True
+
+        self.misses += 1
+        # Every caller, the first included, waits on a shielded task, so a
+        # cancelled caller never cancels the computation others wait for
+        task = asyncio.ensure_future(self._compute(key, factory, ttl, should_cache))
+        task.add_done_callback(_retrieve_exception)
+        self._inflight[key] = task
+        return await asyncio.shield(task), False
+
+    async def _compute(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        should_cache: Optional[Callable[[Any], bool]],
+    ) -> Any:
+        try:
+            value = await factory()
+            if should_cache is None or should_cache(value):
+                self._store(key, value, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def delete(self, key: str) -> bool:
+        """Delete item from cache."""
+        return self._cache.pop(key, None) is not None
+
+    async def delete_prefix(self, prefix: str) -> int:
+        """Delete all items whose key starts with prefix and return count removed."""
+        keys = [key for key in self._cache if key.startswith(prefix)]
+        for key in keys:
+            del self._cache[key]
+        return len(keys)
+
+    async def delete_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Delete all items whose value matches predicate and return count removed."""
+        keys = [key for key, (_, value) in self._cache.items() if predicate(value)]
+        for key in keys:
+            del self._cache[key]
+        return len(keys)
+
+    async def clear(self) -> None:
+        """Clear all items from cache."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def cleanup_expired(self) -> int:
+        """Remove expired items and return count removed."""
+        now = time.monotonic()
+        expired_keys = [key for key, (exp, _) in self._cache.items() if now > exp]
+        for key in expired_keys:
+            del self._cache[key]
+        return len(expired_keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        total_requests = self.hits + self.misses + self.coalesced
+        hit_rate = (
+            (self.hits + self.coalesced) / total_requests if total_requests > 0 else 0
+        )
+
+        return {
+            "size": len(self._cache),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+            "hit_rate": hit_rate,
+        }
+
+
 # Global cache instances
 embedding_cache = SimpleCache(default_ttl=3600, max_size=5000)  # 1 hour TTL
 api_response_cache = SimpleCache(default_ttl=300, max_size=1000)  # 5 minute TTL
 search_result_cache = SimpleCache(default_ttl=600, max_size=2000)  # 10 minute TTL
+tool_result_cache = SingleFlightLRUCache(
+    default_ttl=settings.mcp_tool_cache_ttl, max_size=settings.mcp_tool_cache_size
+)
+principal_cache = SingleFlightLRUCache(
+    default_ttl=settings.principal_cache_ttl, max_size=settings.principal_cache_size
+)
 
 
 def make_cache_key(*args, **kwargs) -> str:
@@ -142,6 +316,43 @@ def make_cache_key(*args, **kwargs) -> str:
     return hashlib.sha256(key_string.encode()).hexdigest()
 
 
+def canonicalize_arguments(
+    arguments: Optional[Dict[str, Any]],
+    key_params: Optional[Iterable[str]] = None,
+    normalization: str = "exact",
+) -> str:
+    """Serialize call arguments into a stable string for cache keys.
+
+    Args:
+        arguments: Call arguments
+        key_params: Argument names that participate in the key (None = all)
+        normalization: "exact" keeps values as-is; "casefold" strips and
+            lower-cases string values so trivially different inputs share a key
+
+    Returns:
+        str: Canonical JSON representation of the selected arguments
+
+    """
+    arguments = arguments or {}
+    if key_params is not None:
+        wanted = set(key_params)
+        arguments = {k: v for k, v in arguments.items() if k in wanted}
+
+    def _normalize(value: Any) -> Any:
+        if isinstance(value, str):
+            return value.strip().casefold()
+        if isinstance(value, dict):
+            return {k: _normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [_normalize(v) for v in value]
+        return value
+
+    if normalization == "casefold":
+        arguments = _normalize(arguments)
+
+    return json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+
+
 async def cached_function(cache: SimpleCache, ttl: Optional[int] = None):
     """Cache function results.
 
@@ -187,6 +398,8 @@ async def start_cache_cleanup_task():
                     ("embedding", embedding_cache),
                     ("api_response", api_response_cache),
                     ("search_result", search_result_cache),
+                    ("tool_result", tool_result_cache),
+                    ("principal", principal_cache),
                 ]:
                     removed = await cache.cleanup_expired()
                     if removed > 0:
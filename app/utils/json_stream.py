@@ -0,0 +1,141 @@
+"""Incremental JSON reading for large uploads.
+
+Provides a small pull parser over an async byte stream that walks objects and
+arrays one element at a time, so multi-megabyte import files can be processed
+with memory bounded by the largest single element rather than the whole file.
+"""
+
+import codecs
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+_WHITESPACE = " \t\r\n"
+
+
+class JSONStreamReader:
+    """Pull parser for JSON documents read from an async byte source.
+
+    Containers are walked with iter_object()/iter_array(); everything else is
+    decoded with read_value(). Each key yielded by iter_object() leaves the
+    reader positioned at its value, which the caller must consume (with
+    read_value() or a nested iterator) before the next key is requested.
+    """
+
+    def __init__(
+        self, read: Callable[[int], Awaitable[bytes]], chunk_size: int = 65536
+    ):
+        """Initialize reader.
+
+        Args:
+            read: Async callable returning up to n bytes, b"" at end of input
+                (e.g. UploadFile.read)
+            chunk_size: Number of bytes requested per read
+
+        """
+        self._read = read
+        self._chunk_size = chunk_size
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    async def _fill(self, min_chars: int = 1) -> bool:
+        """Buffer at least min_chars more characters; return False at end of input."""
+        if self._pos > self._chunk_size:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        added = 0
+        while added < min_chars and not self._eof:
+            data = await self._read(self._chunk_size)
+            if data:
+                text = self._utf8.decode(data)
+            else:
+                self._eof = True
+                text = self._utf8.decode(b"", final=True)
+            self._buffer += text
+            added += len(text)
+        return added > 0
+
+    async def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it.
+
+        Returns:
+            str: Next character, or an empty string at end of input
+
+        """
+        while True:
+            while (
+                self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE
+            ):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not await self._fill():
+                return ""
+
+    async def _expect(self, char: str) -> None:
+        found = await self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found or 'end of input'}'")
+        self._pos += 1
+
+    async def _end_of_item(self, closing: str) -> bool:
+        """Consume a separator; return True when the container closes."""
+        char = await self.peek()
+        self._pos += 1
+        if char == closing:
+            return True
+        if char != ",":
+            raise ValueError(f"Expected ',' or '{closing}' but found '{char or 'end of input'}'")
+        return False
+
+    async def read_value(self) -> Any:
+        """Decode and return the complete JSON value at the current position."""
+        await self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                # Value spans beyond the buffer: at least double what is pending
+                await self._fill(len(self._buffer) - self._pos + 1)
+                continue
+            if end == len(self._buffer) and not self._eof:
+                # A number may continue in the next chunk
+                await self._fill()
+                continue
+            self._pos = end
+            return value
+
+    async def iter_array(self) -> AsyncIterator[Any]:
+        """Yield the decoded elements of the array at the current position."""
+        await self._expect("[")
+        if await self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield await self.read_value()
+            if await self._end_of_item("]"):
+                return
+
+    async def iter_object(self) -> AsyncIterator[str]:
+        """Yield the keys of the object at the current position."""
+        await self._expect("{")
+        if await self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = await self.read_value()
+            if not isinstance(key, str):
+                raise ValueError("Object keys must be strings")
+            await self._expect(":")
+            yield key
+            if await self._end_of_item("}"):
+                return
+
+    async def iter_values(self) -> AsyncIterator[Any]:
+        """Yield consecutive top-level values (JSON Lines / concatenated JSON)."""
+        while await self.peek():
+            yield await self.read_value()
@@ -0,0 +1,271 @@
+"""Lightweight in-process metric primitives.
+
+Provides fixed-bucket histograms with constant memory usage, suitable for
+recording latencies on hot paths and exporting cumulative bucket counts, and
+time-windowed variants that keep one slot per interval so recent windows
+(e.g. the last 1, 5 or 60 minutes) can be reported without storing
+individual observations.
+"""
+
+import bisect
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Default latency buckets in seconds (1ms .. 60s)
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+# Default size buckets for counts such as items per batch
+SIZE_BUCKETS: Tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+def exponential_buckets(start: float, factor: float, count: int) -> Tuple[float, ...]:
+    """Return count bucket bounds growing geometrically from start.
+
+    Log-spaced buckets bound the relative error of quantile estimates by the
+    growth factor, independent of the value's magnitude.
+    """
+    return tuple(start * factor**i for i in range(count))
+
+
+# Log-spaced latency buckets in seconds (0.5ms .. ~106s, 25% growth)
+LATENCY_LOG_BUCKETS: Tuple[float, ...] = exponential_buckets(0.0005, 1.25, 56)
+
+
+class Histogram:
+    """Fixed-bucket histogram with constant memory usage.
+
+    Observations are counted into the first bucket whose upper bound is
+    greater than or equal to the value; values above the largest bound go
+    into an implicit +Inf bucket.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS):
+        """Initialize histogram.
+
+        Args:
+            buckets: Increasing bucket upper bounds
+
+        """
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                fraction = (rank - cumulative) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max)
+            cumulative += bucket_count
+        return self.max
+
+    def cumulative_buckets(self) -> List[Tuple[float, int]]:
+        """Return (upper bound, cumulative count) pairs including +Inf."""
+        result = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += bucket_count
+            result.append((bound, cumulative))
+        return result
+
+    def merge(self, other: "Histogram") -> None:
+        """Add another histogram's observations; buckets must match."""
+        if other.buckets != self.buckets:
+            raise ValueError("Cannot merge histograms with different buckets")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        if other.max > self.max:
+            self.max = other.max
+
+    def reset(self) -> None:
+        """Clear all observations."""
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return summary statistics for reporting."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class WindowedHistogram:
+    """Histogram over a sliding time window, kept as one slot per interval.
+
+    Observations go into the slot for the current interval; a slot is reset
+    when its interval comes around again, so memory is bounded by the number
+    of slots. Windows of whole intervals up to the full window are reported
+    by merging the slots they cover. Slots are allocated on first use.
+    """
+
+    def __init__(
+        self,
+        buckets: Iterable[float] = LATENCY_LOG_BUCKETS,
+        interval: float = 60.0,
+        slots: int = 60,
+    ):
+        """Initialize windowed histogram.
+
+        Args:
+            buckets: Increasing bucket upper bounds
+            interval: Slot length in seconds
+            slots: Number of slots; the window covers interval * slots seconds
+
+        """
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.interval = interval
+        self._slots: List[Optional[Histogram]] = [None] * slots
+        self._epochs: List[int] = [-1] * slots
+
+    def observe(self, value: float, now: Optional[float] = None) -> None:
+        """Record a single observation."""
+        epoch = int((time.time() if now is None else now) // self.interval)
+        index = epoch % len(self._slots)
+        slot = self._slots[index]
+        if slot is None:
+            slot = self._slots[index] = Histogram(self.buckets)
+        elif self._epochs[index] != epoch:
+            slot.reset()
+        self._epochs[index] = epoch
+        slot.observe(value)
+
+    def window(self, intervals: int, now: Optional[float] = None) -> Histogram:
+        """Return a histogram of the last intervals slots (current included)."""
+        current = int((time.time() if now is None else now) // self.interval)
+        oldest = current - min(intervals, len(self._slots)) + 1
+        merged = Histogram(self.buckets)
+        for slot, epoch in zip(self._slots, self._epochs):
+            if slot is not None and oldest <= epoch <= current:
+                merged.merge(slot)
+        return merged
+
+
+class WindowedCounter:
+    """Event counter over a sliding time window, kept as one slot per interval."""
+
+    def __init__(self, interval: float = 60.0, slots: int = 60):
+        """Initialize windowed counter.
+
+        Args:
+            interval: Slot length in seconds
+            slots: Number of slots; the window covers interval * slots seconds
+
+        """
+        self.interval = interval
+        self._counts: List[int] = [0] * slots
+        self._epochs: List[int] = [-1] * slots
+
+    def add(self, amount: int = 1, now: Optional[float] = None) -> None:
+        """Count events in the current interval."""
+        epoch = int((time.time() if now is None else now) // self.interval)
+        index = epoch % len(self._counts)
+        if self._epochs[index] != epoch:
+            self._counts[index] = 0
+            self._epochs[index] = epoch
+        self._counts[index] += amount
+
+    def total(self, intervals: int, now: Optional[float] = None) -> int:
+        """Return the events counted in the last intervals slots."""
+        current = int((time.time() if now is None else now) // self.interval)
+        oldest = current - min(intervals, len(self._counts)) + 1
+        return sum(
+            count
+            for count, epoch in zip(self._counts, self._epochs)
+            if oldest <= epoch <= current
+        )
+
+
+class CounterFamily:
+    """Counters of one metric keyed by label values."""
+
+    def __init__(self, label_names: Tuple[str, ...]):
+        """Initialize counter family.
+
+        Args:
+            label_names: Names of the labels identifying each counter
+
+        """
+        self.label_names = label_names
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """Increment the counter for label values."""
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def items(self) -> List[Tuple[Tuple[str, ...], float]]:
+        """Return (label values, count) pairs."""
+        return list(self._values.items())
+
+
+class HistogramFamily:
+    """Histograms of one metric keyed by label values."""
+
+    def __init__(
+        self,
+        label_names: Tuple[str, ...],
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        """Initialize histogram family.
+
+        Args:
+            label_names: Names of the labels identifying each histogram
+            buckets: Increasing bucket upper bounds shared by all histograms
+
+        """
+        self.label_names = label_names
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self._histograms: Dict[Tuple[str, ...], Histogram] = {}
+
+    def labels(self, *label_values: str) -> Histogram:
+        """Return the histogram for label values, creating it on first use."""
+        histogram = self._histograms.get(label_values)
+        if histogram is None:
+            histogram = self._histograms[label_values] = Histogram(self.buckets)
+        return histogram
+
+    def items(self) -> List[Tuple[Tuple[str, ...], Histogram]]:
+        """Return (label values, histogram) pairs."""
+        return list(self._histograms.items())
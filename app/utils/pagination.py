@@ -0,0 +1,162 @@
+"""Keyset (cursor) pagination helpers.
+
+Pages are addressed by an opaque cursor that encodes the (sort key, id) of
+the last row returned. The next page is selected with a row-value comparison
+on (sort key, id) instead of OFFSET, so deep pages cost the same as the first
+and stay stable while rows are inserted ahead of the reader.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationError
+
+# Supported total count modes for paginated listings
+COUNT_MODES = ("exact", "estimate", "none")
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Encode a (sort key, id) position as an opaque URL-safe cursor."""
+    if isinstance(sort_value, datetime):
+        payload = ["dt", sort_value.isoformat(), row_id]
+    else:
+        payload = ["v", sort_value, row_id]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValidationError: If the cursor is malformed
+
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        kind, sort_value, row_id = json.loads(raw)
+        if kind == "dt":
+            sort_value = datetime.fromisoformat(sort_value)
+        if not isinstance(row_id, int):
+            raise ValueError("cursor id must be an integer")
+    except (ValueError, TypeError) as e:
+        raise ValidationError(f"Invalid pagination cursor: {e}")
+    return sort_value, row_id
+
+
+async def paginate_keyset(
+    db: AsyncSession,
+    query: Select,
+    sort_column: Any,
+    id_column: Any,
+    size: int,
+    cursor: Optional[str] = None,
+    page: int = 1,
+    descending: bool = False,
+) -> Tuple[List[Any], Optional[str], bool]:
+    """Fetch one page of ORM entities ordered by (sort key, id).
+
+    Without a cursor the first page is returned, or ``page`` is honoured via
+    OFFSET for clients that still paginate by page number.
+
+    Args:
+        db: Database session
+        query: Filtered select of a single entity
+        sort_column: Primary sort column; NULLs cannot be compared by a
+            cursor, so a nullable column is paginated by page number only
+            and no next cursor is returned
+        id_column: Unique tie-breaker column
+        size: Page size
+        cursor: Cursor returned with the previous page
+        page: Page number used when no cursor is given
+        descending: Sort newest/largest first
+
+    Returns:
+        Tuple of (entities, cursor for the next page or None, whether more
+        rows follow); has_more is also set when no cursor can be returned
+
+    """
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    nullable = getattr(sort_column.expression, "nullable", False)
+    if cursor and nullable:
+        raise ValidationError(
+            f"Cursor pagination is not supported when sorting by '{sort_column.key}'"
+        )
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        position = tuple_(sort_column, id_column)
+        query = query.where(
+            position < tuple_(sort_value, row_id)
+            if descending
+            else position > tuple_(sort_value, row_id)
+        )
+    elif page > 1:
+        query = query.offset((page - 1) * size)
+
+    result = await db.execute(query.limit(size + 1))
+    entities = list(result.scalars().all())
+
+    next_cursor = None
+    has_more = len(entities) > size
+    if has_more:
+        entities = entities[:size]
+        if not nullable:
+            last = entities[-1]
+            next_cursor = encode_cursor(
+                getattr(last, sort_column.key), getattr(last, id_column.key)
+            )
+    return entities, next_cursor, has_more
+
+
+async def estimate_row_count(db: AsyncSession, table_name: str) -> Optional[int]:
+    """Return the planner's row estimate for a table from pg_class.reltuples.
+
+    Returns None when the table has never been analyzed.
+    """
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE relname = :name"),
+        {"name": table_name},
+    )
+    estimate = result.scalar()
+    return estimate if estimate is not None and estimate >= 0 else None
+
+
+async def count_rows(
+    db: AsyncSession,
+    query: Select,
+    mode: str = "exact",
+    table_name: Optional[str] = None,
+) -> Optional[int]:
+    """Count the rows matched by a query according to a count mode.
+
+    Args:
+        db: Database session
+        query: Filtered select whose rows should be counted
+        mode: 'exact' runs COUNT(*), 'none' skips counting, and 'estimate'
+            uses pg_class.reltuples for unfiltered queries on table_name and
+            falls back to an exact count otherwise
+        table_name: Table to estimate when the query has no filters
+
+    Returns:
+        Optional[int]: Row count, or None when not computed
+
+    """
+    if mode == "none":
+        return None
+    if mode == "estimate" and table_name and query.whereclause is None:
+        estimate = await estimate_row_count(db, table_name)
+        if estimate is not None:
+            return estimate
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    result = await db.execute(count_query)
+    return result.scalar() or 0
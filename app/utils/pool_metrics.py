@@ -0,0 +1,110 @@
+"""Database connection pool instrumentation.
+
+Provides an instrumented async queue pool that records checkout wait times,
+timeouts and connection ages, plus snapshot helpers for health endpoints.
+"""
+
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.utils.metrics import Histogram
+
+
+class PoolMetrics:
+    """Metrics collected for a single connection pool."""
+
+    def __init__(self, name: str):
+        """Initialize pool metrics.
+
+        Args:
+            name: Pool name used in reports (e.g. primary, replica)
+
+        """
+        self.name = name
+        self.checkout_wait = Histogram()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connections_created = 0
+        self._connection_created_at: Dict[int, float] = {}
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """Return a report combining recorded metrics and live pool state."""
+        now = time.monotonic()
+        ages = [now - created for created in self._connection_created_at.values()]
+        size = pool.size()
+        max_overflow = getattr(pool, "_max_overflow", 0)
+        capacity = size + max(max_overflow, 0)
+        checked_out = pool.checkedout()
+        return {
+            "size": size,
+            "max_overflow": max_overflow,
+            "checked_out": checked_out,
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "saturation": checked_out / capacity if capacity else 0.0,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connections_created": self.connections_created,
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "connection_age_seconds": {
+                "open": len(ages),
+                "max": max(ages) if ages else 0.0,
+                "avg": sum(ages) / len(ages) if ages else 0.0,
+            },
+        }
+
+
+# Metrics per pool, keyed by the pool's logging name
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times how long checkouts wait for a connection."""
+
+    def _do_get(self):
+        metrics = pool_metrics.get(self._orig_logging_name)
+        if metrics is None:
+            return super()._do_get()
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            metrics.timeouts += 1
+            raise
+        finally:
+            metrics.checkout_wait.observe(time.perf_counter() - start)
+        metrics.checkouts += 1
+        return connection
+
+
+def instrument_pool(pool: Pool, name: str) -> PoolMetrics:
+    """Register metrics and connection lifecycle hooks for a pool.
+
+    Args:
+        pool: Pool to instrument (normally engine.sync_engine.pool)
+        name: Pool name; must match the pool's logging name
+
+    Returns:
+        PoolMetrics: Metrics object updated by the pool
+
+    """
+    metrics = pool_metrics.setdefault(name, PoolMetrics(name))
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connections_created += 1
+        metrics._connection_created_at[id(dbapi_connection)] = time.monotonic()
+
+    @event.listens_for(pool, "close")
+    def _on_close(dbapi_connection, connection_record):
+        metrics._connection_created_at.pop(id(dbapi_connection), None)
+
+    @event.listens_for(pool, "close_detached")
+    def _on_close_detached(dbapi_connection):
+        metrics._connection_created_at.pop(id(dbapi_connection), None)
+
+    return metrics
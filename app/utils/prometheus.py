@@ -0,0 +1,366 @@
+"""Prometheus text format exposition of in-process metrics.
+
+Metrics are read at scrape time from the counters and histograms that the
+request pipeline and services already maintain, so collection adds nothing
+to the request path and makes no system calls. Each worker process reports
+its own metrics; Prometheus aggregates across workers.
+"""
+
+import logging
+import math
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from app.utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+# Content type of the Prometheus text exposition format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Prefix of every exported metric name
+METRICS_NAMESPACE = "chatbot"
+
+Labels = Dict[str, str]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(v))}"' for name, v in labels.items())
+    return "{" + pairs + "}"
+
+
+class MetricsWriter:
+    """Accumulates metric families in the Prometheus text format."""
+
+    def __init__(self, namespace: str = METRICS_NAMESPACE):
+        """Initialize writer.
+
+        Args:
+            namespace: Prefix added to every metric name
+
+        """
+        self.namespace = namespace
+        self._lines: List[str] = []
+
+    def _header(self, name: str, help_text: str, metric_type: str) -> str:
+        full_name = f"{self.namespace}_{name}"
+        self._lines.append(f"# HELP {full_name} {_escape(help_text)}")
+        self._lines.append(f"# TYPE {full_name} {metric_type}")
+        return full_name
+
+    def counter(
+        self, name: str, help_text: str, samples: Iterable[Tuple[Labels, float]]
+    ) -> None:
+        """Write a counter family; name should end in ``_total``."""
+        full_name = self._header(name, help_text, "counter")
+        for labels, value in samples:
+            self._lines.append(
+                f"{full_name}{_format_labels(labels)} {_format_value(value)}"
+            )
+
+    def gauge(
+        self, name: str, help_text: str, samples: Iterable[Tuple[Labels, float]]
+    ) -> None:
+        """Write a gauge family."""
+        full_name = self._header(name, help_text, "gauge")
+        for labels, value in samples:
+            self._lines.append(
+                f"{full_name}{_format_labels(labels)} {_format_value(value)}"
+            )
+
+    def histogram(
+        self, name: str, help_text: str, samples: Iterable[Tuple[Labels, Histogram]]
+    ) -> None:
+        """Write a histogram family with cumulative buckets, sum and count."""
+        full_name = self._header(name, help_text, "histogram")
+        for labels, histogram in samples:
+            for bound, count in histogram.cumulative_buckets():
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                self._lines.append(f"{full_name}_bucket{bucket_labels} {count}")
+            suffix = _format_labels(labels)
+            total = _format_value(histogram.sum)
+            self._lines.append(f"{full_name}_sum{suffix} {total}")
+            self._lines.append(f"{full_name}_count{suffix} {histogram.count}")
+
+    def render(self) -> str:
+        """Return the exposition text."""
+        return "\n".join(self._lines) + "\n"
+
+
+def _labelled(label_names: Tuple[str, ...], items):
+    return [(dict(zip(label_names, values)), metric) for values, metric in items]
+
+
+def _collect_http(writer: MetricsWriter) -> None:
+    from app.middleware.performance import performance_monitor
+
+    endpoints = []
+    for key, stats in list(performance_monitor.endpoints.items()):
+        method, _, route = key.partition(" ")
+        endpoints.append(({"method": method, "route": route}, stats))
+
+    writer.counter(
+        "http_requests_total",
+        "HTTP requests by route template",
+        [(labels, stats.requests) for labels, stats in endpoints],
+    )
+    writer.counter(
+        "http_request_errors_total",
+        "HTTP requests answered with status 400 or above",
+        [(labels, stats.errors) for labels, stats in endpoints],
+    )
+    writer.histogram(
+        "http_request_duration_seconds",
+        "HTTP request processing time until the response starts",
+        [(labels, stats.duration) for labels, stats in endpoints],
+    )
+
+
+def _collect_db_pools(writer: MetricsWriter) -> None:
+    from app.database import engine, replica_engine
+    from app.utils.pool_metrics import pool_metrics
+
+    pools = []
+    for name, db_engine in (("primary", engine), ("replica", replica_engine)):
+        metrics = pool_metrics.get(name)
+        if db_engine is not None and metrics is not None:
+            pools.append(({"pool": name}, db_engine.sync_engine.pool, metrics))
+
+    writer.gauge(
+        "db_pool_size",
+        "Configured connection pool size",
+        [(labels, pool.size()) for labels, pool, _ in pools],
+    )
+    writer.gauge(
+        "db_pool_checked_out",
+        "Connections currently checked out",
+        [(labels, pool.checkedout()) for labels, pool, _ in pools],
+    )
+    writer.gauge(
+        "db_pool_overflow",
+        "Connections open beyond the pool size",
+        [(labels, max(pool.overflow(), 0)) for labels, pool, _ in pools],
+    )
+    writer.counter(
+        "db_pool_checkouts_total",
+        "Connection checkouts",
+        [(labels, metrics.checkouts) for labels, _, metrics in pools],
+    )
+    writer.counter(
+        "db_pool_timeouts_total",
+        "Connection checkouts that timed out",
+        [(labels, metrics.timeouts) for labels, _, metrics in pools],
+    )
+    writer.counter(
+        "db_pool_connections_created_total",
+        "Database connections opened",
+        [(labels, metrics.connections_created) for labels, _, metrics in pools],
+    )
+    writer.histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a pooled connection",
+        [(labels, metrics.checkout_wait) for labels, _, metrics in pools],
+    )
+
+
+def _collect_embeddings(writer: MetricsWriter) -> None:
+    from app.services.openai_client import (
+        embedding_batch_size,
+        embedding_request_seconds,
+    )
+
+    writer.histogram(
+        "embedding_request_duration_seconds",
+        "Embedding API call latency",
+        _labelled(
+            embedding_request_seconds.label_names, embedding_request_seconds.items()
+        ),
+    )
+    writer.histogram(
+        "embedding_batch_size",
+        "Texts per embedding API call",
+        [({}, embedding_batch_size)],
+    )
+
+
+def _collect_ingestion(writer: MetricsWriter) -> None:
+    from app.services.background_processor import peek_background_processor
+
+    processor = peek_background_processor()
+    depths = processor.get_stage_depths() if processor is not None else {}
+    writer.gauge(
+        "ingestion_tasks",
+        "Document ingestion tasks queued or in each processing stage",
+        [({"stage": stage}, count) for stage, count in depths.items()],
+    )
+
+
+def _collect_caches(writer: MetricsWriter) -> None:
+    from app.utils.caching import (
+        api_response_cache,
+        embedding_cache,
+        principal_cache,
+        search_result_cache,
+        tool_result_cache,
+    )
+
+    caches = [
+        ({"cache": name}, cache.get_stats())
+        for name, cache in (
+            ("api_response", api_response_cache),
+            ("embedding", embedding_cache),
+            ("principal", principal_cache),
+            ("search_result", search_result_cache),
+            ("tool_result", tool_result_cache),
+        )
+    ]
+
+    writer.gauge(
+        "cache_entries",
+        "Entries currently cached",
+        [(labels, stats["size"]) for labels, stats in caches],
+    )
+    writer.counter(
+        "cache_hits_total",
+        "Cache lookups served from the cache, including coalesced lookups",
+        [
+            (labels, stats["hits"] + stats.get("coalesced", 0))
+            for labels, stats in caches
+        ],
+    )
+    writer.counter(
+        "cache_misses_total",
+        "Cache lookups that had to compute the value",
+        [(labels, stats["misses"]) for labels, stats in caches],
+    )
+    writer.gauge(
+        "cache_hit_ratio",
+        "Fraction of cache lookups served from the cache",
+        [(labels, stats["hit_rate"]) for labels, stats in caches],
+    )
+
+
+def _collect_mcp(writer: MetricsWriter) -> None:
+    from app.services.mcp_service import mcp_tool_call_failures, mcp_tool_call_seconds
+
+    writer.histogram(
+        "mcp_tool_call_duration_seconds",
+        "MCP tool call latency per server",
+        _labelled(mcp_tool_call_seconds.label_names, mcp_tool_call_seconds.items()),
+    )
+    writer.counter(
+        "mcp_tool_call_failures_total",
+        "Failed MCP tool calls per server",
+        _labelled(
+            mcp_tool_call_failures.label_names, mcp_tool_call_failures.items()
+        ),
+    )
+
+
+def _collect_rate_limits(writer: MetricsWriter) -> None:
+    from app.middleware.rate_limiting import rate_limiter
+    from app.services.llm_quota import get_llm_quota_manager
+
+    writer.counter(
+        "rate_limit_rejections_total",
+        "Requests rejected by the rate limiter per policy",
+        _labelled(
+            rate_limiter.rejections.label_names, rate_limiter.rejections.items()
+        ),
+    )
+
+    quota_manager = get_llm_quota_manager()
+    writer.counter(
+        "llm_quota_rejections_total",
+        "LLM requests rejected by token quota or stream concurrency limits",
+        _labelled(
+            quota_manager.rejections.label_names, quota_manager.rejections.items()
+        ),
+    )
+    quota_stats = quota_manager.get_stats()
+    writer.gauge(
+        "llm_active_streams",
+        "Chat streams in progress",
+        [({}, quota_stats["active_streams"])],
+    )
+    writer.gauge(
+        "llm_queued_streams",
+        "Chat streams waiting for a free slot",
+        [({}, quota_stats["queued_streams"])],
+    )
+
+
+def _collect_llm(writer: MetricsWriter) -> None:
+    from app.services.llm_metrics import llm_metrics
+
+    labels = llm_metrics.label_names
+    writer.counter(
+        "llm_requests_total",
+        "Chat completions per model, LLM profile and outcome",
+        _labelled(llm_metrics.requests.label_names, llm_metrics.requests.items()),
+    )
+    writer.histogram(
+        "llm_queue_seconds",
+        "Time until the provider started a streamed response",
+        _labelled(labels, llm_metrics.queue_seconds.items()),
+    )
+    writer.histogram(
+        "llm_time_to_first_token_seconds",
+        "Time until the first streamed token",
+        _labelled(labels, llm_metrics.ttft_seconds.items()),
+    )
+    writer.histogram(
+        "llm_inter_token_seconds",
+        "Mean time between streamed tokens of a completion",
+        _labelled(labels, llm_metrics.inter_token_seconds.items()),
+    )
+    writer.histogram(
+        "llm_generation_seconds",
+        "Time until the last token of a completion",
+        _labelled(labels, llm_metrics.generation_seconds.items()),
+    )
+    writer.histogram(
+        "llm_output_tokens_per_second",
+        "Output tokens per second of generation time",
+        _labelled(labels, llm_metrics.output_tokens_per_second.items()),
+    )
+
+
+_COLLECTORS: List[Callable[[MetricsWriter], None]] = [
+    _collect_http,
+    _collect_db_pools,
+    _collect_embeddings,
+    _collect_ingestion,
+    _collect_caches,
+    _collect_mcp,
+    _collect_rate_limits,
+    _collect_llm,
+]
+
+
+def render_metrics() -> str:
+    """Collect all metrics and return them in the Prometheus text format.
+
+    A failing collector is logged and skipped so the others are still
+    exported.
+    """
+    writer = MetricsWriter()
+    for collector in _COLLECTORS:
+        try:
+            collector(writer)
+        except Exception as e:
+            logger.warning(f"Metrics collector {collector.__name__} failed: {e}")
+    return writer.render()
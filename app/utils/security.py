@@ -3,12 +3,24 @@
 This module provides functions for secure password handling,
 token generation, and other security-related operations.
 
+scrypt is deliberately slow and memory-hard, so request handlers must use
+the async hash_password()/check_password() wrappers, which run it on a small
+dedicated thread pool (hashlib releases the GIL while hashing) instead of on
+the event loop.
+
 """
 
+import asyncio
 import base64
+import contextlib
 import hashlib
 import secrets
 import string
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.config import settings
+from app.core.exceptions import RateLimitError
 
 # Scrypt configuration parameters (recommended for secure usage)
 SCRYPT_N = 2**14  # CPU/memory cost factor
@@ -69,6 +81,95 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+class PasswordHashPool:
+    """Bounded thread pool for password hashing.
+
+    At most ``workers`` hashes run at once, which also caps scrypt's memory
+    use (about 16 MB each). Once ``max_pending`` operations are running or
+    queued, further requests are rejected instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        """Initialize pool.
+
+        Args:
+            workers: Number of hashing threads
+            max_pending: Maximum running plus queued operations
+
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(*args) on the pool.
+
+        Raises:
+            RateLimitError: If the queue is full
+
+        """
+        if self._pending >= self.max_pending:
+            raise RateLimitError(
+                "Too many concurrent authentication requests, please retry",
+                details={"retry_after": 1},
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+
+        loop = asyncio.get_running_loop()
+        job = self._executor.submit(func, *args)
+        self._pending += 1
+        # The slot is held until the job itself finishes: a cancelled caller
+        # leaves a queued or running scrypt job behind, which still counts
+        job.add_done_callback(lambda _: self._release(loop))
+        return await asyncio.wrap_future(job)
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Free a pending slot; called from the executor thread."""
+        # RuntimeError: event loop already closed (shutdown with jobs outstanding)
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(self._decrement)
+
+    def _decrement(self) -> None:
+        self._pending -= 1
+
+    def get_stats(self) -> dict:
+        """Get pool statistics."""
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the hashing threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global password hashing pool
+password_hash_pool = PasswordHashPool(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password with scrypt on the password hashing pool."""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its scrypt hash on the password hashing pool."""
+    return await password_hash_pool.run(
+        verify_password, plain_password, hashed_password
+    )
+
+
 def generate_random_password(length: int = 12) -> str:
     """Generate a random password.
 
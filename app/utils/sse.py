@@ -0,0 +1,101 @@
+"""Server-Sent Events helpers for streaming endpoints.
+
+This module provides pre-encoded SSE frame serialization and coalescing of
+small content deltas so streaming responses do not pay per-token JSON and
+transport overhead.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List
+
+from pydantic import BaseModel
+
+# Chunks the source may run ahead of a slow consumer
+_MAX_QUEUED_CHUNKS = 64
+
+_CHUNK = "chunk"
+_END = "end"
+_ERROR = "error"
+
+
+def sse_frame(event: BaseModel) -> bytes:
+    """Serialize a stream event model into an encoded SSE data frame."""
+    return b"data: " + event.model_dump_json().encode() + b"\n\n"
+
+
+async def coalesce_content_chunks(
+    chunks: AsyncIterator[Dict[str, Any]], flush_interval: float
+) -> AsyncIterator[Dict[str, Any]]:
+    """Merge consecutive content chunks that arrive within a flush interval.
+
+    Content deltas are buffered and emitted as one chunk at most every
+    flush_interval seconds. Any other chunk type flushes the buffer first and
+    is passed through unchanged, preserving event order.
+
+    The source is iterated by a single pump task for its whole life, so
+    context variables it sets (such as the current trace span) persist
+    between chunks. The source is closed when this generator exits.
+
+    Args:
+        chunks: Stream of chunk dicts with a 'type' key
+        flush_interval: Maximum time in seconds content may be buffered;
+            0 or less disables coalescing
+
+    Yields:
+        dict: Stream chunks with adjacent content deltas merged
+
+    """
+    if flush_interval <= 0:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_MAX_QUEUED_CHUNKS)
+
+    async def pump() -> None:
+        try:
+            async for chunk in chunks:
+                await queue.put((_CHUNK, chunk))
+            await queue.put((_END, None))
+        except Exception as e:
+            await queue.put((_ERROR, e))
+        finally:
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    pump_task = asyncio.create_task(pump())
+    buffer: List[str] = []
+    deadline = 0.0
+    getter = asyncio.ensure_future(queue.get())
+    try:
+        while True:
+            timeout = max(deadline - time.monotonic(), 0) if buffer else None
+            done, _ = await asyncio.wait({getter}, timeout=timeout)
+            if not done:
+                yield {"type": "content", "content": "".join(buffer)}
+                buffer.clear()
+                continue
+            kind, value = getter.result()
+            if kind == _END:
+                break
+            if kind == _ERROR:
+                raise value
+            getter = asyncio.ensure_future(queue.get())
+            if value.get("type") == "content":
+                if not buffer:
+                    deadline = time.monotonic() + flush_interval
+                buffer.append(value.get("content", ""))
+                continue
+            if buffer:
+                yield {"type": "content", "content": "".join(buffer)}
+                buffer.clear()
+            yield value
+        if buffer:
+            yield {"type": "content", "content": "".join(buffer)}
+    finally:
+        getter.cancel()
+        pump_task.cancel()
+        # Wait for the pump so the source is closed before returning
+        await asyncio.gather(pump_task, return_exceptions=True)
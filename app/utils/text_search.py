@@ -0,0 +1,55 @@
+"""PostgreSQL full-text search expressions.
+
+Builds tsvector/tsquery expressions with the text search configuration
+inlined as a literal rather than a bound parameter, so that queries match
+the expression indexes declared on the models and the planner can use them.
+Substring matching (ILIKE) is served by pg_trgm GIN indexes instead.
+"""
+
+from typing import Any
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.sql.elements import ColumnElement
+
+# Text search configuration shared by indexes and queries
+TS_CONFIG = literal_column("'english'::regconfig")
+
+# ts_headline options for highlighted excerpts
+HEADLINE_OPTIONS = "StartSel=<<, StopSel=>>, MaxWords=30, MinWords=10, MaxFragments=2"
+
+
+def ts_vector(*columns: Any) -> ColumnElement:
+    """Build a tsvector over one or more text columns.
+
+    Multiple columns are concatenated with NULLs treated as empty strings.
+    Index and query expressions must be built with the same columns in the
+    same order to match.
+    """
+    if len(columns) == 1:
+        return func.to_tsvector(TS_CONFIG, columns[0])
+    empty = literal_column("''")
+    separator = literal_column("' '")
+    document = func.coalesce(columns[0], empty)
+    for column in columns[1:]:
+        document = document.op("||")(separator).op("||")(func.coalesce(column, empty))
+    return func.to_tsvector(TS_CONFIG, document)
+
+
+def ts_query(term: str) -> ColumnElement:
+    """Parse a user search string into a tsquery (supports quotes, OR and -)."""
+    return func.websearch_to_tsquery(TS_CONFIG, term)
+
+
+def ts_match(vector: ColumnElement, query: ColumnElement) -> ColumnElement:
+    """Return a condition that is true when the vector matches the query."""
+    return vector.op("@@")(query)
+
+
+def ts_rank(vector: ColumnElement, query: ColumnElement) -> ColumnElement:
+    """Return a cover-density rank of the vector against the query."""
+    return func.ts_rank_cd(vector, query)
+
+
+def ts_headline(column: Any, query: ColumnElement) -> ColumnElement:
+    """Return an excerpt of column with query terms highlighted."""
+    return func.ts_headline(TS_CONFIG, column, query, HEADLINE_OPTIONS)
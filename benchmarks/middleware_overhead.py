@@ -0,0 +1,123 @@
+"""Microbenchmark of per-request middleware overhead.
+
+Drives the ASGI application directly (no server or sockets) with a minimal
+GET request and reports the mean time per request for:
+
+- bare: the FastAPI application without middleware
+- decorators: five pass-through ``@app.middleware("http")`` layers, the
+  structure the request pipeline replaced
+- pipeline: RequestPipelineMiddleware
+
+The decorator layers only call ``call_next``, so the comparison isolates the
+cost of the middleware structure itself. Request logging is kept below the
+configured log level so log formatting does not dominate the numbers, and
+every request comes from a different client address so rate limiter state
+stays small.
+
+Usage:
+    python benchmarks/middleware_overhead.py [--requests N]
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Keep the benchmark client below the rate limit and request logs quiet
+os.environ.setdefault("RATE_LIMIT_REQUESTS", "1000000000")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import PlainTextResponse  # noqa: E402
+
+from app.middleware import RequestPipelineMiddleware  # noqa: E402
+
+DECORATOR_LAYERS = 5
+
+_client_ports = itertools.count()
+
+
+def build_app(variant: str):
+    """Build the ASGI application for a benchmark variant."""
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return PlainTextResponse("pong")
+
+    if variant == "decorators":
+        for _ in range(DECORATOR_LAYERS):
+
+            @app.middleware("http")
+            async def passthrough(request, call_next):
+                return await call_next(request)
+
+    elif variant == "pipeline":
+        app.add_middleware(RequestPipelineMiddleware)
+
+    return app
+
+
+def request_scope():
+    """Return a fresh ASGI scope for GET /ping from a new client."""
+    port = next(_client_ports)
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"user-agent", b"middleware-benchmark"),
+        ],
+        "client": (f"10.0.{port // 256 % 256}.{port % 256}", port),
+        "server": ("testserver", 80),
+    }
+
+
+async def run(app, requests: int) -> float:
+    """Send requests through app and return the mean seconds per request."""
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    # Warm up routing, middleware stack construction and caches
+    for _ in range(min(requests, 1000)):
+        await app(request_scope(), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(request_scope(), receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+async def main(requests: int):
+    """Run all variants and print the results."""
+    results = {}
+    for variant in ("bare", "decorators", "pipeline"):
+        results[variant] = await run(build_app(variant), requests)
+
+    bare = results["bare"]
+    print(f"{'variant':<12}{'us/request':>12}{'overhead us':>14}")
+    for variant, mean in results.items():
+        print(f"{variant:<12}{mean * 1e6:>12.1f}{(mean - bare) * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,42 @@
+"""Add result caching policy columns to mcp_tools
+
+Revision ID: 002_mcp_tool_caching
+Revises: 001_uuid_to_bigserial
+Create Date: 2025-01-20 10:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002_mcp_tool_caching'
+down_revision = '001_uuid_to_bigserial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add per-tool cache policy columns (opt-in, disabled by default)."""
+    op.add_column(
+        'mcp_tools',
+        sa.Column('cacheable', sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.add_column('mcp_tools', sa.Column('cache_ttl', sa.Integer(), nullable=True))
+    op.add_column('mcp_tools', sa.Column('cache_key_params', sa.JSON(), nullable=True))
+    op.add_column(
+        'mcp_tools',
+        sa.Column(
+            'cache_normalization',
+            sa.String(length=20),
+            nullable=False,
+            server_default='exact',
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop per-tool cache policy columns."""
+    op.drop_column('mcp_tools', 'cache_normalization')
+    op.drop_column('mcp_tools', 'cache_key_params')
+    op.drop_column('mcp_tools', 'cache_ttl')
+    op.drop_column('mcp_tools', 'cacheable')
@@ -0,0 +1,40 @@
+"""Add composite indexes for keyset pagination
+
+Revision ID: 003_keyset_pagination_indexes
+Revises: 002_mcp_tool_caching
+Create Date: 2025-01-22 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003_keyset_pagination_indexes'
+down_revision = '002_mcp_tool_caching'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add (filter, sort key, id) indexes used by cursor-paginated listings."""
+    op.create_index(
+        'idx_conversations_user_updated',
+        'conversations',
+        ['user_id', 'updated_at', 'id'],
+    )
+    op.create_index(
+        'idx_messages_conversation_created',
+        'messages',
+        ['conversation_id', 'created_at', 'id'],
+    )
+    op.create_index(
+        'idx_documents_owner_title',
+        'documents',
+        ['owner_id', 'title', 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Drop keyset pagination indexes."""
+    op.drop_index('idx_documents_owner_title', table_name='documents')
+    op.drop_index('idx_messages_conversation_created', table_name='messages')
+    op.drop_index('idx_conversations_user_updated', table_name='conversations')
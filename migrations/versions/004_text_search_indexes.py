@@ -0,0 +1,75 @@
+"""Add trigram and full-text search indexes
+
+Revision ID: 004_text_search_indexes
+Revises: 003_keyset_pagination_indexes
+Create Date: 2025-01-24 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004_text_search_indexes'
+down_revision = '003_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+# Expressions must match app.utils.text_search.ts_vector exactly. documents
+# content is not indexed (a tsvector is capped at 1MB, so large documents
+# would fail to store); it is searched through the chunk index instead.
+DOCUMENT_TSV = (
+    "to_tsvector('english'::regconfig, coalesce(title, '') || ' ' || "
+    "coalesce(summary, ''))"
+)
+CHUNK_TSV = "to_tsvector('english'::regconfig, content)"
+MESSAGE_TSV = "to_tsvector('english'::regconfig, content)"
+
+
+def upgrade() -> None:
+    """Enable pg_trgm and create trigram and tsvector GIN indexes."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Trigram indexes for substring (ILIKE) search
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_documents_title_trgm "
+        "ON documents USING gin (title gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_conversations_title_trgm "
+        "ON conversations USING gin (title gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_prompts_title_trgm "
+        "ON prompts USING gin (title gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_prompts_content_trgm "
+        "ON prompts USING gin (content gin_trgm_ops)"
+    )
+
+    # tsvector expression indexes for word search
+    op.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_documents_search_tsv "
+        f"ON documents USING gin ({DOCUMENT_TSV})"
+    )
+    op.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_chunks_content_tsv "
+        f"ON document_chunks USING gin ({CHUNK_TSV})"
+    )
+    op.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_messages_content_tsv "
+        f"ON messages USING gin ({MESSAGE_TSV})"
+    )
+
+
+def downgrade() -> None:
+    """Drop text search indexes (pg_trgm is left installed)."""
+    for index_name in (
+        'idx_messages_content_tsv',
+        'idx_chunks_content_tsv',
+        'idx_documents_search_tsv',
+        'idx_prompts_content_trgm',
+        'idx_prompts_title_trgm',
+        'idx_conversations_title_trgm',
+        'idx_documents_title_trgm',
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
@@ -0,0 +1,28 @@
+"""Add shared rate limiter state table
+
+Revision ID: 005_rate_limit_state
+Revises: 004_text_search_indexes
+Create Date: 2025-01-25 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005_rate_limit_state'
+down_revision = '004_text_search_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the UNLOGGED table used by the postgres rate limit backend."""
+    # Must match app.middleware.rate_limiting.RATE_LIMIT_TABLE
+    op.execute(
+        "CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_state ("
+        "key TEXT PRIMARY KEY, tat DOUBLE PRECISION NOT NULL)"
+    )
+
+
+def downgrade() -> None:
+    """Drop the rate limiter state table."""
+    op.execute("DROP TABLE IF EXISTS rate_limit_state")
@@ -0,0 +1,57 @@
+"""Add bulk operation status table
+
+Revision ID: 006_bulk_operations
+Revises: 005_rate_limit_state
+Create Date: 2025-01-26 10:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006_bulk_operations'
+down_revision = '005_rate_limit_state'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the table holding bulk delete progress shared by all workers."""
+    op.create_table(
+        'bulk_operations',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('operation_id', sa.String(length=36), nullable=False),
+        sa.Column('target', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('requested_count', sa.Integer(), nullable=False),
+        sa.Column('id_count', sa.Integer(), nullable=False),
+        sa.Column('processed_count', sa.Integer(), nullable=False),
+        sa.Column('deleted_ids', sa.JSON(), nullable=False),
+        sa.Column('failed_ids', sa.JSON(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('CURRENT_TIMESTAMP'),
+            nullable=False,
+        ),
+        sa.Column(
+            'updated_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('CURRENT_TIMESTAMP'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_bulk_operations_operation_id', 'bulk_operations', ['operation_id'], unique=True
+    )
+    op.create_index('ix_bulk_operations_status', 'bulk_operations', ['status'])
+    op.create_index('ix_bulk_operations_completed_at', 'bulk_operations', ['completed_at'])
+
+
+def downgrade() -> None:
+    """Drop the bulk operation status table."""
+    op.drop_table('bulk_operations')
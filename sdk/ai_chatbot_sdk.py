@@ -35,6 +35,7 @@ from shared.schemas import (  # Base and common schemas; Conversation schemas; D
     DocumentSearchRequest,
     DocumentUpdate,
     DocumentUploadResponse,
+    ImportConversationsResult,
     LivenessResponse,
     LLMProfileCreate,
     LLMProfileResponse,
@@ -214,12 +215,16 @@ def make_url(base: str, path: str, query: Optional[Dict[str, Any]] = None) -> st
 
 
 async def fetch_all_pages(
-    fetch_page: Callable[[int, int], Any], per_page: int = 50
+    fetch_page: Callable[..., Any], per_page: int = 50
 ) -> List[Any]:
     """Fetch all pages of paginated results asynchronously.
 
+    When a page carries a ``next_cursor`` in its pagination metadata the next
+    page is requested with that cursor; otherwise page numbers are used.
+
     Args:
-        fetch_page: Async function that takes page and per_page parameters.
+        fetch_page: Async function that takes page and per_page parameters,
+            plus a ``cursor`` keyword argument for cursor-aware endpoints.
         per_page: Number of items per page.
 
     Returns:
@@ -228,9 +233,13 @@ async def fetch_all_pages(
     """
     all_items = []
     page = 1
+    cursor = None
 
     while True:
-        response = await fetch_page(page, per_page)
+        if cursor:
+            response = await fetch_page(page, per_page, cursor=cursor)
+        else:
+            response = await fetch_page(page, per_page)
 
         items = response.items if hasattr(response, "items") else response
 
@@ -239,8 +248,15 @@ async def fetch_all_pages(
 
         all_items.extend(items)
 
-        # Check if we got a full page - if not, we're done
-        if len(items) < per_page:
+        pagination = getattr(response, "pagination", None)
+        if pagination is not None and pagination.has_more is not None:
+            # Server reports whether more items follow: follow its cursor, or
+            # the page number when it returns none (e.g. nullable sort keys)
+            if not pagination.has_more:
+                break
+            cursor = pagination.next_cursor
+        elif len(items) < per_page:
+            # Check if we got a full page - if not, we're done
             break
 
         page += 1
@@ -559,6 +575,8 @@ class DocumentsClient:
         file_type: Optional[str] = None,
         status: Optional[str] = None,
         search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
     ) -> PaginatedResponse[DocumentResponse]:
         """List documents with optional filtering and pagination."""
         params = filter_query(
@@ -568,6 +586,8 @@ class DocumentsClient:
                 "file_type": file_type,
                 "status": status,
                 "search": search,
+                "cursor": cursor,
+                "count": count,
             }
         )
         return await self.sdk._request(
@@ -723,7 +743,12 @@ class ConversationsClient:
         )
 
     async def list(
-        self, page: int = 1, size: int = 20, active_only: Optional[bool] = None
+        self,
+        page: int = 1,
+        size: int = 20,
+        active_only: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
     ) -> PaginatedResponse:
         """List conversations with optional filtering and pagination.
 
@@ -731,6 +756,8 @@ class ConversationsClient:
             page: Page number for pagination (default: 1).
             size: Number of conversations per page (default: 20).
             active_only: Filter to only active conversations if True.
+            cursor: Cursor from the previous page's pagination.next_cursor.
+            count: Total count mode: exact, estimate or none.
 
         Returns:
             PaginatedResponse: Paginated list of conversations.
@@ -739,7 +766,15 @@ class ConversationsClient:
             ApiError: If the request fails.
 
         """
-        params = filter_query({"page": page, "size": size, "active_only": active_only})
+        params = filter_query(
+            {
+                "page": page,
+                "size": size,
+                "active_only": active_only,
+                "cursor": cursor,
+                "count": count,
+            }
+        )
         return await self.sdk._request(
             "/api/v1/conversations/", ConversationResponse, params=params
         )
@@ -805,7 +840,12 @@ class ConversationsClient:
         )
 
     async def messages(
-        self, conversation_id: int, page: int = 1, size: int = 50
+        self,
+        conversation_id: int,
+        page: int = 1,
+        size: int = 50,
+        cursor: Optional[str] = None,
+        count: Optional[str] = None,
     ) -> PaginatedResponse:
         """Get messages from a conversation with pagination.
 
@@ -813,6 +853,8 @@ class ConversationsClient:
             conversation_id: int of the conversation.
             page: Page number for pagination (default: 1).
             size: Number of messages per page (default: 50).
+            cursor: Cursor from the previous page's pagination.next_cursor.
+            count: Total count mode: exact, estimate or none.
 
         Returns:
             PaginatedResponse: Paginated list of messages.
@@ -821,7 +863,9 @@ class ConversationsClient:
             ApiError: If conversation not found or access denied.
 
         """
-        params = filter_query({"page": page, "size": size})
+        params = filter_query(
+            {"page": page, "size": size, "cursor": cursor, "count": count}
+        )
         return await self.sdk._request(
             f"/api/v1/conversations/byid/{conversation_id}/messages",
             MessageResponse,
@@ -844,7 +888,9 @@ class ConversationsClient:
         has a 'type' field indicating the event type:
         - 'start': Initial response started
         - 'content': Streaming content chunk
-        - 'tool_call': Tool execution result
+        - 'tool_start': A tool call started executing
+        - 'tool_progress': Progress notification from a running tool
+        - 'tool_call': Tool execution result (emitted as each tool finishes)
         - 'complete': Final response with complete data
         - 'error': Error occurred during processing
         - 'end': Stream ended
@@ -1134,6 +1180,15 @@ class MCPClient:
             f"/api/v1/mcp/tools/byname/{tool_name}", dict, params=params
         )
 
+    async def update_tool(self, tool_name: str, **kwargs) -> Dict[str, Any]:
+        """Update an MCP tool (description, enabled status, caching policy)."""
+        return await self.sdk._request(
+            f"/api/v1/mcp/tools/byname/{tool_name}",
+            dict,
+            method="PATCH",
+            json=kwargs,
+        )
+
     async def enable_tool(
         self, tool_name: str, server: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -1712,11 +1767,65 @@ class AdminClient:
             f"/api/v1/conversations/byid/{conversation_id}/export", dict
         )
 
-    async def import_conversations(self, data: Dict[str, Any]) -> BaseResponse:
-        """Import conversations."""
-        # This uses the file upload endpoint, so it's more complex
+    async def export_stream(
+        self,
+        conversation_id: Optional[int] = None,
+        format: str = "json",
+        include_metadata: bool = True,
+        gzip: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """Download a conversation export, or all conversations, in chunks.
+
+        Args:
+            conversation_id: Conversation to export; all conversations when None.
+            format: Export format: json, ndjson, csv or txt.
+            include_metadata: Include conversation metadata.
+            gzip: Request a gzip-compressed download.
+
+        Returns:
+            AsyncIterator[bytes]: Raw export file chunks.
+        """
+        if conversation_id is None:
+            path = "/api/v1/conversations/export/stream"
+        else:
+            path = f"/api/v1/conversations/byid/{conversation_id}/export/stream"
+        params = filter_query(
+            {"format": format, "include_metadata": include_metadata, "gzip": gzip}
+        )
+        url = make_url(self.sdk.base_url, path, params)
+        headers = build_headers(self.sdk.token)
+
+        if self.sdk._client is None:
+            self.sdk._client = httpx.AsyncClient(timeout=self.sdk.timeout)
+
+        async with self.sdk._client.stream("GET", url, headers=headers) as resp:
+            if resp.status_code != 200:
+                try:
+                    error_text = await resp.aread()
+                except Exception:
+                    error_text = ""
+                raise ApiError(
+                    resp.status_code, resp.reason_phrase or "", url, error_text
+                )
+            async for chunk in resp.aiter_raw():
+                yield chunk
+
+    async def import_conversations(self, file) -> ImportConversationsResult:
+        """Import conversations from an export or archive file.
+
+        Args:
+            file: File to upload as accepted by httpx, e.g. (filename, fileobj);
+                the filename must end in .json or .jsonl.
+
+        Returns:
+            ImportConversationsResult: Per-conversation import results.
+
+        """
         return await self.sdk._request(
-            "/api/v1/conversations/import", BaseResponse, method="POST", json=data
+            "/api/v1/conversations/import/batch",
+            ImportConversationsResult,
+            method="POST",
+            files={"file": file},
         )
 
     async def archive_conversations(
@@ -113,6 +113,7 @@ from shared.schemas.conversation import (
     ExportedMessage,
     ExportInfo,
     ImportConversationResult,
+    ImportConversationsResult,
     MessageBase,
     MessageCreate,
     MessageListResponse,
@@ -123,6 +124,8 @@ from shared.schemas.conversation import (
     StreamErrorResponse,
     StreamStartResponse,
     StreamToolCallResponse,
+    StreamToolProgressResponse,
+    StreamToolStartResponse,
 )
 from shared.schemas.database import (
     DatabaseAnalysisResponse,
@@ -394,6 +397,7 @@ __all__ = [
     "ExportInfo",
     "ExportedMessage",
     "ImportConversationResult",
+    "ImportConversationsResult",
     "MessageBase",
     "MessageCreate",
     "MessageListResponse",
@@ -404,6 +408,8 @@ __all__ = [
     "StreamErrorResponse",
     "StreamStartResponse",
     "StreamToolCallResponse",
+    "StreamToolProgressResponse",
+    "StreamToolStartResponse",
     # Database schemas
     "DatabaseAnalysisResponse",
     "DatabaseBackupResult",
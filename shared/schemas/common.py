@@ -535,6 +535,12 @@ class PaginationParams(BaseModel):
         default="asc", pattern="^(asc|desc)$", description="Sort order: asc or desc"
     )
     total: Optional[int] = Field(default=None, description="Total number of items")
+    next_cursor: Optional[str] = Field(
+        default=None, description="Opaque cursor for fetching the next page"
+    )
+    has_more: Optional[bool] = Field(
+        default=None, description="Whether more items follow this page"
+    )
 
     @property
     def offset(self) -> int:
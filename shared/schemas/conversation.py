@@ -200,8 +200,25 @@ class StreamContentResponse(BaseSchema):
     content: str = Field(..., description="Content chunk")
 
 
+class StreamToolStartResponse(BaseSchema):
+    """Schema for stream tool start event."""
+
+    type: str = Field("tool_start", description="Event type")
+    tool: Dict[str, Any] = Field(..., description="Tool call id and name")
+
+
+class StreamToolProgressResponse(BaseSchema):
+    """Schema for stream tool progress event."""
+
+    type: str = Field("tool_progress", description="Event type")
+    tool: Dict[str, Any] = Field(..., description="Tool call id and name")
+    progress: float = Field(..., description="Progress reported by the tool")
+    total: Optional[float] = Field(None, description="Total expected progress")
+    message: Optional[str] = Field(None, description="Progress message")
+
+
 class StreamToolCallResponse(BaseSchema):
-    """Schema for stream tool call event."""
+    """Schema for stream tool call (tool finished) event."""
 
     type: str = Field("tool_call", description="Event type")
     tool: Optional[Dict[str, Any]] = Field(None, description="Tool information")
@@ -334,6 +351,20 @@ class ImportConversationResult(BaseModel):
     errors: List[str] = Field(default_factory=list, description="Import errors")
 
 
+class ImportConversationsResult(BaseModel):
+    """Result of importing a multi-conversation archive."""
+
+    conversations: List[ImportConversationResult] = Field(
+        default_factory=list, description="Per-conversation import results"
+    )
+    imported_conversations: int = Field(
+        ..., description="Number of conversations imported"
+    )
+    imported_messages: int = Field(
+        ..., description="Total number of messages imported"
+    )
+
+
 class ArchivePreviewItem(BaseModel):
     """Preview item for conversation archiving."""
 
@@ -383,6 +383,10 @@ class SystemMetricsPayload(BaseModel):
 
     system: Dict[str, Any] = Field(..., description="System metrics (typed below)")
     application: Dict[str, Any] = Field(..., description="App metrics (typed below)")
+    database_pools: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Connection pool metrics (checkout wait, saturation, connection age)",
+    )
 
 
 class ReadinessComponentsPayload(BaseModel):
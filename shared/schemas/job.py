@@ -147,10 +147,11 @@ class JobListResponse(BaseModel):
     """Response schema for listing jobs."""
     
     jobs: List[JobResponse] = Field(..., description="List of jobs")
-    total: int = Field(..., description="Total number of jobs")
+    total: Optional[int] = Field(None, description="Total number of jobs, if counted")
     page: int = Field(..., description="Current page number")
     size: int = Field(..., description="Page size")
     has_next: bool = Field(..., description="Whether there are more pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page")
 
 
 class JobExecutionRequest(BaseModel):
@@ -227,5 +228,14 @@ class JobSearchParams(BaseModel):
     
     page: int = Field(default=1, ge=1, description="Page number")
     size: int = Field(default=20, ge=1, le=100, description="Page size")
-    sort_by: Optional[str] = Field(default="created_at", description="Sort field")
-    sort_order: Optional[str] = Field(default="desc", description="Sort order (asc/desc)")
\ No newline at end of file
+    sort_by: Optional[str] = Field(
+        default="created_at",
+        description="Sort field: created_at, updated_at, name, title, job_type, status, last_run_at or next_run_at",
+    )
+    sort_order: Optional[str] = Field(default="desc", description="Sort order (asc/desc)")
+    cursor: Optional[str] = Field(None, description="Cursor returned with the previous page")
+    count: str = Field(
+        default="exact",
+        pattern="^(exact|estimate|none)$",
+        description="Total count mode: exact, estimate or none",
+    )
\ No newline at end of file
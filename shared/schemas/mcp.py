@@ -8,7 +8,7 @@ All fields have an explicit 'description' argument.
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from shared.schemas.base import BaseModelSchema
 from shared.schemas.common import utcnow
@@ -87,6 +87,20 @@ class MCPToolCreateSchema(BaseModel):
         default_factory=dict, description="Tool parameters schema"
     )
     is_enabled: bool = Field(default=True, description="Whether the tool is enabled")
+    cacheable: bool = Field(
+        default=False, description="Whether tool results may be cached"
+    )
+    cache_ttl: Optional[int] = Field(
+        None, gt=0, description="Cache TTL in seconds (None uses the default)"
+    )
+    cache_key_params: Optional[List[str]] = Field(
+        None, description="Argument names forming the cache key (None uses all)"
+    )
+    cache_normalization: str = Field(
+        default="exact",
+        pattern="^(exact|casefold)$",
+        description="Argument normalization for cache keys: exact or casefold",
+    )
 
 
 class MCPToolUpdateSchema(BaseModel):
@@ -98,6 +112,28 @@ class MCPToolUpdateSchema(BaseModel):
         None, description="New parameters schema"
     )
     is_enabled: Optional[bool] = Field(None, description="New enabled status")
+    cacheable: Optional[bool] = Field(None, description="New cacheable flag")
+    cache_ttl: Optional[int] = Field(None, gt=0, description="New cache TTL in seconds")
+    cache_key_params: Optional[List[str]] = Field(
+        None, description="New list of argument names forming the cache key"
+    )
+    cache_normalization: Optional[str] = Field(
+        None,
+        pattern="^(exact|casefold)$",
+        description="New argument normalization for cache keys",
+    )
+
+    @field_validator("is_enabled", "cacheable", "cache_normalization")
+    @classmethod
+    def reject_null(cls, v: Any) -> Any:
+        """Reject explicit nulls for settings that cannot be unset.
+
+        Omit a field to leave it unchanged. cache_ttl may be null, which
+        means the configured default TTL.
+        """
+        if v is None:
+            raise ValueError("may be omitted but not null")
+        return v
 
 
 class MCPToolResponse(BaseModelSchema):
@@ -118,6 +154,14 @@ class MCPToolResponse(BaseModelSchema):
     average_duration_ms: Optional[int] = Field(
         None, description="Average execution duration in ms"
     )
+    cacheable: bool = Field(default=False, description="Whether results are cached")
+    cache_ttl: Optional[int] = Field(None, description="Cache TTL in seconds")
+    cache_key_params: Optional[List[str]] = Field(
+        None, description="Argument names forming the cache key"
+    )
+    cache_normalization: str = Field(
+        default="exact", description="Argument normalization for cache keys"
+    )
     server: MCPServerSchema = Field(..., description="Associated MCP server")
 
 
@@ -244,6 +288,9 @@ class MCPDiscoveryResultSchema(BaseModel):
     server_name: str = Field(..., description="Server name")
     new_tools: int = Field(default=0, description="Number of new tools discovered")
     updated_tools: int = Field(default=0, description="Number of tools updated")
+    removed_tools: int = Field(
+        default=0, description="Number of tools no longer reported by the server"
+    )
     total_discovered: int = Field(default=0, description="Total tools found")
     errors: List[str] = Field(default_factory=list, description="Discovery errors")
     error: Optional[str] = Field(None, description="Main error message if failed")